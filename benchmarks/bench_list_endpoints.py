@@ -0,0 +1,108 @@
+"""
+Mede as principais rotas de listagem com e sem compressão, e o custo de serializar o JSON.
+
+Uso:
+    python -m benchmarks.bench_list_endpoints
+
+Para cada rota e cada Accept-Encoding (identity, gzip, br, zstd), mostra o tempo médio por
+requisição (TestClient, sem rede) e os bytes enviados. Em seguida compara a serialização
+de uma página de /medias/show com o JSONResponse padrão, o ORJSONResponse (default_response_class
+do app) e o model_dump_json do pydantic (usado pelas rotas com ETag, ver http_cache.py).
+"""
+
+import asyncio
+import tempfile
+import time
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from benchmarks.seed import create_seeded_engine
+from database import get_read_session, get_session
+from main import create_app
+from schemas.media_schemas import ShowMediasPageSchema
+from security import get_current_user
+from settings import Settings
+
+ROUNDS = 100
+ENCODINGS = ('identity', 'gzip', 'br', 'zstd')
+GENRE_ID = 18  # Drama, o maior grupo
+
+
+def endpoints(media_id: int) -> dict[str, str]:
+    return {
+        '/medias/show (50)': f'/medias/show?genre_id={GENRE_ID}&movie=true&limit=50',
+        '/medias/search (50)': '/medias/search?term=the&limit=50',
+        '/medias/best-rated (50)': '/medias/best-rated?limit=50',
+        '/medias/random': f'/medias/random?genre_id={GENRE_ID}&movie=true',
+        '/medias/{id}': f'/medias/{media_id}',
+    }
+
+
+def bench_endpoints(client: TestClient, media_id: int):
+    print(f'{"rota":<26} {"encoding":<9} {"ms/req":>8} {"bytes":>8}')
+    for label, url in endpoints(media_id).items():
+        client.get(url)  # aquece os índices e o cache
+        for encoding in ENCODINGS:
+            headers = {'Accept-Encoding': encoding}
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                response = client.get(url, headers=headers)
+            elapsed = (time.perf_counter() - start) / ROUNDS * 1000
+            print(f'{label:<26} {encoding:<9} {elapsed:8.3f} {response.num_bytes_downloaded:8d}')
+
+
+def bench_serialization(client: TestClient):
+    page = ShowMediasPageSchema.model_validate(
+        client.get(f'/medias/show?genre_id={GENRE_ID}&movie=true&limit=50').json()
+    )
+    # o FastAPI valida com o response_model, gera o dict com model_dump(mode='json') e só então
+    # a classe de resposta serializa; as rotas com ETag serializam direto com model_dump_json
+    renderers = {
+        'JSONResponse': lambda: JSONResponse(page.model_dump(mode='json')).body,
+        'ORJSONResponse': lambda: ORJSONResponse(page.model_dump(mode='json')).body,
+        'model_dump_json': lambda: page.model_dump_json().encode(),
+    }
+
+    print(f'\n{"serialização (50 itens)":<26} {"us/resp":>8}')
+    for label, render in renderers.items():
+        start = time.perf_counter()
+        for _ in range(ROUNDS * 10):
+            render()
+        print(f'{label:<26} {(time.perf_counter() - start) / (ROUNDS * 10) * 1e6:8.1f}')
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        # arquivo, e não memória: o banco é populado aqui e lido pelo event loop do TestClient
+        url = f'sqlite+aiosqlite:///{directory}/bench.db'
+        asyncio.run(seed(url))
+
+        engine = create_async_engine(url)
+        app = create_app(Settings(STARTUP_WARMUP=False))
+
+        async def override_session():
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                yield session
+
+        app.dependency_overrides[get_session] = override_session
+        app.dependency_overrides[get_read_session] = override_session
+        app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+
+        with TestClient(app) as client:
+            media_id = client.get(f'/medias/show?genre_id={GENRE_ID}&movie=true&limit=1').json()['medias'][0]['id']
+            print(f'{ROUNDS} requisições por combinação\n')
+            bench_endpoints(client, media_id)
+            bench_serialization(client)
+            client.portal.call(engine.dispose)
+
+
+async def seed(url: str):
+    engine = await create_seeded_engine(url)
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Compara o sorteio de /medias/random: ORDER BY random() no banco x índice em memória (MediaSampler).
+
+Uso:
+    python -m benchmarks.bench_random_medias
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.seed import create_seeded_engine
+from controllers.media_controller import get_random_medias
+from models.media_model import Genre, Media
+from services.media_sampler import media_sampler
+
+ROUNDS = 200
+GENRE_ID = 18  # Drama, o maior grupo
+
+
+async def order_by_random(session: AsyncSession, genre_id: int, media_type: str, limit: int = 20):
+    # consulta anterior, mantida aqui apenas como referência de comparação
+    result = await session.scalars(
+        select(Media)
+        .join(Media.genres)
+        .where(Genre.id == genre_id, Media.media_type == media_type)
+        .order_by(func.random())
+        .limit(limit)
+    )
+    return result.all()
+
+
+async def timed(label: str, call):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await call()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<22} {elapsed / ROUNDS * 1000:8.3f} ms/chamada')
+
+
+async def main():
+    engine = await create_seeded_engine()
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        total = await session.scalar(select(func.count(Media.id)))
+        print(f'{total} mídias, {ROUNDS} rodadas, gênero {GENRE_ID}')
+
+        await timed('ORDER BY random()', lambda: order_by_random(session, GENRE_ID, 'filme'))
+
+        start = time.perf_counter()
+        await media_sampler.load(session)
+        print(f'{"carga do índice":<22} {(time.perf_counter() - start) * 1000:8.3f} ms (uma vez)')
+
+        await timed('MediaSampler', lambda: get_random_medias(GENRE_ID, True, session))
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+Mede o tempo de import de cada módulo na subida da API (python -X importtime) num processo novo.
+
+Uso:
+    python -m benchmarks.profile_startup            # import de main (o que o uvicorn faz)
+    python -m benchmarks.profile_startup --top 40
+    python -m benchmarks.profile_startup --module routers.media_routes
+    python -m benchmarks.profile_startup --cold     # sem bytecode (.pyc) em cache
+
+Mostra os módulos mais lentos (tempo próprio e acumulado), o total por pacote de primeiro
+nível e o tempo de parede do import.
+
+--cold simula um container novo de uma imagem sem .pyc: tudo é compilado na subida
+(~3x mais lento que com bytecode). Por isso o Dockerfile compila o bytecode no build.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_times(module: str, cold: bool = False) -> tuple[list[tuple[str, int, int]], float]:
+    """
+    Importa `module` num interpretador novo com -X importtime.
+
+    Args:
+        module (str): módulo a importar.
+        cold (bool): ignora o bytecode em cache (.pyc), como num container sem bytecode compilado.
+
+    Returns:
+        ([(módulo, tempo próprio em us, tempo acumulado em us)], tempo de parede em segundos)
+    """
+    with tempfile.TemporaryDirectory() as empty_cache:
+        options = ['-X', 'importtime']
+        if cold:
+            options += ['-X', f'pycache_prefix={empty_cache}']
+
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, *options, '-c', f'import {module}'],
+            capture_output=True,
+            text=True,
+            cwd=ROOT,
+            env=os.environ.copy(),
+            check=False,
+        )
+        wall = time.perf_counter() - start
+
+    if result.returncode:
+        raise RuntimeError(f'import {module} falhou:\n{result.stderr[-2000:]}')
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    return rows, wall
+
+
+def report(module: str, top: int, cold: bool):
+    rows, wall = import_times(module, cold=cold)
+
+    by_package: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split('.')[0]] += self_us
+
+    print(f'import {module}: {wall * 1000:.0f} ms de parede (inclui subir o interpretador)\n')
+
+    print(f'{"acumulado (ms)":>15} {"próprio (ms)":>13}  módulo')
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+        print(f'{cumulative_us / 1000:15.1f} {self_us / 1000:13.1f}  {name}')
+
+    print(f'\n{"total (ms)":>15}  pacote')
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f'{self_us / 1000:15.1f}  {package}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--module', default='main')
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--cold', action='store_true')
+    args = parser.parse_args()
+
+    report(args.module, args.top, args.cold)
@@ -0,0 +1,88 @@
+"""
+Popula um banco (por padrão SQLite em memória) com os mesmos dados das migrações:
+gêneros, ~18 mil mídias e a associação media_genre, lidos de migrations/data.
+"""
+
+import csv
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import StaticPool, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import models.registry  # noqa: F401 (registra todas as tabelas no metadata)
+from models.base import Base
+from models.media_model import Genre, Media, media_genre
+
+DATA_PATH = Path(__file__).parent.parent / 'migrations' / 'data'
+
+MEDIA_FILES = ['movies_data_part1.csv', 'movies_data_part2.csv', 'movies_data_part3.csv', 'tv_series_data.csv']
+MEDIA_GENRE_FILES = ['media_genre_movie.csv', 'media_genre_tv.csv']
+
+
+def _read(file_name: str):
+    with open(DATA_PATH / file_name, newline='', encoding='utf-8') as csvfile:
+        yield from csv.DictReader(csvfile, skipinitialspace=True)
+
+
+def _float(value: str):
+    return float(value) if value else None
+
+
+async def create_seeded_engine(url: str = 'sqlite+aiosqlite:///:memory:'):
+    """
+    Cria as tabelas e carrega os CSVs das migrações.
+
+    Returns:
+        AsyncEngine: engine com o banco populado.
+    """
+    engine = create_async_engine(url, connect_args={'check_same_thread': False}, poolclass=StaticPool)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine) as session:
+        await session.execute(insert(Genre), [
+            {'id': int(row['id']), 'name': row['name']} for row in _read('genres.csv')
+        ])
+
+        medias = []
+        for file_name in MEDIA_FILES:
+            for row in _read(file_name):
+                medias.append({
+                    'id_themoviedb': int(row['id_themoviedb']),
+                    'id_imdb': row['id_imdb'],
+                    'title': row['title'],
+                    'original_title': row['original_title'] or None,
+                    'description': row['description'] or None,
+                    'dt_launch': date.fromisoformat(row['dt_launch']) if row['dt_launch'] else None,
+                    'original_language': row['original_language'] or None,
+                    'media_type': 'filme' if row['media_type'] == 'movie' else 'série',
+                    'poster_url': row['poster_url'] or None,
+                    'popularity': _float(row['popularity']),
+                    'vote_average': _float(row['vote_average']),
+                    'vote_count': int(float(row['vote_count'])) if row['vote_count'] else None,
+                    'adult': row['adult'] == 'True',
+                })
+        await session.execute(insert(Media), medias)
+
+        lookup = {
+            (id_themoviedb, media_type): media_id
+            for media_id, id_themoviedb, media_type in await session.execute(
+                select(Media.id, Media.id_themoviedb, Media.media_type)
+            )
+        }
+
+        pairs = set()
+        for file_name in MEDIA_GENRE_FILES:
+            for row in _read(file_name):
+                media_id = lookup.get((int(row['id_themoviedb']), row['media_type'].strip().lower()))
+                if media_id and row['id_genre'].strip():
+                    pairs.add((media_id, int(row['id_genre'])))
+
+        await session.execute(insert(media_genre), [
+            {'media_id': media_id, 'genre_id': genre_id} for media_id, genre_id in pairs
+        ])
+        await session.commit()
+
+    return engine
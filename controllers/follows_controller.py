@@ -1,12 +1,48 @@
-from sqlalchemy import desc, select
+import heapq
+from datetime import datetime
+from itertools import islice
+from typing import Any
+
+from sqlalchemy import desc, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from controllers.user_controller import existing_user
+from controllers.user_controller import existing_user, profile_cache_key
+from controllers.user_stats_controller import apply_counts
+from database import load_on_primary
 from exceptions.business_error import BusinessError
+from models.feed_entry_model import ActivityKind, FeedEntry
 from models.follows_model import Follows
+from models.forum_group_model import ForumGroup
 from models.media_comment_model import MediaComment
 from models.media_model import Media
 from models.review_model import Review
+from models.user_list_model import ListType, UserList, UserListMedia
+from pagination import decode_cursor, decode_datetime, decode_id, encode_cursor
+from services import feed
+from services.cache import cache
+
+# validade, em segundos, das atividades recentes dos seguidos no cache compartilhado. O cache só é
+# invalidado ao seguir ou deixar de seguir: apagar a chave de cada seguidor a cada comentário ou
+# avaliação custaria uma consulta e uma chave por seguidor, então atividades novas dos seguidos
+# levam até FEED_TTL segundos para aparecer em /comments e /reviews
+FEED_TTL = 30
+# atividades de cada tipo nos feeds /comments e /reviews
+FEED_SIZE = 7
+
+
+# colunas próprias de cada tipo de atividade gravado nas linhas do tempo
+ACTIVITY_COLUMNS = {
+    ActivityKind.COMMENT: (MediaComment.content.label("content"),),
+    ActivityKind.REVIEW: (Review.score.label("score"),),
+}
+
+# posição no feed unificado: (created_at, kind, chave) da última atividade da página. A chave é (id,),
+# exceto em 'watched', em que o id é o da mídia e a chave única é (user_list_id, media_id)
+FeedPosition = tuple[datetime, ActivityKind, tuple[int, ...]]
+
+
+def feed_cache_keys(user_id: int) -> tuple[str, str]:
+    return f'feed:comments:{user_id}', f'feed:reviews:{user_id}'
 
 
 async def follow_user(current_user_id: int, user_to_follow_id: int, session: AsyncSession):
@@ -42,8 +78,14 @@ async def follow_user(current_user_id: int, user_to_follow_id: int, session: Asy
     )
 
     session.add(follow)
+    await feed.backfill(session, current_user_id, user_to_follow_id)
+    await apply_counts(current_user_id, session, following_count=1)
+    await apply_counts(user_to_follow_id, session, follower_count=1)
     await session.commit()
     await session.refresh(follow)
+    await cache.delete(
+        *feed_cache_keys(current_user_id), profile_cache_key(current_user_id), profile_cache_key(user_to_follow_id)
+    )
 
 
 async def unfollow_user(current_user_id: int, user_to_unfollow_id: int, session: AsyncSession):
@@ -69,7 +111,15 @@ async def unfollow_user(current_user_id: int, user_to_unfollow_id: int, session:
 
     if follow:
         await session.delete(follow)
+        await feed.unfollow(session, current_user_id, user_to_unfollow_id)
+        await apply_counts(current_user_id, session, following_count=-1)
+        await apply_counts(user_to_unfollow_id, session, follower_count=-1)
         await session.commit()
+        await cache.delete(
+            *feed_cache_keys(current_user_id),
+            profile_cache_key(current_user_id),
+            profile_cache_key(user_to_unfollow_id),
+        )
 
     else:
         raise BusinessError("Não foi possível deixar de seguir usuário.")
@@ -78,60 +128,247 @@ async def unfollow_user(current_user_id: int, user_to_unfollow_id: int, session:
 async def get_following_users_comments(current_user_id: int, session: AsyncSession):
     """
     Retorna os útimos comentários de usuários dentrosdas mídias.
+    O resultado fica no cache compartilhado por FEED_TTL segundos (invalidado ao seguir ou
+    deixar de seguir alguém): comentários e avaliações novos dos seguidos podem levar esse
+    tempo para aparecer.
+
+    Args:
+        current_user_id (int): usuário logado.
+        session (AsyncSession): sessão do banco de dados ativa.
+    """
+
+    async def load_comments(session: AsyncSession):
+        return await following_activities(current_user_id, ActivityKind.COMMENT, session)
+
+    return await cache.get_or_load(
+        feed_cache_keys(current_user_id)[0], lambda: load_on_primary(session, load_comments), FEED_TTL
+    )
+
+
+async def get_following_users_reviews(current_user_id: int, session: AsyncSession):
+    """
+    Retorna os útimos avaliacoes de usuários seguidos.
+    O resultado fica no cache compartilhado por FEED_TTL segundos (invalidado ao seguir ou
+    deixar de seguir alguém): comentários e avaliações novos dos seguidos podem levar esse
+    tempo para aparecer.
+
+    Args:
+        current_user_id (int): usuário logado.
+        session (AsyncSession): sessão do banco de dados ativa.
+    """
+
+    async def load_reviews(session: AsyncSession):
+        return await following_activities(current_user_id, ActivityKind.REVIEW, session)
+
+    return await cache.get_or_load(
+        feed_cache_keys(current_user_id)[1], lambda: load_on_primary(session, load_reviews), FEED_TTL
+    )
+
+
+async def get_following_feed(current_user_id: int, session: AsyncSession, limit: int = 20, cursor: str | None = None):
+    """
+    Feed unificado das atividades dos usuários seguidos (comentários, avaliações, mídias
+    assistidas e grupos do fórum), das mais recentes para as mais antigas, com paginação por
+    cursor sobre (created_at, kind, chave da atividade).
+
+    Cada tipo é lido já ordenado, a partir do cursor e pelo seu índice, com no máximo `limit` + 1
+    atividades; as listas são então intercaladas (k-way merge) sem ordenar tudo de novo.
 
     Args:
         current_user_id (int): usuário logado.
         session (AsyncSession): sessão do banco de dados ativa.
+        limit (int): quantidade máxima de atividades da página.
+        cursor (str | None): cursor devolvido pela página anterior.
+
+    Raises:
+        BusinessError: caso o cursor seja inválido.
+    """
+    after = decode_feed_cursor(cursor) if cursor else None
+    size = limit + 1  # um a mais para saber se existe próxima página
+
+    streams = [
+        await following_activities(current_user_id, ActivityKind.COMMENT, session, size, after),
+        await following_activities(current_user_id, ActivityKind.REVIEW, session, size, after),
+        await following_watched(current_user_id, session, size, after),
+        await following_forum_groups(current_user_id, session, size, after),
+    ]
+    activities = list(islice(heapq.merge(*streams, key=feed_position, reverse=True), size))
+
+    next_cursor = None
+    if len(activities) > limit:
+        activities = activities[:limit]
+        created_at, kind, key = feed_position(activities[-1])
+        next_cursor = encode_cursor(created_at, kind.value, list(key))
+
+    return {'activities': activities, 'next_cursor': next_cursor}
+
+
+async def following_activities(
+    current_user_id: int,
+    kind: ActivityKind,
+    session: AsyncSession,
+    limit: int = FEED_SIZE,
+    after: FeedPosition | None = None,
+):
     """
+    Últimas atividades de um tipo (comentário ou avaliação) dos usuários seguidos.
+
+    Vêm da linha do tempo do usuário (feed_entry, preenchida na escrita por services.feed),
+    juntas às atividades das contas sem fan-out, buscadas aqui mesmo.
 
+    Args:
+        current_user_id (int): usuário logado.
+        kind (ActivityKind): tipo da atividade (colunas próprias em ACTIVITY_COLUMNS).
+        session (AsyncSession): sessão do banco de dados ativa.
+        limit (int): quantidade máxima de atividades.
+        after (FeedPosition | None): posição no feed unificado a partir da qual buscar.
+    """
+    activity = feed.ACTIVITY_MODELS[kind]
     stmt = (
         select(
-            MediaComment.user_id.label("user_id"),
-            MediaComment.content.label("content"),
+            activity.id.label("id"),
+            activity.user_id.label("user_id"),
+            activity.created_at.label("created_at"),
+            *ACTIVITY_COLUMNS[kind],
             Media.title.label("media_title"),
             Media.id.label("media_id"),
             Media.poster_url.label("media_poster_url"),
         )
-        .join(Follows, Follows.followed_id == MediaComment.user_id)
-        .join(Media, Media.id == MediaComment.media_id)
-        .where(Follows.follower_id == current_user_id)
-        .order_by(desc(MediaComment.created_at))
-        .limit(7)
+        .join(Media, Media.id == activity.media_id)
     )
 
-    comments = await session.execute(stmt)
+    pushed = (
+        stmt
+        .join(FeedEntry, FeedEntry.activity_id == activity.id)
+        .where(FeedEntry.follower_id == current_user_id, FeedEntry.kind == kind)
+        .order_by(desc(FeedEntry.created_at), desc(FeedEntry.activity_id))
+        .limit(limit)
+    )
+    if after:
+        pushed = pushed.where(after_position(FeedEntry.created_at, (FeedEntry.activity_id,), kind, after))
+    timelines = [(await session.execute(pushed)).mappings().all()]
 
-    comments_data = comments.mappings().all()
+    pulled_ids = await feed.pulled_actor_ids(session, current_user_id)
+    if pulled_ids:
+        pulled = (
+            stmt
+            .where(activity.user_id.in_(pulled_ids))
+            .order_by(desc(activity.created_at), desc(activity.id))
+            .limit(limit)
+        )
+        if after:
+            pulled = pulled.where(after_position(activity.created_at, (activity.id,), kind, after))
+        timelines.append((await session.execute(pulled)).mappings().all())
 
-    return comments_data
+    return [{**row, 'kind': kind} for row in feed.merge_latest(*timelines, limit=limit)]
 
 
-async def get_following_users_reviews(current_user_id: int, session: AsyncSession):
+async def following_watched(current_user_id: int, session: AsyncSession, limit: int, after: FeedPosition | None):
     """
-    Retorna os útimos avaliacoes de usuários seguidos.
+    Últimas mídias marcadas como assistidas pelos usuários seguidos. O id da atividade é o da mídia;
+    como dois seguidos podem assistir a mesma mídia no mesmo instante, a ordem e o cursor usam
+    (user_list_id, media_id), a chave da linha.
 
     Args:
         current_user_id (int): usuário logado.
         session (AsyncSession): sessão do banco de dados ativa.
+        limit (int): quantidade máxima de atividades.
+        after (FeedPosition | None): posição no feed unificado a partir da qual buscar.
     """
-
     stmt = (
         select(
-            Review.user_id.label("user_id"),
-            Review.score.label("score"),
+            UserListMedia.media_id.label("id"),
+            UserListMedia.user_list_id.label("user_list_id"),
+            UserList.user_id.label("user_id"),
+            UserListMedia.added_at.label("created_at"),
             Media.title.label("media_title"),
             Media.id.label("media_id"),
             Media.poster_url.label("media_poster_url"),
         )
-        .join(Follows, Follows.followed_id == Review.user_id)
-        .join(Media, Media.id == Review.media_id)
+        .join(UserList, UserList.id == UserListMedia.user_list_id)
+        .join(Follows, Follows.followed_id == UserList.user_id)
+        .join(Media, Media.id == UserListMedia.media_id)
+        .where(Follows.follower_id == current_user_id, UserList.name == ListType.WATCHED)
+        .order_by(desc(UserListMedia.added_at), desc(UserListMedia.user_list_id), desc(UserListMedia.media_id))
+        .limit(limit)
+    )
+    if after:
+        key_columns = UserListMedia.user_list_id, UserListMedia.media_id
+        stmt = stmt.where(after_position(UserListMedia.added_at, key_columns, ActivityKind.WATCHED, after))
+
+    result = await session.execute(stmt)
+    return [{**row, 'kind': ActivityKind.WATCHED} for row in result.mappings()]
+
+
+async def following_forum_groups(current_user_id: int, session: AsyncSession, limit: int, after: FeedPosition | None):
+    """
+    Últimos grupos do fórum criados pelos usuários seguidos.
+
+    Args:
+        current_user_id (int): usuário logado.
+        session (AsyncSession): sessão do banco de dados ativa.
+        limit (int): quantidade máxima de atividades.
+        after (FeedPosition | None): posição no feed unificado a partir da qual buscar.
+    """
+    stmt = (
+        select(
+            ForumGroup.id.label("id"),
+            ForumGroup.user_id.label("user_id"),
+            ForumGroup.created_at.label("created_at"),
+            ForumGroup.title.label("title"),
+            ForumGroup.content.label("content"),
+        )
+        .join(Follows, Follows.followed_id == ForumGroup.user_id)
         .where(Follows.follower_id == current_user_id)
-        .order_by(desc(Review.created_at))
-        .limit(7)
+        .order_by(desc(ForumGroup.created_at), desc(ForumGroup.id))
+        .limit(limit)
     )
+    if after:
+        stmt = stmt.where(after_position(ForumGroup.created_at, (ForumGroup.id,), ActivityKind.FORUM, after))
+
+    result = await session.execute(stmt)
+    return [{**row, 'kind': ActivityKind.FORUM} for row in result.mappings()]
+
+
+def after_position(created_at_column, key_columns: tuple, kind: ActivityKind, after: FeedPosition):
+    """
+    Condição para as atividades de `kind` que vêm depois de `after` no feed, ordenado de forma
+    decrescente por (created_at, kind, chave). Como o tipo é fixo em cada consulta, a comparação
+    vira um intervalo sobre (created_at, *chave), que o índice do tipo atende.
+    """
+    created_at, after_kind, key = after
+    if kind.value < after_kind.value:
+        return created_at_column <= created_at
+    if kind == after_kind:
+        return tuple_(created_at_column, *key_columns) < tuple_(created_at, *key)
+    return created_at_column < created_at
+
+
+def feed_position(activity: dict[str, Any]) -> FeedPosition:
+    return activity['created_at'], activity['kind'], activity_key(activity)
+
+
+def activity_key(activity: dict[str, Any]) -> tuple[int, ...]:
+    if activity['kind'] == ActivityKind.WATCHED:
+        return activity['user_list_id'], activity['id']
+    return (activity['id'],)
 
-    reviews = await session.execute(stmt)
 
-    reviews_data = reviews.mappings().all()
+def decode_feed_cursor(cursor: str) -> FeedPosition:
+    """
+    Lê o cursor do feed unificado.
+
+    Raises:
+        BusinessError: caso o cursor seja inválido.
+    """
+    created_at, kind, key = decode_cursor(cursor, size=3)
+    try:
+        kind = ActivityKind(kind)
+    except ValueError:
+        raise BusinessError('Cursor inválido.')
+
+    key_size = 2 if kind == ActivityKind.WATCHED else 1
+    if not isinstance(key, list) or len(key) != key_size:
+        raise BusinessError('Cursor inválido.')
 
-    return reviews_data
+    return decode_datetime(created_at), kind, tuple(decode_id(value) for value in key)
@@ -8,7 +8,7 @@ from controllers.user_controller import existing_user, validate_user
 from exceptions.business_error import BusinessError
 from models.forum_group_model import ForumGroup
 from models.forum_participant_model import ForumParticipant
-from models.media_model import MediaComment
+from models.media_comment_model import MediaComment
 
 
 async def create_forum_participant(participant_id: int, id_forum_group: int, current_user_id: int, session: AsyncSession) -> MediaComment:
@@ -1,10 +1,15 @@
-from sqlalchemy import select
+from sqlalchemy import desc, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from controllers.media_controller import existing_media
-from controllers.user_controller import validate_user
+from controllers.user_controller import profile_cache_key, validate_user
+from controllers.user_stats_controller import apply_counts
 from exceptions.record_not_found_error import RecordNotFoundError
-from models.media_model import MediaComment
+from models.feed_entry_model import ActivityKind
+from models.media_comment_model import MediaComment
+from pagination import decode_cursor, decode_datetime, decode_id, encode_cursor
+from services import feed
+from services.cache import cache
 
 
 async def create_media_comment(media_id: int, content: str, user_id: int, session: AsyncSession) -> MediaComment:
@@ -18,7 +23,7 @@ async def create_media_comment(media_id: int, content: str, user_id: int, sessio
         session (AsyncSession): sessão ativa do banco de dados.
     """
 
-    media = await existing_media(media_id, session)
+    await existing_media(media_id, session)
 
     new_comment = MediaComment(
         media_id=media_id,
@@ -27,13 +32,55 @@ async def create_media_comment(media_id: int, content: str, user_id: int, sessio
     )
 
     session.add(new_comment)
+    await session.flush()
+    await feed.publish(session, ActivityKind.COMMENT, new_comment.id, user_id)
+    await apply_counts(user_id, session, comment_count=1)
     await session.commit()
     await session.refresh(new_comment)
-    await session.refresh(media)
+    await cache.delete(profile_cache_key(user_id))
 
     return new_comment
 
 
+async def get_media_comments(media_id: int, session: AsyncSession, limit: int = 20, cursor: str | None = None):
+    """
+    Retorna os comentários de um filme ou série, dos mais novos para os mais antigos,
+    com paginação por cursor sobre (created_at, id).
+
+    Args:
+        media_id (int): id do filme ou série.
+        session (AsyncSession): sessão ativa do banco de dados.
+        limit (int): quantidade máxima de comentários da página.
+        cursor (str | None): cursor devolvido pela página anterior.
+
+    Raises:
+        RecordNotFoundError: caso a mídia não seja encontrada.
+        BusinessError: caso o cursor seja inválido.
+    """
+    await existing_media(media_id, session)
+
+    stmt = (
+        select(MediaComment)
+        .where(MediaComment.media_id == media_id)
+        .order_by(desc(MediaComment.created_at), desc(MediaComment.id))
+        .limit(limit + 1)  # um a mais para saber se existe próxima página
+    )
+
+    if cursor:
+        created_at, comment_id = decode_cursor(cursor, size=2)
+        position = decode_datetime(created_at), decode_id(comment_id)
+        stmt = stmt.where(tuple_(MediaComment.created_at, MediaComment.id) < tuple_(*position))
+
+    comments = (await session.scalars(stmt)).all()
+
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+
+    return {'comments': comments, 'next_cursor': next_cursor}
+
+
 async def delete_media_comment(media_id: int, comment_id: int, current_user_id: int, session: AsyncSession) -> None:
     """
    Deleta um comentário para filme ou série.
@@ -56,5 +103,8 @@ async def delete_media_comment(media_id: int, comment_id: int, current_user_id:
 
     validate_user(current_user_id, comment.user_id)
 
+    await feed.retract(session, ActivityKind.COMMENT, comment.id)
+    await apply_counts(current_user_id, session, comment_count=-1)
     await session.delete(comment)
     await session.commit()
+    await cache.delete(profile_cache_key(current_user_id))
@@ -1,52 +1,142 @@
 from typing import List
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import desc, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, contains_eager, joinedload
 
+from database import load_on_primary
 from exceptions.record_not_found_error import RecordNotFoundError
-from models.media_model import Genre, Media, media_genre
+from models.media_comment_model import MediaComment
+from models.media_model import Media, media_genre, popularity_key
+from models.media_neighbor_model import MediaNeighbor
+from models.media_rating_model import MediaRating
 from models.review_model import Review
 from models.user_list_model import ListType, UserList, UserListMedia
+from pagination import decode_cursor, decode_id, decode_number, encode_cursor
+from schemas.media_schemas import FilterMediaShow
+from services.cache import cache
+from services.leaderboard import leaderboard
+from services.media_catalog import MediaSummary, media_catalog
+from services.media_sampler import media_sampler
+from services.media_search import search_statement
+from services.recommender import recommender
+from services.title_index import title_index
+
+# quantidade de comentários embutidos na página de detalhes da mídia
+LATEST_COMMENTS_LIMIT = 10
+# validade, em segundos, dos ids das páginas de busca e por gênero no cache compartilhado
+MEDIA_LIST_TTL = 300
 
 
 async def get_media(media_id: int, current_user_id: int, session: AsyncSession):
     """
-    Método retorna um post específico.
+    Método retorna um filme ou série específico, com todas as informações da página de detalhes.
+
+    Tudo é montado numa única consulta: gêneros via joinedload, os comentários mais recentes
+    (LATEST_COMMENTS_LIMIT) via subconsulta limitada, o agregado de avaliações via outer join
+    e o estado do usuário (nota e lista "quero assistir") via subconsultas escalares.
 
     Args:
         media_id (int): id do filme ou série.
+        current_user_id (int): id do usuário logado.
         session (AsyncSession): sessão ativa do banco de dados.
+
+    Raises:
+        RecordNotFoundError: caso a mídia pesquisada não seja encontrada.
     """
-    return await existing_media(media_id, session, current_user_id)
+    user_review = (
+        select(Review.score)
+        .where((Review.user_id == current_user_id) & (Review.media_id == Media.id))
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    to_watch_list = (
+        select(UserListMedia.media_id)
+        .join(UserList, UserListMedia.user_list_id == UserList.id)
+        .where(
+            UserList.user_id == current_user_id,
+            UserList.name == ListType.TO_WATCH,
+            UserListMedia.media_id == Media.id
+        )
+        .exists()
+    )
+
+    comments_count = (
+        select(func.count(MediaComment.id))
+        .where(MediaComment.media_id == Media.id)
+        .scalar_subquery()
+    )
+
+    latest_comments = aliased(
+        MediaComment,
+        select(MediaComment)
+        .where(MediaComment.media_id == media_id)
+        .order_by(desc(MediaComment.created_at), desc(MediaComment.id))
+        .limit(LATEST_COMMENTS_LIMIT)
+        .subquery()
+    )
+
+    stmt = (
+        select(
+            Media,
+            func.coalesce(MediaRating.score_sum, 0),
+            func.coalesce(MediaRating.score_count, 0),
+            user_review,
+            to_watch_list,
+            comments_count,
+        )
+        .outerjoin(MediaRating, MediaRating.media_id == Media.id)
+        .outerjoin(latest_comments, latest_comments.media_id == Media.id)
+        .options(
+            joinedload(Media.genres),
+            contains_eager(Media.comments.of_type(latest_comments)),
+        )
+        .where(Media.id == media_id)
+        .order_by(desc(latest_comments.created_at), desc(latest_comments.id))
+        .execution_options(populate_existing=True)
+    )
+
+    result = await session.execute(stmt)
+    row = result.unique().first()
+
+    if not row:
+        raise RecordNotFoundError('Título não encontrado no WatchHive.')
 
+    media, score_sum, score_count, score, in_list, total_comments = row
 
-async def get_random_medias(genre_id: int, movie: bool, session: AsyncSession, limit: int = 20, offset: int = 0) -> List[Media]:
+    media.comments_count = total_comments
+    media.average_score = score_sum / score_count if score_count else 0.0
+    media.vote_count = score_count
+    media.user_review = score
+    media.to_watch_list = bool(in_list)
+
+    return media
+
+
+async def get_random_medias(
+    genre_id: int,
+    movie: bool,
+    session: AsyncSession,
+    limit: int = 20,
+) -> List[MediaSummary]:
     """
     Retorna vinte filmes aleatórios baseado num gênero específico.
+    O sorteio é feito no índice em memória (services.media_sampler), sem ORDER BY random() no banco,
+    e as mídias sorteadas vêm do catálogo em memória (services.media_catalog).
 
     Args:
         genre_id (int): gênero a ser buscado.
         movie (bool): infoma se é filme ou não.
-        offset (int): Número de registros a pular (paginação).
-        limit (int): Número máximo de registros a retornar (paginação).
+        limit (int): Número máximo de registros a retornar.
     """
 
     media_type = 'filme' if movie else 'série'
 
-    medias = await session.scalars(
-        select(Media)
-        .join(Media.genres)
-        .where(
-            Genre.id == genre_id,  # Filtra pelo gênero
-            Media.media_type == media_type  # Filtra pelo tipo ('filme' ou 'série')
-        )
-        .order_by(func.random())
-        .limit(limit)
-        .offset(offset)
-    )
+    await media_sampler.ensure_loaded(session)
+    ids = media_sampler.sample(genre_id, media_type, limit)
 
-    return medias
+    return await media_catalog.summaries(ids, session)
 
 
 async def search_medias_by_title(
@@ -54,10 +144,14 @@ async def search_medias_by_title(
     session: AsyncSession,
     offset: int = 0,
     limit: int = 50,
-) -> List[Media]:
+) -> List[MediaSummary]:
     """
-    Busca mídias cujo título contenha o termo de pesquisa (case-insensitive) 
-    e aplica paginação.
+    Busca mídias cujo título ou título original contenha o termo de pesquisa (case-insensitive)
+    e aplica paginação. Os resultados mais parecidos com o termo e mais populares vêm primeiro.
+    Veja services.media_search para os detalhes de cada banco.
+
+    O banco devolve apenas os ids da página, que ficam no cache compartilhado por MEDIA_LIST_TTL
+    segundos; as linhas vêm do catálogo em memória.
 
     Args:
         search_term (str): O termo de pesquisa (ex: 'ba').
@@ -66,261 +160,228 @@ async def search_medias_by_title(
         limit (int): Número máximo de registros a retornar (paginação).
 
     Returns:
-        List[Media]: Uma lista de objetos Media que correspondem à pesquisa.
+        List[MediaSummary]: Os resumos das mídias que correspondem à pesquisa.
     """
 
-    # pesquisa com curingas (%) - tipo o like no sql
-    like_term = f"%{search_term}%"
+    async def load_ids(session: AsyncSession):
+        stmt = (
+            search_statement(search_term, session.bind.dialect.name)
+            .with_only_columns(Media.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        return (await session.scalars(stmt)).all()
 
-    stmt = (
-        select(Media)
-        .where(Media.title.ilike(like_term))  # .ilike() para busca case-insensitive
-        .order_by(Media.title)  # ordena por título para melhor usabilidade (ordem alfabética)
-        .offset(offset)
-        .limit(limit)
-    )
+    key = f'media:search:{search_term.casefold()}:{offset}:{limit}'
+    ids = await cache.get_or_load(key, lambda: load_on_primary(session, load_ids), MEDIA_LIST_TTL)
 
-    medias = await session.scalars(stmt)
+    return await media_catalog.summaries(ids, session)
 
-    return medias
 
+async def suggest_medias_by_title(search_term: str, session: AsyncSession, limit: int = 10) -> list[dict]:
+    """
+    Sugestões de títulos para o typeahead, servidas do índice de prefixos em memória
+    (services.title_index). O banco só é lido na primeira carga do índice.
 
-async def show_medias_by_genre_page(
-    genre_id: int,
-    movie: bool,
-    limit: int,
-    offset: int,
-    session=AsyncSession,
-) -> List[Media]:
+    Args:
+        search_term (str): texto digitado até o momento.
+        session (AsyncSession): A sessão ativa do banco.
+        limit (int): Número máximo de sugestões.
     """
-    Retorna os filmes ou séries aleatórios baseado num gênero específico.
-    Utiliza a função get_random_medias() para auxiliar.
+    await title_index.ensure_loaded(session)
+
+    return title_index.suggest(search_term, limit)
+
+
+async def show_medias_by_genre_page(filter_page: FilterMediaShow, session: AsyncSession) -> dict:
+    """
+    Retorna os filmes ou séries de um gênero específico, dos mais populares para os menos populares.
+
+    A paginação é por cursor sobre (popularidade, id): com o cursor devolvido pela página anterior
+    o banco continua a partir do último registro, usando o índice ix_media_media_type_popularity,
+    sem varrer e descartar as páginas anteriores. O offset só é aplicado quando não há cursor.
+    O banco devolve apenas ids e popularidade, que ficam no cache compartilhado por MEDIA_LIST_TTL
+    segundos; as linhas vêm do catálogo em memória.
 
     Args:
-        genre_id (int): gênero a ser buscado.
-        movie (bool): infoma se é filme ou não.
-        offset (int): Número de registros a pular (paginação).
-        limit (int): Número máximo de registros a retornar (paginação).
+        filter_page (FilterMediaShow): gênero, tipo (filme ou série), limit, offset e cursor
+            devolvido pela página anterior.
+        session (AsyncSession): A sessão ativa do banco.
+
+    Raises:
+        BusinessError: caso o cursor seja inválido.
     """
 
-    media_type = 'filme' if movie else 'série'
+    genre_id, limit, offset, cursor = filter_page.genre_id, filter_page.limit, filter_page.offset, filter_page.cursor
+    media_type = 'filme' if filter_page.movie else 'série'
 
-    medias = await session.scalars(
-        select(Media)
-        .join(Media.genres)
-        .where(
-            Genre.id == genre_id,  # Filtra pelo gênero
-            Media.media_type == media_type  # Filtra pelo tipo ('filme' ou 'série')
+    # valida o cursor antes de consultar o cache
+    position = None
+    if cursor:
+        popularity, last_id = decode_cursor(cursor, size=2)
+        position = decode_number(popularity), decode_id(last_id)
+
+    async def load_page(session: AsyncSession):
+        stmt = (
+            select(Media.id, popularity_key)
+            .join(media_genre, media_genre.c.media_id == Media.id)
+            .where(
+                media_genre.c.genre_id == genre_id,  # Filtra pelo gênero
+                Media.media_type == media_type  # Filtra pelo tipo ('filme' ou 'série')
+            )
+            .order_by(desc(popularity_key), desc(Media.id))
+            .limit(limit + 1)  # um a mais para saber se existe próxima página
         )
-        .order_by(desc(Media.popularity))
-        .limit(limit)
-        .offset(offset)
-    )
 
-    return medias
+        if position:
+            stmt = stmt.where(tuple_(popularity_key, Media.id) < tuple_(*position))
+        else:
+            stmt = stmt.offset(offset)
+
+        rows = (await session.execute(stmt)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            media_id, popularity = rows[-1]
+            next_cursor = encode_cursor(popularity, media_id)
+
+        return {'ids': [media_id for media_id, _ in rows], 'next_cursor': next_cursor}
+
+    key = f'media:genre:{genre_id}:{media_type}:{limit}:{offset}:{cursor}'
+    page = await cache.get_or_load(key, lambda: load_on_primary(session, load_page), MEDIA_LIST_TTL)
+
+    medias = await media_catalog.summaries(page['ids'], session)
 
+    return {'medias': medias, 'next_cursor': page['next_cursor']}
 
-async def existing_media(media_id: int, session: AsyncSession, current_user_id: int = None,) -> Media:
+
+async def existing_media(media_id: int, session: AsyncSession) -> Media:
     """
     Método responsável por validar se o filme ou série existe e, caso seja verdade, o retorne.
+    Para a página de detalhes, utilize get_media().
 
     Args:
         media_id (int): id do filme ou série.
         session (AsyncSession): sessão ativa do banco.
-        current_user_id (int): id do usuário logado
 
     Raises:
         RecordNotFoundError: caso a mídia pesquisada não seja encontrada.
     """
     media = await session.scalar(
         select(Media)
-        .options(selectinload(Media.genres))
-        .options(selectinload(Media.comments))
         .where((Media.id == media_id))
     )
 
     if not media:
         raise RecordNotFoundError('Título não encontrado no WatchHive.')
 
-    media.average_score = await get_average_score(media.id, session)
-    media.vote_count = await get_votes_count(media.id, session)
-
-    if current_user_id:
-        review = await session.scalar(
-            select(Review)
-            .where((Review.user_id == current_user_id) & (Review.media_id == media_id))
-        )
-
-        media_in_list = await session.scalar(
-            select(UserListMedia)
-            .join(UserList, UserListMedia.user_list_id == UserList.id)
-            .where(
-                UserList.user_id == current_user_id,
-                UserList.name == ListType.TO_WATCH,
-                UserListMedia.media_id == media_id
-            )
-        )
-        media.to_watch_list = True if media_in_list else False
-        media.user_review = review.score if review else None
-
     return media
 
 
-async def get_best_rated_medias(
-    session: AsyncSession,
-    limit: int,
-):
+async def get_similar_medias(media_id: int, limit: int, session: AsyncSession) -> list[MediaSummary]:
     """
-    Retorna uma lista de mídias (filmes ou séries) ordenadas pela pontuação média mais alta.
+    Retorna as mídias mais parecidas com uma mídia ("mais como este"), lidas da tabela
+    media_neighbor, que é calculada em lote por services.media_neighbors. Do banco vêm só os ids;
+    as linhas vêm do catálogo em memória.
 
     Args:
         media_id (int): id do filme ou série.
+        limit (int): quantidade de mídias.
         session (AsyncSession): sessão ativa do banco.
-    """
-    # coluna para calcular
-    average_score = func.avg(Review.score).label("average_score")
 
-    # vote_count = func.count(Review.id).label("vote_count")
-
-    stmt = (
-        select(
-            Media
-        )
-        .join(Review, Media.id == Review.media_id)
-        .group_by(Media.id)
-        # .having(vote_count >= 5) # mínimo de votos
-        .order_by(desc(average_score))
+    Raises:
+        RecordNotFoundError: caso a mídia pesquisada não seja encontrada.
+    """
+    ids = (await session.scalars(
+        select(Media.id)
+        .join(MediaNeighbor, MediaNeighbor.neighbor_id == Media.id)
+        .where(MediaNeighbor.media_id == media_id)
+        .order_by(desc(MediaNeighbor.score), desc(popularity_key), Media.id)
         .limit(limit)
-    )
+    )).all()
 
-    result = await session.execute(stmt)
+    if not ids:
+        await existing_media(media_id, session)
 
-    medias: List[Media] = result.scalars().all()
+    return await media_catalog.summaries(ids, session)
 
-    return medias
 
-
-async def get_recommended_medias(current_user_id: int, limit: int, session: AsyncSession):
+async def get_best_rated_medias(
+    session: AsyncSession,
+    limit: int,
+    movie: bool | None = None,
+    genre_id: int | None = None,
+) -> list[dict]:
     """
-    Retorna filmes recomedados a partir da última avaliação do usuário.
-    A partir dos gêneros do último filme/série avaliado(a), retorna uma lista de mídias
-    com as melhores médias de avaliações dos outros usuários da plataforma.
-
-    Caso o usuário já tenha assistido, não é considerado.
+    Retorna uma lista de mídias (filmes ou séries) ordenadas pela nota ponderada mais alta.
+    O ranking é servido da memória (services.leaderboard), que combina as avaliações do WatchHive
+    com as do TMDB numa média bayesiana; o banco só é lido quando o ranking é recarregado.
 
     Args:
-        current_user_id (int): id do usuário logado
-        limit (int): limite de mídias
-        session (AsyncSession): sessão ativa do banco
+        session (AsyncSession): sessão ativa do banco.
+        limit (int): quantidade de mídias.
+        movie (bool | None): True para filmes, False para séries, None para ambos.
+        genre_id (int | None): filtra por gênero, quando informado.
     """
+    await leaderboard.ensure_loaded(session)
 
-    stmt_last_review = (
-        select(Review.media_id)
-        .where(
-            (Review.user_id == current_user_id) &
-            (Review.score >= 4)
-        )
-        .order_by(desc(Review.created_at))
-        .limit(1)
-    ).cte("UltimaReview")
-
-    stmt_generos = (
-        select(media_genre.c.genre_id)
-        .where(media_genre.c.media_id.in_(select(stmt_last_review.c.media_id)))
-    ).cte("GenerosRecomendados")
-
-    stmt_internal_rank = (
-        select(
-            Review.media_id.label("media_id"),
-            func.avg(Review.score).label("internal_avg"),
-            func.count(Review.id).label("internal_count")
-        )
-        .group_by(Review.media_id)
-    ).cte("MediaDosFilmes")
+    media_type = None if movie is None else ('filme' if movie else 'série')
 
-    watched_user_list_id_stmt = (
-        select(UserList.id)
-        .where(
-            (UserList.user_id == current_user_id) &
-            (UserList.name == ListType.WATCHED)
-        )
-    ).scalar_subquery()
+    return leaderboard.top(limit, media_type=media_type, genre_id=genre_id)
 
-    stm_already_seen = (
-        select(UserListMedia.media_id.label("id"))
-        .where(
-            UserListMedia.user_list_id == watched_user_list_id_stmt
-        )
-    ).cte("MidiasAssistidas")
 
-    final_select = (
-        select(
-            Media.id,
-            Media.title,
-            Media.poster_url,
-            stmt_internal_rank.c.internal_avg,
-        )
-        # garante que apenas filmes com reviews sejam considerados
-        .join(stmt_internal_rank, Media.id == stmt_internal_rank.c.media_id)
-        .where(
-            Media.id.in_(
-                select(media_genre.c.media_id)
-                .where(media_genre.c.genre_id.in_(select(stmt_generos.c.genre_id)))
-            ),
-            Media.id != select(stmt_last_review.c.media_id).scalar_subquery(),
-            Media.id.notin_(select(stm_already_seen.c.id)),
-        )
-        .order_by(
-            desc(stmt_internal_rank.c.internal_avg),
-        )
-        .limit(limit)
-    )
-
-    result = await session.execute(final_select)
+async def get_genres(session: AsyncSession) -> list[dict]:
+    """
+    Retorna todos os gêneros em ordem alfabética, servidos do catálogo em memória
+    (services.media_catalog).
 
-    recommended_medias_list = [
-        {
-            "id": row[0],
-            "title": row[1],
-            "poster_url": row[2],
-            "average_score": row[3],
-        }
-        for row in result.unique()
-    ]
+    Args:
+        session (AsyncSession): sessão ativa do banco.
+    """
+    await media_catalog.ensure_loaded(session)
 
-    return recommended_medias_list
+    return media_catalog.genres()
 
 
-async def get_average_score(media_id: int, session) -> float:
+def listing_version(medias: list[MediaSummary], *extra) -> tuple:
     """
-    Retorna a média das avaliações da mídia.
+    Versão de uma listagem montada do catálogo em memória (busca, gênero, similares), para o
+    ETag: os ids na ordem da página e a versão do catálogo, que muda com qualquer alteração
+    de título, pôster ou popularidade. Chamar depois de montar a listagem.
 
     Args:
-        media_id (int): id do filme ou série.
-        session (AsyncSession): sessão ativa do banco.
+        medias (list[MediaSummary]): mídias da página.
+        extra: outros valores da resposta (ex.: o cursor da próxima página).
     """
-    stmt = select(func.avg(Review.score)).where(Review.media_id == media_id)
-
-    result = await session.execute(stmt)
+    return [media.id for media in medias], *extra, media_catalog.version_tag
 
-    average_score = result.scalar_one_or_none()
 
-    # se for None (sem reviews), retorna zero
-    return average_score if average_score is not None else 0.0
+def best_rated_version() -> str:
+    """
+    Versão do ranking em memória, para o ETag de get_best_rated_medias(). Chamar depois dela.
+    """
+    return leaderboard.version_tag
 
 
-async def get_votes_count(media_id: int, session) -> int:
+def genres_version() -> str:
     """
-    Retorna a quantidad de avaliações da mídia.
-
-    Args:
-        media_id (int): id do filme ou série.
-        session (AsyncSession): sessão ativa do banco.
+    Versão do catálogo em memória, para o ETag de get_genres(). Chamar depois dela.
     """
-    stmt = select(func.count(Review.id)).where(Review.media_id == media_id)
+    return media_catalog.version_tag
 
-    result = await session.execute(stmt)
 
-    vote_count = result.scalar_one_or_none()
+async def get_recommended_medias(current_user_id: int, limit: int, session: AsyncSession):
+    """
+    Retorna filmes e séries recomendados a partir das avaliações recentes do usuário.
+    A partir dos gêneros das mídias bem avaliadas (nota >= 4) pelo usuário, retorna as mídias
+    desses gêneros com as melhores notas da plataforma (ver services.recommender).
 
-    return vote_count if vote_count is not None else 0
+    Caso o usuário já tenha assistido ou avaliado, não é considerado.
+
+    Args:
+        current_user_id (int): id do usuário logado
+        limit (int): limite de mídias
+        session (AsyncSession): sessão ativa do banco
+    """
+    return await recommender.recommend(current_user_id, limit, session)
@@ -0,0 +1,53 @@
+from sqlalchemy import Float, cast, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import dialect_insert
+from models.media_rating_model import MediaRating
+
+# média calculada a partir do agregado, para ser usada em ordenações
+average_score_column = cast(MediaRating.score_sum, Float) / MediaRating.score_count
+
+
+async def get_media_rating(media_id: int, session: AsyncSession) -> MediaRating | None:
+    """
+    Retorna o agregado de avaliações da mídia, caso ela já tenha sido avaliada.
+
+    Args:
+        media_id (int): id do filme ou série.
+        session (AsyncSession): sessão ativa do banco.
+    """
+    return await session.scalar(
+        select(MediaRating).where(MediaRating.media_id == media_id)
+    )
+
+
+async def apply_score(media_id: int, new_score: int, session: AsyncSession, old_score: int | None = None):
+    """
+    Atualiza o agregado de avaliações da mídia dentro da transação corrente.
+    Não faz commit: quem chama (create_review/update_review) é responsável por isso.
+
+    Args:
+        media_id (int): id do filme ou série.
+        new_score (int): nova nota dada pelo usuário.
+        session (AsyncSession): sessão ativa do banco.
+        old_score (int | None): nota anterior, quando é uma atualização de avaliação.
+    """
+    if old_score == new_score:
+        return
+
+    # variação de cada coluna: na primeira avaliação da mídia, são os próprios valores
+    deltas = {'score_sum': new_score - (old_score or 0), f'score_{new_score}': 1}
+    if old_score is None:
+        deltas['score_count'] = 1
+    else:
+        deltas[f'score_{old_score}'] = -1
+
+    # upsert atômico no banco, evitando perder incrementos concorrentes (inclusive na
+    # primeira avaliação, quando duas podem tentar criar o agregado ao mesmo tempo)
+    stmt = dialect_insert(session)(MediaRating).values(media_id=media_id, **deltas)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[MediaRating.media_id],
+            set_={column: getattr(MediaRating, column) + getattr(stmt.excluded, column) for column in deltas},
+        )
+    )
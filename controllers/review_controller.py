@@ -1,81 +1,109 @@
-from sqlalchemy import select
+from sqlalchemy import literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from controllers.media_controller import existing_media
+from controllers.media_rating_controller import apply_score
+from controllers.user_controller import profile_cache_key
 from controllers.user_list_controller import add_to_list_to_watched
+from controllers.user_stats_controller import apply_counts
+from database import dialect_insert
 from exceptions.business_error import BusinessError
 from exceptions.record_not_found_error import RecordNotFoundError
+from models.feed_entry_model import ActivityKind
 from models.media_model import Media
 from models.review_model import Review
+from services import feed
+from services.cache import cache
+from services.leaderboard import leaderboard
+from services.recommender import recommender
 
 
-async def create_review(media_id: int, user_id: int, score: int, session: AsyncSession) -> Media:
+async def create_review(media_id: int, user_id: int, score: int, session: AsyncSession) -> Review:
     """
     Método responsável por criar um review.
 
+    Tudo numa única transação e com poucos comandos: o INSERT ... ON CONFLICT DO NOTHING só
+    insere se a mídia existir e se o usuário ainda não a avaliou (restrição única de
+    user_id e media_id, que também barra envios concorrentes); o agregado da mídia, os totais
+    do usuário e a lista de assistidos são atualizados com upserts.
+
     Args:
         media_id (int): id do filme ou série.
         user_id (int): id do usuário ativo.
-
+        score (int): nota, de 1 a 5.
         session (AsyncSession): sessão ativa do banco.
 
     Raises:
         RecordNotFoundError: caso a mídia pesquisada não seja encontrada.
+        BusinessError: caso o usuário já tenha avaliado a mídia ou a nota seja inválida.
     """
-    media = await existing_media(media_id, session)
-
     check_score_value(score)
 
-    review = await existing_review(user_id, media_id, session)
+    review = await session.scalar(
+        dialect_insert(session)(Review)
+        .from_select(
+            ['user_id', 'media_id', 'score'],
+            select(literal(user_id), Media.id, literal(score)).where(Media.id == media_id)
+        )
+        .on_conflict_do_nothing(index_elements=['user_id', 'media_id'])
+        .returning(Review)
+    )
 
-    if review:
+    if review is None:
+        # nada inserido: a mídia não existe ou já foi avaliada pelo usuário
+        await existing_media(media_id, session)
         raise BusinessError('Usuário já avaliou está mídia.')
 
-    review = Review(
-        user_id=user_id,
-        media_id=media_id,
-        score=score
-    )
-
-    session.add(review)
+    await apply_score(media_id, score, session)
     await add_to_list_to_watched(user_id, media_id, session)
+    await apply_counts(user_id, session, review_count=1)
+    await feed.publish(session, ActivityKind.REVIEW, review.id, user_id)
 
     await session.commit()
-    await session.refresh(review)
+    await cache.delete(profile_cache_key(user_id))
+
+    await leaderboard.record_score(media_id, score)
+    await recommender.invalidate_user(user_id)
 
     return review
 
 
-async def update_review(media_id: int, user_id: int, score: int, session: AsyncSession) -> Media:
+async def update_review(media_id: int, user_id: int, score: int, session: AsyncSession) -> Review:
     """
     Método responsável por atualizar um review.
 
+    A avaliação é lida com bloqueio (SELECT ... FOR UPDATE), para que duas alterações
+    simultâneas não usem a mesma nota antiga ao corrigir o agregado da mídia.
+
     Args:
         media_id (int): id do filme ou série.
         user_id (int): id do usuário ativo.
-
+        score (int): nova nota, de 1 a 5.
         session (AsyncSession): sessão ativa do banco.
 
     Raises:
-        RecordNotFoundError: caso a mídia pesquisada não seja encontrada.
+        RecordNotFoundError: caso a mídia ainda não tenha sido avaliada pelo usuário.
     """
-    media = await existing_media(media_id, session)
-
     check_score_value(score)
 
-    review = await existing_review(user_id, media_id, session)
+    review = await existing_review(user_id, media_id, session, for_update=True)
 
     if not review:
         raise RecordNotFoundError("Avaliação não encontrada.")
 
+    old_score = review.score
+    await apply_score(media_id, score, session, old_score=old_score)
+
     review.score = score
     await session.commit()
-    await session.refresh(review)
+
+    await leaderboard.record_score(media_id, score, old_score=old_score)
+    await recommender.invalidate_user(user_id)
 
     return review
 
 
-async def existing_review(user_id: int, media_id: int, session: AsyncSession):
+async def existing_review(user_id: int, media_id: int, session: AsyncSession, for_update: bool = False):
     """
     Método retorna um review, caso já esteja criado.
 
@@ -83,12 +111,14 @@ async def existing_review(user_id: int, media_id: int, session: AsyncSession):
         user_id (int): id do usuário ativo.
         media_id (int): id do filme ou série.
         session (AsyncSession): sessão ativa do banco de dados.
+        for_update (bool): bloqueia a linha até o fim da transação (SELECT ... FOR UPDATE).
     """
+    stmt = select(Review).where((Review.user_id == user_id) & (Review.media_id == media_id))
 
-    review = await session.scalar(
-        select(Review)
-        .where((Review.user_id == user_id) & (Review.media_id == media_id))
-    )
+    if for_update:
+        stmt = stmt.with_for_update()
+
+    review = await session.scalar(stmt)
 
     return review
 
@@ -6,16 +6,27 @@ from sqlalchemy import and_, func, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from controllers.user_stats_controller import discount_follows
+from database import load_on_primary
 from exceptions.business_error import BusinessError
 from exceptions.permission_error import PermissionError
 from exceptions.record_not_found_error import RecordNotFoundError
 from models.follows_model import Follows
 from models.media_comment_model import MediaComment
 from models.media_model import Media
-from models.review_model import Review
 from models.user_list_model import ListType, UserList
 from models.user_model import User
+from models.user_stats_model import UserStats
 from security import get_password_hash
+from services.cache import cache
+from services.identity_cache import identity_cache
+
+# validade, em segundos, da parte pública do perfil no cache compartilhado
+PROFILE_TTL = 60
+
+
+def profile_cache_key(user_id: int) -> str:
+    return f'user:profile:{user_id}'
 
 
 async def create_user(name: str, email: str, password: str, avatar: int, session: AsyncSession):
@@ -106,6 +117,8 @@ async def patch_user(current_user: User, name: str | None, avatar: int | None, p
     #     current_user.password = get_password_hash(password)
 
     await session.commit()
+    await identity_cache.invalidate_user(current_user.id)
+    await cache.delete(profile_cache_key(current_user.id))
     await session.refresh(current_user)
     return current_user
 
@@ -139,6 +152,8 @@ async def update_user(
         current_user.password = get_password_hash(password)
         current_user.email = email
         await session.commit()
+        await identity_cache.invalidate_user(current_user.id)
+        await cache.delete(profile_cache_key(current_user.id))
         await session.refresh(current_user)
 
         return current_user
@@ -164,8 +179,11 @@ async def delete_user(current_user, user_id: int, session: AsyncSession):
 
     validate_user(logger_user_id=current_user.id, user_id_passed=user_id)
 
+    await discount_follows(user_id, session)
     await session.delete(current_user)  # TODO AAA: provavelmente, alguma lógita terá de ser implemntada daqui um tempo
     await session.commit()
+    await identity_cache.invalidate_user(user_id)
+    await cache.delete(profile_cache_key(user_id))
 
 
 async def get_user(user_id: int, session: AsyncSession):
@@ -279,62 +297,82 @@ async def get_public_user_profile(
     target_user_id: int,
     current_user_id: int
 ) -> Dict[str, Any]:
+    """
+    Retorna o perfil público de um usuário: dados básicos, totais de avaliações, comentários,
+    seguidores e seguidos (user_stats) e os últimos comentários.
+
+    A parte pública é igual para todos que visitam o perfil e fica no cache compartilhado por
+    PROFILE_TTL segundos (invalidada quando o usuário edita o perfil, avalia, comenta, segue
+    ou é seguido); só o "segue ou não" é consultado a cada requisição.
 
-    # checa se usuário existe
-    await existing_user(target_user_id, session)
+    Args:
+        session (AsyncSession): sessão ativa do banco.
+        target_user_id (int): usuário do perfil.
+        current_user_id (int): usuário logado.
 
-    # quantidade de reviews
-    sub_reviews = select(func.count(Review.id)).where(Review.user_id == target_user_id).scalar_subquery()
+    Raises:
+        RecordNotFoundError: caso o usuário não seja encontrado.
+    """
+
+    async def load_profile(session: AsyncSession):
+        # dados básicos e totais (mantidos na escrita, em user_stats) numa única consulta
+        result_main = await session.execute(
+            select(
+                User.id,
+                User.avatar,
+                User.name,
+                User.username,
+                func.coalesce(UserStats.review_count, 0).label("total_reviews"),
+                func.coalesce(UserStats.comment_count, 0).label("total_comments"),
+                func.coalesce(UserStats.follower_count, 0).label("total_followers"),
+                func.coalesce(UserStats.following_count, 0).label("total_following"),
+            )
+            .outerjoin(UserStats, UserStats.user_id == User.id)
+            .where(User.id == target_user_id)
+        )
 
-    # qauntidade de comentarios
-    sub_comments = select(func.count(MediaComment.id)).where(MediaComment.user_id == target_user_id).scalar_subquery()
+        profile_row = result_main.mappings().first()
+
+        if not profile_row:
+            raise RecordNotFoundError('Usuário não encontrado.')
+
+        profile_data = dict(profile_row)
+
+        # ultimos 5 comentários
+        stmt_comments = select(
+            MediaComment.content,
+            MediaComment.created_at,
+            MediaComment.user_id,
+            Media.id.label("media_id"),
+            Media.title.label("media_title"),
+            Media.poster_url.label("media_poster_url")
+        ).join(Media, Media.id == MediaComment.media_id) \
+        .where(MediaComment.user_id == target_user_id) \
+        .order_by(MediaComment.created_at.desc()) \
+        .limit(5)
+
+        result_comments = await session.execute(stmt_comments)
+
+        profile_data["latest_comments"] = [
+            dict(row) for row in result_comments.mappings()
+        ]
+
+        return profile_data
+
+    profile_data = dict(await cache.get_or_load(
+        profile_cache_key(target_user_id), lambda: load_on_primary(session, load_profile), PROFILE_TTL
+    ))
 
     # checa se segue (following)
-    sub_following = select(func.count()).select_from(Follows).where(
-        and_(
-            Follows.follower_id == current_user_id,
-            Follows.followed_id == target_user_id
+    following = await session.scalar(
+        select(Follows.follower_id).where(
+            and_(
+                Follows.follower_id == current_user_id,
+                Follows.followed_id == target_user_id
+            )
         )
-    ).scalar_subquery()
-
-    # pesquisa principal
-    stmt_main = select(
-        User.id,
-        User.avatar,
-        User.name,
-        User.username,
-        sub_reviews.label("total_reviews"),
-        sub_comments.label("total_comments"),
-        sub_following.label("is_following")
-    ).where(User.id == target_user_id)
-
-    result_main = await session.execute(stmt_main)
-
-    main_data = result_main.mappings().first()
-
-    profile_data = dict(main_data)
-
-    # preciso ajustar para boolean
-    profile_data["following"] = profile_data.pop("is_following") > 0
-
-    # ultimos 5 comentários
-    stmt_comments = select(
-        MediaComment.content,
-        MediaComment.created_at,
-        MediaComment.user_id,
-        Media.id.label("media_id"),
-        Media.title.label("media_title"),
-        Media.poster_url.label("media_poster_url")
-    ).join(Media, Media.id == MediaComment.media_id) \
-    .where(MediaComment.user_id == target_user_id) \
-    .order_by(MediaComment.created_at.desc()) \
-    .limit(5)
-
-    result_comments = await session.execute(stmt_comments)
-
-    profile_data["latest_comments"] = [
-        dict(row) for row in result_comments.mappings()
-    ]
+    )
+    profile_data["following"] = following is not None
 
     return profile_data
 
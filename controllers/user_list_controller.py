@@ -1,12 +1,13 @@
-from sqlalchemy import delete, select
+from sqlalchemy import delete, literal, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from controllers.media_controller import existing_media
+from database import dialect_insert
 from exceptions.business_error import BusinessError
 from exceptions.record_not_found_error import RecordNotFoundError
-from models.media_model import Media
 from models.user_list_model import ListType, UserList, UserListMedia
+from services.media_catalog import media_catalog
 
 
 async def add_to_list_to_watch(user_id: int, media_id: int, session: AsyncSession):
@@ -47,36 +48,23 @@ async def add_to_list_to_watch(user_id: int, media_id: int, session: AsyncSessio
 
 async def add_to_list_to_watched(user_id: int, media_id: int, session: AsyncSession):
     """
-    Adiciona um titúlo para a lista de filmes assistidos.
+    Adiciona um titúlo para a lista de filmes assistidos, num único comando: se o título já
+    estiver na lista, nada muda. Não faz commit; é chamado dentro da transação da avaliação.
 
     Args:
         user_id (int): usuário adicionando a lista
         media_id (str): id da mídia
         session (AsyncSession): sessão do banco de dados ativa
-        
-    Raises:
-        RecordNotFound: caso não exista mídia.
     """
-
-    try:
-        existing_media(media_id, session)
-
-        is_media_in_list = await existing_media_in_list(user_id, media_id, ListType.WATCHED, session)
-
-        list = await session.scalar(
-            select(UserList)
+    await session.execute(
+        dialect_insert(session)(UserListMedia)
+        .from_select(
+            ['user_list_id', 'media_id'],
+            select(UserList.id, literal(media_id))
             .where((UserList.user_id == user_id) & (UserList.name == ListType.WATCHED))
         )
-
-        media_in_list = UserListMedia(
-            user_list_id=list.id,
-            media_id=media_id
-        )
-
-        session.add(media_in_list)
-
-    except IntegrityError:
-        raise BusinessError('Título já adicionado a lista.')
+        .on_conflict_do_nothing(index_elements=['user_list_id', 'media_id'])
+    )
 
 
 async def remove_from_list_to_watch(user_id: int, media_id: int, session: AsyncSession):
@@ -158,6 +146,8 @@ async def get_all_media_from_user_list(
 ):
     """
     Busca todas as mídias (filmes/séries) em uma lista específica de um usuário.
+    O banco devolve apenas os ids da página; as linhas vêm do catálogo em memória
+    (services.media_catalog).
 
     Args:
         user_id (int): O ID do usuário.
@@ -165,7 +155,7 @@ async def get_all_media_from_user_list(
         session (AsyncSession): Sessão do banco de dados ativa.
 
     Returns:
-        List[Media]: Uma lista de objetos Media.
+        List[MediaSummary]: Os resumos das mídias da lista.
 
     Raises:
         RecordNotFoundError: Se a lista do usuário não for encontrada.
@@ -178,12 +168,11 @@ async def get_all_media_from_user_list(
         )
     )
 
-    media_list = await session.scalars(
-        select(Media)
-            .join(UserListMedia)
+    ids = await session.scalars(
+        select(UserListMedia.media_id)
             .where(UserListMedia.user_list_id == list.id)
             .limit(limit)
             .offset(offset)
     )
 
-    return media_list
+    return await media_catalog.summaries(ids, session)
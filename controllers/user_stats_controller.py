@@ -0,0 +1,50 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import dialect_insert
+from models.follows_model import Follows
+from models.user_stats_model import UserStats
+
+
+async def apply_counts(user_id: int, session: AsyncSession, **deltas: int):
+    """
+    Soma `deltas` aos totais do usuário (ex.: review_count=1, follower_count=-1) dentro da
+    transação corrente. Não faz commit: quem chama é responsável por isso.
+
+    Args:
+        user_id (int): usuário.
+        session (AsyncSession): sessão ativa do banco.
+        deltas (int): variação de cada total.
+    """
+    # upsert atômico no banco: cria a linha na primeira atividade do usuário e não perde
+    # incrementos concorrentes
+    stmt = dialect_insert(session)(UserStats).values(user_id=user_id, **deltas)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={column: getattr(UserStats, column) + getattr(stmt.excluded, column) for column in deltas},
+        )
+    )
+
+
+async def discount_follows(user_id: int, session: AsyncSession):
+    """
+    Desconta dos outros usuários as relações com `user_id`, antes de ele ser apagado (as linhas
+    de follows somem em cascata no banco). Não faz commit.
+
+    Args:
+        user_id (int): usuário que será apagado.
+        session (AsyncSession): sessão ativa do banco.
+    """
+    await session.execute(
+        update(UserStats)
+        .where(UserStats.user_id.in_(select(Follows.follower_id).where(Follows.followed_id == user_id)))
+        .values(following_count=UserStats.following_count - 1)
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(
+        update(UserStats)
+        .where(UserStats.user_id.in_(select(Follows.followed_id).where(Follows.follower_id == user_id)))
+        .values(follower_count=UserStats.follower_count - 1)
+        .execution_options(synchronize_session=False)
+    )
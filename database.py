@@ -1,10 +1,224 @@
+import itertools
+import time
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from settings import Settings, settings
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool padrão do SQLAlchemy que também mede quanto tempo cada requisição esperou por
+    uma conexão, para enxergar o pool esgotado (GET /internal/pool).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+
+def _create_engine(url: str, app_settings: Settings):
+    options = app_settings.get_engine_options(url)
+    if not url.startswith('sqlite'):
+        options['poolclass'] = InstrumentedQueuePool
+    return create_async_engine(url, **options)
+
+
+# criados por init_engines: no lifespan da aplicação (main.create_app) ou no primeiro uso
+engine = None
+read_engines = []
+_next_read_engine = itertools.cycle(read_engines)
+
+# ações guardadas em Session.info até o commit (ver on_commit)
+PENDING_ON_COMMIT = 'pending_on_commit'
+
+# cookie com o horário (epoch) da última escrita do cliente, para ler o que acabou de escrever
+LAST_WRITE_COOKIE = 'watchhive_last_write'
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+def init_engines(app_settings: Settings = settings):
+    """
+    Cria os engines do primário e das réplicas, se ainda não existirem.
+
+    Returns:
+        AsyncEngine: engine do primário.
+    """
+    global engine, read_engines, _next_read_engine  # noqa: PLW0603
+
+    if engine is None:
+        engine = _create_engine(app_settings.DATABASE_URL, app_settings)
+        read_engines = [_create_engine(url, app_settings) for url in app_settings.get_replica_urls()]
+        _next_read_engine = itertools.cycle(read_engines)
+
+    return engine
+
+
+def dialect_insert(session: AsyncSession):
+    """
+    insert() do dialeto da sessão (Postgres ou SQLite), que tem on_conflict_do_nothing() e
+    on_conflict_do_update() para INSERT ... ON CONFLICT.
+    """
+    return postgresql.insert if session.bind.dialect.name == 'postgresql' else sqlite.insert
+
+
+def on_commit(session: Session, key, action: Callable[[], None]):
+    """
+    Agenda `action` para depois do commit da sessão. Os eventos de escrita do ORM (after_insert,
+    after_update...) disparam no flush, antes do commit: quem mantém estado em memória a partir
+    deles registra a alteração aqui, para que um rollback não deixe entradas fantasmas.
+
+    Args:
+        session (Session): sessão (síncrona) da escrita, ex.: object_session(target).
+        key: identifica a alteração; uma nova ação com a mesma chave substitui a anterior.
+        action (Callable): executada sem argumentos após o commit.
+    """
+    session.info.setdefault(PENDING_ON_COMMIT, {})[key] = action
+
+
+@event.listens_for(Session, 'after_commit')
+def _run_pending_on_commit(session: Session):
+    for action in session.info.pop(PENDING_ON_COMMIT, {}).values():
+        action()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_pending_on_commit(session: Session):
+    session.info.pop(PENDING_ON_COMMIT, None)
 
-from settings import settings
 
-engine = create_async_engine(settings.DATABASE_URL)
+def pool_status() -> dict:
+    """
+    Estatísticas dos pools de conexões deste worker: o do primário e, em `replicas`, o de cada
+    réplica de leitura (na ordem de DATABASE_REPLICA_URLS).
+    """
+    return {**_pool_stats(init_engines().pool), 'replicas': [_pool_stats(replica.pool) for replica in read_engines]}
+
+
+def _pool_stats(pool) -> dict:
+    status = {'pool': type(pool).__name__, 'status': pool.status()}
+
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            wait_avg_ms=1000 * pool.wait_total / pool.checkouts if pool.checkouts else 0.0,
+            wait_max_ms=1000 * pool.wait_max,
+        )
+
+    return status
+
+
+async def dispose_engines():
+    """
+    Fecha as conexões do primário e das réplicas (desligamento do worker).
+    """
+    global engine, read_engines, _next_read_engine  # noqa: PLW0603
+
+    for current in [engine, *read_engines]:
+        if current is not None:
+            await current.dispose()
+
+    engine, read_engines = None, []
+    _next_read_engine = itertools.cycle(read_engines)
 
 
 async def get_session():  # pragma: no cover
-    async with AsyncSession(engine, expire_on_commit=False) as session:
+    async with AsyncSession(init_engines(), expire_on_commit=False) as session:
         yield session
+
+
+def choose_read_engine(request: Request):
+    """
+    Escolhe o engine das leituras: uma réplica (round-robin) ou o primário, quando não há
+    réplicas ou o cliente escreveu algo há menos de REPLICA_LAG_SECONDS (a réplica pode
+    ainda não ter recebido a escrita). O prazo vem das configurações da aplicação (app.state.settings).
+    """
+    primary = init_engines()
+    if not read_engines:
+        return primary
+
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        last_write = 0
+
+    if time.time() - last_write < request.app.state.settings.REPLICA_LAG_SECONDS:
+        return primary
+
+    return next(_next_read_engine)
+
+
+async def get_read_session(request: Request):  # pragma: no cover
+    """
+    Sessão para rotas que só leem. Não usar para escrever: pode estar ligada a uma réplica.
+    """
+    async with AsyncSession(choose_read_engine(request), expire_on_commit=False) as session:
+        yield session
+
+
+async def load_on_primary(session: AsyncSession, loader: Callable[[AsyncSession], Awaitable]):
+    """
+    Executa `loader` numa sessão do primário quando `session` está ligada a uma réplica.
+
+    Para o que vai para o cache compartilhado: a escrita apaga a chave, e uma leitura numa réplica
+    atrasada a preencheria de novo com o valor antigo, por todo o TTL, inclusive para quem escreveu.
+
+    Args:
+        session (AsyncSession): sessão da requisição (ex.: get_read_session).
+        loader (Callable): recebe a sessão a usar e carrega o valor.
+    """
+    if session.bind not in read_engines:
+        return await loader(session)
+
+    async with AsyncSession(init_engines(), expire_on_commit=False) as primary:
+        return await loader(primary)
+
+
+async def track_writes(request: Request, call_next):
+    """
+    Middleware: marca no cookie LAST_WRITE_COOKIE as escritas bem-sucedidas, para que
+    get_read_session mande as próximas leituras desse cliente para o primário.
+    """
+    response = await call_next(request)
+
+    if read_engines and request.method in WRITE_METHODS and response.status_code < HTTPStatus.BAD_REQUEST:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            str(time.time()),
+            max_age=int(request.app.state.settings.REPLICA_LAG_SECONDS) + 1,
+            httponly=True,
+            samesite='lax',
+        )
+
+    return response
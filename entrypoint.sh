@@ -1,17 +1,38 @@
 #!/bin/sh
 
-# Necessário ter o 'netcat' instalado no Dockerfile (como discutido anteriormente)
-# Espera o banco de dados 'watchhive_postgres' estar pronto
+# Uso:
+#   ./entrypoint.sh migrate  -> aplica as migrações (alembic upgrade head) e sai; rodar uma vez por deploy
+#   ./entrypoint.sh serve    -> sobe a API com vários workers (server.py); é o padrão
+#   ./entrypoint.sh neighbors -> recalcula media_neighbor (services/media_neighbors.py); com
+#                               NEIGHBORS_INTERVAL (segundos), repete o cálculo nesse intervalo
+#
+# As migrações não rodam mais em todo container que sobe: com várias réplicas, cada uma
+# tentava migrar ao mesmo tempo. Para o comportamento antigo, use RUN_MIGRATIONS=1.
 export UV_CACHE_DIR="/tmp/uv_cache"
 
 cd /app
 
-echo "Rodando migracoes Alembic."
-alembic upgrade head 
-echo "Migracoes concluídas."
-
-# 2. Inicia a aplicação (Substituindo 'poetry run uvicorn')
-# Usamos 'exec' para garantir que o script seja substituído pelo processo do servidor.
-# Adapte este comando para o SEU formato de inicialização:
-exec uvicorn main:app --host 0.0.0.0 --port 8000 --workers 1 --proxy-headers
-# Chama o binário uvicorn diretamente.
\ No newline at end of file
+case "${1:-serve}" in
+    migrate)
+        echo "Rodando migracoes Alembic."
+        alembic upgrade head
+        echo "Migracoes concluídas."
+        ;;
+    serve)
+        if [ "$RUN_MIGRATIONS" = "1" ]; then
+            alembic upgrade head
+        fi
+        # 'exec' para o servidor receber os sinais (SIGTERM) e desligar de forma graciosa.
+        exec python -m server
+        ;;
+    neighbors)
+        while true; do
+            python -m services.media_neighbors || echo "Falha ao recalcular os vizinhos."
+            [ -n "$NEIGHBORS_INTERVAL" ] || break
+            sleep "$NEIGHBORS_INTERVAL"
+        done
+        ;;
+    *)
+        exec "$@"
+        ;;
+esac
@@ -0,0 +1,80 @@
+"""
+Cache HTTP: ETag, GET condicional (If-None-Match -> 304) e Cache-Control.
+
+Quando a rota conhece uma versão barata dos dados (os ids da página e a versão do catálogo em
+memória, por exemplo), o ETag vem dela e um cliente que já tem aquela versão recebe um 304 sem
+que a resposta seja serializada. Sem versão, o ETag é o hash do JSON da resposta, que é
+serializado uma única vez e reaproveitado no corpo.
+
+Todas as rotas exigem o header Authorization, então as respostas são `private` (só o navegador
+guarda, nunca uma CDN ou proxy compartilhado) e levam `Vary: Authorization`.
+"""
+
+import hashlib
+import json
+from http import HTTPStatus
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+# dados do catálogo, iguais para todos os usuários: o navegador guarda por alguns minutos
+PRIVATE_CATALOGUE = 'private, max-age=300, stale-while-revalidate=60'
+# referência que praticamente não muda (gêneros)
+PRIVATE_REFERENCE = 'private, max-age=86400'
+# contém dados do usuário logado: só o navegador guarda, e sempre revalida com o ETag
+PRIVATE_REVALIDATE = 'private, no-cache'
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def version_etag(version: Any) -> str:
+    """
+    ETag a partir de uma versão dos dados (valores serializáveis em JSON), sem tocar na resposta.
+    """
+    return make_etag(json.dumps(version, default=str).encode())
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Compara o header If-None-Match (lista de ETags, '*' ou ausente) com o ETag atual,
+    com a comparação fraca que o GET condicional usa (W/"x" equivale a "x").
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return any(candidate.strip().removeprefix('W/') == etag for candidate in if_none_match.split(','))
+
+
+def conditional_response(
+    request: Request, schema: type[BaseModel], data: Any, cache_control: str, version: Any = None
+) -> Response:
+    """
+    Responde 304 quando o cliente já tem a mesma versão; senão serializa `data` com `schema`.
+
+    Args:
+        request (Request): requisição, de onde vem o If-None-Match.
+        schema (type[BaseModel]): schema da resposta (o mesmo do response_model da rota).
+        data (Any): dados a serializar (objetos do ORM ou dicionários).
+        cache_control (str): valor do header Cache-Control.
+        version (Any): versão dos dados, que precisa mudar sempre que a resposta mudar. Sem ela,
+            o ETag é o hash da resposta serializada.
+    """
+    body = None
+    if version is None:
+        body = schema.model_validate(data, from_attributes=True).model_dump_json().encode()
+        etag = make_etag(body)
+    else:
+        etag = version_etag(version)
+    headers = {'ETag': etag, 'Cache-Control': cache_control, 'Vary': 'Authorization'}
+
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    if body is None:
+        body = schema.model_validate(data, from_attributes=True).model_dump_json().encode()
+
+    return Response(content=body, media_type='application/json', headers=headers)
@@ -1,50 +1,113 @@
+import logging
+from contextlib import asynccontextmanager
 
-
-import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+import models.registry  # noqa: F401 (todos os modelos mapeados antes da primeira consulta)
+from database import dispose_engines, init_engines, track_writes
+from response_compression import CompressionMiddleware
 from routers.auth_routes import auth_router
 from routers.follows_routes import follows_router
 from routers.forum_group_routes import forum_group_router
 from routers.forum_message_routes import forum_message_router
 from routers.forum_participant_routes import forum_participant_router
+from routers.internal_routes import internal_router
 from routers.media_comment_routes import media_comment_router
 from routers.media_routes import media_router
 from routers.review_routes import review_router
 from routers.user_list_routes import user_list_router
 from routers.user_routes import user_router
-from settings import settings
-
-app = FastAPI(
-    title='WatchHive'
-)
-
-app.include_router(user_router)
-app.include_router(auth_router)
-app.include_router(media_router)
-app.include_router(media_comment_router)
-app.include_router(forum_group_router)
-app.include_router(forum_message_router)
-app.include_router(forum_participant_router)
-app.include_router(review_router)
-app.include_router(follows_router)
-app.include_router(user_list_router)
-
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.get_allowed_origins(),
-    allow_credentials=True,
-    allow_methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'OPTIONS'],
-    allow_headers=['Authorization', 'Content-Type', 'Accept'],
-)
-
-
-@app.get('/')
+from services.cache import close_cache, init_cache
+from services.warmup import preload_indexes, start_refreshers, stop_refreshers, warm_pool
+from settings import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+
 async def read_root():
     return {'Hello': 'World'}
 
 
+def create_app(app_settings: Settings = settings) -> FastAPI:
+    """
+    Monta a aplicação: routers, middlewares e ciclo de vida.
+
+    O ciclo de vida (lifespan) cria os engines do banco e o backend do cache com `app_settings`
+    e, com STARTUP_WARMUP, aquece o pool, carrega os índices em memória e mantém as recargas em
+    segundo plano; no desligamento, para as recargas e fecha as conexões.
+
+    O tempo de subida pode ser medido com `python -m benchmarks.profile_startup` e tem
+    um limite verificado em tests/test_startup.py.
+
+    Args:
+        app_settings (Settings): configurações da aplicação.
+    """
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        engine = init_engines(app_settings)
+        init_cache(app_settings)
+        refreshers = []
+
+        if app_settings.STARTUP_WARMUP:
+            try:
+                await warm_pool(engine, app_settings.DB_POOL_SIZE)
+                await preload_indexes(engine)
+            except Exception:
+                # o worker sobe mesmo assim; os índices são carregados na primeira requisição
+                logger.exception('Falha ao aquecer o worker')
+            refreshers = start_refreshers(engine)
+
+        yield
+
+        # desligamento: o uvicorn já esperou as requisições em andamento terminarem
+        await stop_refreshers(refreshers)
+        await dispose_engines()
+        await close_cache()
+
+    app = FastAPI(
+        title='WatchHive',
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+    # lidas pelas dependências das rotas (ex.: INTERNAL_TOKEN em routers/internal_routes.py)
+    app.state.settings = app_settings
+
+    app.include_router(user_router)
+    app.include_router(auth_router)
+    app.include_router(media_router)
+    app.include_router(media_comment_router)
+    app.include_router(forum_group_router)
+    app.include_router(forum_message_router)
+    app.include_router(forum_participant_router)
+    app.include_router(review_router)
+    app.include_router(follows_router)
+    app.include_router(user_list_router)
+    app.include_router(internal_router)
+
+    app.middleware('http')(track_writes)
+
+    app.add_middleware(CompressionMiddleware, minimum_size=app_settings.COMPRESSION_MIN_SIZE)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=app_settings.get_allowed_origins(),
+        allow_credentials=True,
+        allow_methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'OPTIONS'],
+        allow_headers=['Authorization', 'Content-Type', 'Accept'],
+    )
+
+    app.get('/')(read_root)
+
+    return app
+
+
+app = create_app(settings)
+
+
 if __name__ == '__main__':
+    # o uvicorn só é necessário aqui; sob `uvicorn main:app` ou nos testes ele não é importado por este módulo
+    import uvicorn  # noqa: PLC0415
+
     uvicorn.run(app, host='0.0.0.0', port=8000)
@@ -1,14 +1,6 @@
 import asyncio
 from models.base import Base
-from models.user_model import User
-from models.follows_model import Follows
-from models.forum_participant_model import ForumParticipant
-from models.forum_group_model import ForumGroup
-from models.forum_message_model import ForumMessage
-from models.media_model import Genre, Media
-from models.media_comment_model import MediaComment
-from models.user_list_model import UserList, UserListMedia
-from models.review_model import Review
+import models.registry  # noqa: F401 (todos os modelos mapeados, para o autogenerate)
 from settings import settings 
 
 from logging.config import fileConfig
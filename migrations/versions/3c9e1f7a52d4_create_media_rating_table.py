@@ -0,0 +1,59 @@
+"""create media rating table
+
+Revision ID: 3c9e1f7a52d4
+Revises: f8ba21d65cb6
+Create Date: 2026-10-18 10:12:41.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f7a52d4'
+down_revision: Union[str, Sequence[str], None] = 'f8ba21d65cb6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('media_rating',
+    sa.Column('media_id', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Integer(), nullable=False),
+    sa.Column('score_count', sa.Integer(), nullable=False),
+    sa.Column('score_1', sa.Integer(), nullable=False),
+    sa.Column('score_2', sa.Integer(), nullable=False),
+    sa.Column('score_3', sa.Integer(), nullable=False),
+    sa.Column('score_4', sa.Integer(), nullable=False),
+    sa.Column('score_5', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['media_id'], ['media.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('media_id')
+    )
+
+    # popula o agregado com as avaliações já existentes
+    op.execute(
+        """
+        INSERT INTO media_rating (
+            media_id, score_sum, score_count, score_1, score_2, score_3, score_4, score_5
+        )
+        SELECT
+            media_id,
+            SUM(score),
+            COUNT(id),
+            SUM(CASE WHEN score = 1 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN score = 2 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN score = 3 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN score = 4 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN score = 5 THEN 1 ELSE 0 END)
+        FROM review
+        GROUP BY media_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('media_rating')
@@ -0,0 +1,44 @@
+"""add trigram indexes media titles
+
+Revision ID: 7d2b4e8a1c3f
+Revises: 3c9e1f7a52d4
+Create Date: 2026-10-18 11:02:17.530981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2b4e8a1c3f'
+down_revision: Union[str, Sequence[str], None] = '3c9e1f7a52d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm só existe no Postgres; nos outros bancos a busca usa o fallback com ILIKE
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_media_title_trgm', 'media', ['title'],
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_media_original_title_trgm', 'media', ['original_title'],
+        postgresql_using='gin', postgresql_ops={'original_title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_media_original_title_trgm', table_name='media')
+    op.drop_index('ix_media_title_trgm', table_name='media')
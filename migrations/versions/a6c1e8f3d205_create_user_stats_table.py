@@ -0,0 +1,50 @@
+"""create user stats table
+
+Revision ID: a6c1e8f3d205
+Revises: f4b9d2e6a118
+Create Date: 2026-10-18 23:12:09.684153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c1e8f3d205'
+down_revision: Union[str, Sequence[str], None] = 'f4b9d2e6a118'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('comment_count', sa.Integer(), nullable=False),
+    sa.Column('follower_count', sa.Integer(), nullable=False),
+    sa.Column('following_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # popula os totais com o que já existe
+    op.execute(
+        """
+        INSERT INTO user_stats (user_id, review_count, comment_count, follower_count, following_count)
+        SELECT
+            "user".id,
+            (SELECT COUNT(*) FROM review WHERE review.user_id = "user".id),
+            (SELECT COUNT(*) FROM media_comment WHERE media_comment.user_id = "user".id),
+            (SELECT COUNT(*) FROM follows WHERE follows.followed_id = "user".id),
+            (SELECT COUNT(*) FROM follows WHERE follows.follower_id = "user".id)
+        FROM "user"
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_stats')
@@ -0,0 +1,33 @@
+"""add genre browsing indexes
+
+Revision ID: a9f3c6d1e842
+Revises: 7d2b4e8a1c3f
+Create Date: 2026-10-18 11:47:55.108246
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9f3c6d1e842'
+down_revision: Union[str, Sequence[str], None] = '7d2b4e8a1c3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_media_genre_genre_id_media_id', 'media_genre', ['genre_id', 'media_id'])
+    op.create_index(
+        'ix_media_media_type_popularity', 'media',
+        ['media_type', sa.text('coalesce(popularity, 0.0)'), 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_media_media_type_popularity', table_name='media')
+    op.drop_index('ix_media_genre_genre_id_media_id', table_name='media_genre')
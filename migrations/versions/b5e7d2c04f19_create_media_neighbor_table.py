@@ -0,0 +1,35 @@
+"""create media neighbor table
+
+Revision ID: b5e7d2c04f19
+Revises: a9f3c6d1e842
+Create Date: 2026-10-18 15:31:08.662470
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e7d2c04f19'
+down_revision: Union[str, Sequence[str], None] = 'a9f3c6d1e842'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('media_neighbor',
+    sa.Column('media_id', sa.Integer(), nullable=False),
+    sa.Column('neighbor_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['media_id'], ['media.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['neighbor_id'], ['media.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('media_id', 'neighbor_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('media_neighbor')
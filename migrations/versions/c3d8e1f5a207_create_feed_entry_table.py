@@ -0,0 +1,55 @@
+"""create feed entry table
+
+Revision ID: c3d8e1f5a207
+Revises: b5e7d2c04f19
+Create Date: 2026-10-18 19:02:41.118304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8e1f5a207'
+down_revision: Union[str, Sequence[str], None] = 'b5e7d2c04f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('feed_entry',
+    sa.Column('follower_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.Enum('COMMENT', 'REVIEW', name='activitykind', native_enum=False, length=16), nullable=False),
+    sa.Column('activity_id', sa.Integer(), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['actor_id'], ['user.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['follower_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('follower_id', 'kind', 'activity_id')
+    )
+    op.create_index('ix_feed_entry_follower_kind_created', 'feed_entry', ['follower_id', 'kind', 'created_at'])
+    op.create_index('ix_feed_entry_actor', 'feed_entry', ['actor_id'])
+    op.create_index('ix_follows_followed_id', 'follows', ['followed_id'])
+
+    # linhas do tempo com as atividades que já existem
+    op.execute("""
+        INSERT INTO feed_entry (follower_id, kind, activity_id, actor_id, created_at)
+        SELECT follows.follower_id, 'COMMENT', media_comment.id, media_comment.user_id, media_comment.created_at
+        FROM follows JOIN media_comment ON media_comment.user_id = follows.followed_id
+    """)
+    op.execute("""
+        INSERT INTO feed_entry (follower_id, kind, activity_id, actor_id, created_at)
+        SELECT follows.follower_id, 'REVIEW', review.id, review.user_id, review.created_at
+        FROM follows JOIN review ON review.user_id = follows.followed_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_follows_followed_id', table_name='follows')
+    op.drop_index('ix_feed_entry_actor', table_name='feed_entry')
+    op.drop_index('ix_feed_entry_follower_kind_created', table_name='feed_entry')
+    op.drop_table('feed_entry')
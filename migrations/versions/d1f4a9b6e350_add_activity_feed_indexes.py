@@ -0,0 +1,45 @@
+"""add activity feed indexes
+
+Revision ID: d1f4a9b6e350
+Revises: c3d8e1f5a207
+Create Date: 2026-10-18 20:14:07.531829
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f4a9b6e350'
+down_revision: Union[str, Sequence[str], None] = 'c3d8e1f5a207'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # o feed unificado pagina por (created_at, id) dentro de cada tipo
+    op.drop_index('ix_feed_entry_follower_kind_created', table_name='feed_entry')
+    op.create_index(
+        'ix_feed_entry_follower_kind_created', 'feed_entry', ['follower_id', 'kind', 'created_at', 'activity_id']
+    )
+
+    op.create_index('ix_media_comment_user_created', 'media_comment', ['user_id', 'created_at'])
+    op.create_index('ix_review_user_created', 'review', ['user_id', 'created_at'])
+    op.create_index('ix_forum_group_user_created', 'forum_group', ['user_id', 'created_at'])
+    op.create_index('ix_user_list_user_id_name', 'user_list', ['user_id', 'name'])
+    op.create_index('ix_user_list_media_list_added', 'user_list_media', ['user_list_id', 'added_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_list_media_list_added', table_name='user_list_media')
+    op.drop_index('ix_user_list_user_id_name', table_name='user_list')
+    op.drop_index('ix_forum_group_user_created', table_name='forum_group')
+    op.drop_index('ix_review_user_created', table_name='review')
+    op.drop_index('ix_media_comment_user_created', table_name='media_comment')
+
+    op.drop_index('ix_feed_entry_follower_kind_created', table_name='feed_entry')
+    op.create_index('ix_feed_entry_follower_kind_created', 'feed_entry', ['follower_id', 'kind', 'created_at'])
@@ -0,0 +1,35 @@
+"""add foreign key indexes
+
+Revision ID: e2a7c5b8f913
+Revises: d1f4a9b6e350
+Create Date: 2026-10-18 21:05:33.842170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c5b8f913'
+down_revision: Union[str, Sequence[str], None] = 'd1f4a9b6e350'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_review_media_id', 'review', ['media_id'])
+    op.create_index('ix_media_comment_media_created', 'media_comment', ['media_id', 'created_at', 'id'])
+    op.create_index('ix_forum_message_group_created', 'forum_message', ['forum_group_id', 'created_at'])
+    # a chave primária de forum_participant começa por user_id
+    op.create_index('ix_forum_participant_forum_group_id', 'forum_participant', ['forum_group_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_forum_participant_forum_group_id', table_name='forum_participant')
+    op.drop_index('ix_forum_message_group_created', table_name='forum_message')
+    op.drop_index('ix_media_comment_media_created', table_name='media_comment')
+    op.drop_index('ix_review_media_id', table_name='review')
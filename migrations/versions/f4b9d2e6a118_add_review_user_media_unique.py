@@ -0,0 +1,71 @@
+"""add review user media unique
+
+Revision ID: f4b9d2e6a118
+Revises: e2a7c5b8f913
+Create Date: 2026-10-18 22:31:48.270615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b9d2e6a118'
+down_revision: Union[str, Sequence[str], None] = 'e2a7c5b8f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # avaliações repetidas (envios concorrentes): fica a mais recente de cada usuário e mídia
+    op.execute(
+        """
+        DELETE FROM feed_entry
+        USING review AS old, review AS newer
+        WHERE feed_entry.kind = 'REVIEW'
+          AND feed_entry.activity_id = old.id
+          AND newer.user_id = old.user_id
+          AND newer.media_id = old.media_id
+          AND newer.id > old.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM review AS old
+        USING review AS newer
+        WHERE newer.user_id = old.user_id
+          AND newer.media_id = old.media_id
+          AND newer.id > old.id
+        """
+    )
+
+    # o agregado contava as repetidas: é recalculado a partir das avaliações que ficaram
+    op.execute('DELETE FROM media_rating')
+    op.execute(
+        """
+        INSERT INTO media_rating (
+            media_id, score_sum, score_count, score_1, score_2, score_3, score_4, score_5
+        )
+        SELECT
+            media_id,
+            SUM(score),
+            COUNT(id),
+            SUM(CASE WHEN score = 1 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN score = 2 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN score = 3 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN score = 4 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN score = 5 THEN 1 ELSE 0 END)
+        FROM review
+        GROUP BY media_id
+        """
+    )
+
+    op.create_unique_constraint('uq_review_user_media', 'review', ['user_id', 'media_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_review_user_media', 'review', type_='unique')
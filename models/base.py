@@ -1,3 +1,5 @@
+from datetime import UTC, datetime
+
 from sqlalchemy import MetaData
 from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass
 
@@ -8,3 +10,15 @@ class Base(MappedAsDataclass, DeclarativeBase):
     __mapper_args__ = {"eager_defaults": True}
     # means that a backend that supports RETURNING will usually make use of RETURNING with INSERT statements
     # in order to retrieve newly generated default values
+
+
+def utc_now() -> datetime:
+    """
+    Data e hora atual em UTC, sem fuso (como nas colunas DateTime do banco).
+
+    Usada como default no Python das datas que entram em cursores de paginação: o valor gravado
+    é o mesmo que volta no cursor, com microssegundos. O server_default (CURRENT_TIMESTAMP) do
+    SQLite grava só até os segundos, e a comparação (created_at, id) < cursor deixaria de avançar
+    entre registros do mesmo segundo.
+    """
+    return datetime.now(tz=UTC).replace(tzinfo=None)
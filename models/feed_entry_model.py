@@ -0,0 +1,55 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ActivityKind(str, Enum):
+    """
+    Tipos de atividade que aparecem no feed de quem segue o autor. Só comentários e avaliações
+    são gravados nas linhas do tempo (feed_entry); os demais são lidos na hora.
+    """
+
+    COMMENT = "comment"
+    FORUM = "forum"
+    REVIEW = "review"
+    WATCHED = "watched"
+
+
+class FeedEntry(Base):
+    """
+    Linha do tempo de cada usuário: uma entrada por atividade (comentário, avaliação) de quem
+    ele segue, gravada quando a atividade é criada (services.feed.publish). O feed é lido
+    daqui, pelo índice (follower_id, kind, created_at), sem juntar follows com as tabelas
+    de atividades.
+    """
+    __tablename__ = 'feed_entry'
+
+    follower_id: Mapped[int] = mapped_column(
+        ForeignKey('user.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+
+    kind: Mapped[ActivityKind] = mapped_column(
+        SAEnum(ActivityKind, native_enum=False, length=16),
+        primary_key=True
+    )
+
+    # id da atividade na tabela do seu tipo (media_comment.id, review.id)
+    activity_id: Mapped[int] = mapped_column(primary_key=True)
+
+    actor_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
+
+    # data da atividade (e não da entrada), para ordenar o feed
+    created_at: Mapped[datetime]
+
+
+Index(
+    'ix_feed_entry_follower_kind_created',
+    FeedEntry.follower_id, FeedEntry.kind, FeedEntry.created_at, FeedEntry.activity_id
+)
+Index('ix_feed_entry_actor', FeedEntry.actor_id)
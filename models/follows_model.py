@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -22,3 +22,7 @@ class Follows(Base):
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
+
+
+# seguidores de um usuário (a chave primária começa por follower_id)
+Index('ix_follows_followed_id', Follows.followed_id)
@@ -1,12 +1,14 @@
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from models.forum_message_model import ForumMessage
-from models.forum_participant_model import ForumParticipant
+from .base import Base, utc_now
 
-from .base import Base
+if TYPE_CHECKING:
+    from models.forum_message_model import ForumMessage
+    from models.forum_participant_model import ForumParticipant
 
 
 class ForumGroup(Base):
@@ -18,7 +20,7 @@ class ForumGroup(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey('user.id'))
 
     created_at: Mapped[datetime] = mapped_column(
-        init=False, server_default=func.now()
+        init=False, insert_default=utc_now, server_default=func.now()
     )
 
     updated_at: Mapped[datetime] = mapped_column(
@@ -36,3 +38,7 @@ class ForumGroup(Base):
         cascade='all, delete-orphan',
         lazy='selectin',
     )
+
+
+# grupos criados por um usuário, dos mais recentes para os mais antigos (feed)
+Index('ix_forum_group_user_created', ForumGroup.user_id, ForumGroup.created_at)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -17,3 +17,7 @@ class ForumMessage(Base):
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
+
+
+# mensagens de um grupo, na ordem em que foram enviadas
+Index('ix_forum_message_group_created', ForumMessage.forum_group_id, ForumMessage.created_at)
@@ -1,5 +1,5 @@
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -10,3 +10,7 @@ class ForumParticipant(Base):
 
     user_id: Mapped[int] = mapped_column(ForeignKey('user.id'), primary_key=True)
     forum_group_id: Mapped[int] = mapped_column(ForeignKey('forum_group.id'), primary_key=True)
+
+
+# participantes de um grupo (a chave primária começa por user_id)
+Index('ix_forum_participant_forum_group_id', ForumParticipant.forum_group_id)
@@ -1,9 +1,9 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
-from .base import Base
+from .base import Base, utc_now
 
 
 class MediaComment(Base):
@@ -15,5 +15,11 @@ class MediaComment(Base):
     content: Mapped[str]
 
     created_at: Mapped[datetime] = mapped_column(
-        init=False, server_default=func.now()
+        init=False, insert_default=utc_now, server_default=func.now()
     )
+
+
+# atividades de um usuário, das mais recentes para as mais antigas (feed)
+Index('ix_media_comment_user_created', MediaComment.user_id, MediaComment.created_at)
+# comentários de uma mídia, na ordem da paginação por cursor
+Index('ix_media_comment_media_created', MediaComment.media_id, MediaComment.created_at, MediaComment.id)
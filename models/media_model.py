@@ -1,20 +1,23 @@
 from datetime import date
-from typing import List
+from typing import TYPE_CHECKING, List
 
-from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy import Column, ForeignKey, Index, Table, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from models.media_comment_model import MediaComment
-from models.review_model import Review
-
 from .base import Base
 
+if TYPE_CHECKING:
+    from models.media_comment_model import MediaComment
+    from models.review_model import Review
+
 # tabela de associação
 media_genre = Table(
     "media_genre",
     Base.metadata,
     Column("media_id", ForeignKey("media.id", ondelete="CASCADE"), primary_key=True),
     Column("genre_id", ForeignKey("genre.id", ondelete="CASCADE"), primary_key=True),
+    # a chave primária começa por media_id; a navegação por gênero precisa do índice inverso
+    Index("ix_media_genre_genre_id_media_id", "genre_id", "media_id"),
 )
 
 
@@ -38,7 +41,7 @@ class Media(Base):
 
     title: Mapped[str] = mapped_column(index=True)
     original_title: Mapped[str] = mapped_column(index=True, nullable=True)
-    description: Mapped[str] = mapped_column(nullable=True)
+    description: Mapped[str] = mapped_column(Text, nullable=True)
 
     dt_launch: Mapped[date] = mapped_column(nullable=True)
     original_language: Mapped[str] = mapped_column(nullable=True)
@@ -54,14 +57,22 @@ class Media(Base):
         secondary=media_genre, back_populates="medias", init=False
     )
 
+    # carregada sob demanda: a página de detalhes traz só os mais recentes (ver get_media)
     comments: Mapped[list['MediaComment']] = relationship(
         init=False,
         cascade='all, delete-orphan',
-        lazy='selectin',
+        lazy='select',
     )
 
+    # não é carregada junto com a mídia: as notas são lidas do agregado em media_rating
     reviews: Mapped[List['Review']] = relationship(
-        lazy='selectin',
+        lazy='select',
         cascade='all, delete-orphan',
         init=False,
     )
+
+
+# chave de ordenação da navegação por gênero (popularity pode ser nula)
+popularity_key = func.coalesce(Media.popularity, 0.0)
+
+Index('ix_media_media_type_popularity', Media.media_type, popularity_key, Media.id)
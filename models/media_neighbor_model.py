@@ -0,0 +1,24 @@
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class MediaNeighbor(Base):
+    """
+    Mídias mais parecidas com cada mídia ("mais como este"), calculadas em lote por
+    services.media_neighbors a partir dos gêneros e das avaliações em comum.
+    """
+    __tablename__ = 'media_neighbor'
+
+    media_id: Mapped[int] = mapped_column(
+        ForeignKey('media.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+
+    neighbor_id: Mapped[int] = mapped_column(
+        ForeignKey('media.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+
+    score: Mapped[float]
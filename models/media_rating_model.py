@@ -0,0 +1,33 @@
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class MediaRating(Base):
+    """
+    Agregado das avaliações de uma mídia (soma, quantidade e histograma das notas de 1 a 5).
+    Mantido pelo review_controller a cada avaliação criada ou alterada, evitando AVG/COUNT
+    sobre a tabela review a cada leitura.
+    """
+    __tablename__ = 'media_rating'
+
+    media_id: Mapped[int] = mapped_column(
+        ForeignKey('media.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+
+    score_sum: Mapped[int] = mapped_column(default=0)
+    score_count: Mapped[int] = mapped_column(default=0)
+
+    score_1: Mapped[int] = mapped_column(default=0)
+    score_2: Mapped[int] = mapped_column(default=0)
+    score_3: Mapped[int] = mapped_column(default=0)
+    score_4: Mapped[int] = mapped_column(default=0)
+    score_5: Mapped[int] = mapped_column(default=0)
+
+    @property
+    def average_score(self) -> float:
+        if not self.score_count:
+            return 0.0
+        return self.score_sum / self.score_count
@@ -0,0 +1,40 @@
+"""
+Registro de todos os modelos.
+
+Os modelos não se importam entre si: os relacionamentos apontam para as outras classes pelo
+nome (ex.: Mapped[list['ForumGroup']]) e o SQLAlchemy resolve esses nomes só quando configura
+os mapeamentos, na primeira consulta. Por isso, importar um modelo isolado é barato, mas
+quem vai consultar o banco (a API, scripts, o Alembic) precisa importar este módulo antes.
+"""
+
+from models.feed_entry_model import FeedEntry
+from models.follows_model import Follows
+from models.forum_group_model import ForumGroup
+from models.forum_message_model import ForumMessage
+from models.forum_participant_model import ForumParticipant
+from models.media_comment_model import MediaComment
+from models.media_model import Genre, Media
+from models.media_neighbor_model import MediaNeighbor
+from models.media_rating_model import MediaRating
+from models.review_model import Review
+from models.user_list_model import UserList, UserListMedia
+from models.user_model import User
+from models.user_stats_model import UserStats
+
+__all__ = [
+    'FeedEntry',
+    'Follows',
+    'ForumGroup',
+    'ForumMessage',
+    'ForumParticipant',
+    'Genre',
+    'Media',
+    'MediaComment',
+    'MediaNeighbor',
+    'MediaRating',
+    'Review',
+    'User',
+    'UserList',
+    'UserListMedia',
+    'UserStats',
+]
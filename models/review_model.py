@@ -1,15 +1,17 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, validates
 
 from exceptions.business_error import BusinessError
 
-from .base import Base
+from .base import Base, utc_now
 
 
 class Review(Base):
     __tablename__ = 'review'
+    # uma avaliação por usuário e mídia; é o alvo do INSERT ... ON CONFLICT de create_review
+    __table_args__ = (UniqueConstraint('user_id', 'media_id', name='uq_review_user_media'),)
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     score: Mapped[int]
@@ -17,7 +19,7 @@ class Review(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey('user.id'))
 
     created_at: Mapped[datetime] = mapped_column(
-        init=False, server_default=func.now()
+        init=False, insert_default=utc_now, server_default=func.now()
     )
 
     @validates('score')
@@ -25,3 +27,9 @@ class Review(Base):
         if score <= 0 or score > 5:
             raise BusinessError("A avaliação deve ser entre 1 e 5")
         return score
+
+
+# atividades de um usuário, das mais recentes para as mais antigas (feed)
+Index('ix_review_user_created', Review.user_id, Review.created_at)
+# avaliações de uma mídia
+Index('ix_review_media_id', Review.media_id)
@@ -1,12 +1,14 @@
 from datetime import datetime
 from enum import Enum
+from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from models.media_model import Media
+from .base import Base, utc_now
 
-from .base import Base
+if TYPE_CHECKING:
+    from models.media_model import Media
 
 
 class ListType(str, Enum):
@@ -39,8 +41,13 @@ class UserListMedia(Base):
     )
 
     added_at: Mapped[datetime] = mapped_column(
-        init=False, server_default=func.now()
+        init=False, insert_default=utc_now, server_default=func.now()
     )
 
     user_list: Mapped['UserList'] = relationship(backref="list_media", init=False)
     media: Mapped['Media'] = relationship(init=False)
+
+
+# listas de um usuário, e mídias de uma lista pela data em que foram adicionadas (feed)
+Index('ix_user_list_user_id_name', UserList.user_id, UserList.name)
+Index('ix_user_list_media_list_added', UserListMedia.user_list_id, UserListMedia.added_at)
@@ -1,12 +1,14 @@
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 from sqlalchemy import func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from models.forum_group_model import ForumGroup
-
 from .base import Base
 
+if TYPE_CHECKING:
+    from models.forum_group_model import ForumGroup
+
 
 class User(Base):
     __tablename__ = "user"
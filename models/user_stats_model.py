@@ -0,0 +1,24 @@
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class UserStats(Base):
+    """
+    Totais de um usuário (avaliações, comentários, seguidores e seguidos), mostrados no perfil.
+    Mantidos pelos controllers na mesma transação de cada escrita, evitando COUNT sobre
+    review, media_comment e follows a cada perfil aberto. Quem ainda não teve nenhuma
+    atividade não tem linha (totais zerados).
+    """
+    __tablename__ = 'user_stats'
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('user.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+
+    review_count: Mapped[int] = mapped_column(default=0)
+    comment_count: Mapped[int] = mapped_column(default=0)
+    follower_count: Mapped[int] = mapped_column(default=0)
+    following_count: Mapped[int] = mapped_column(default=0)
@@ -0,0 +1,86 @@
+"""
+Funções auxiliares para paginação por cursor (keyset).
+
+O cursor é opaco para o cliente: uma string base64 com os valores da chave de ordenação
+do último registro retornado.
+"""
+
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from exceptions.business_error import BusinessError
+
+
+def encode_cursor(*values) -> str:
+    """
+    Gera um cursor opaco a partir dos valores da chave de ordenação.
+
+    Args:
+        values: valores da chave (ex.: created_at, id). Datas são serializadas em ISO 8601.
+
+    Returns:
+        str: cursor em base64 (seguro para URL).
+    """
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Lê um cursor gerado por encode_cursor().
+
+    Args:
+        cursor (str): cursor recebido do cliente.
+        size (int): quantidade de valores esperada na chave.
+
+    Raises:
+        BusinessError: caso o cursor seja inválido.
+    """
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error):
+        raise BusinessError('Cursor inválido.')
+
+    if not isinstance(values, list) or len(values) != size:
+        raise BusinessError('Cursor inválido.')
+
+    return values
+
+
+def decode_datetime(value: str) -> datetime:
+    """
+    Converte uma data vinda do cursor.
+
+    Raises:
+        BusinessError: caso a data seja inválida.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise BusinessError('Cursor inválido.')
+
+
+def decode_id(value) -> int:
+    """
+    Confere um id vindo do cursor.
+
+    Raises:
+        BusinessError: caso o valor não seja um inteiro.
+    """
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise BusinessError('Cursor inválido.')
+    return value
+
+
+def decode_number(value) -> int | float:
+    """
+    Confere um valor numérico (ex.: popularidade) vindo do cursor.
+
+    Raises:
+        BusinessError: caso o valor não seja um número.
+    """
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise BusinessError('Cursor inválido.')
+    return value
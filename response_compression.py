@@ -0,0 +1,174 @@
+"""
+Compressão das respostas (zstd, brotli ou gzip), negociada pelo Accept-Encoding do cliente.
+
+Só são comprimidas respostas de texto/JSON a partir de `minimum_size` bytes: abaixo disso o
+ganho não paga o custo. zstd e brotli dependem dos pacotes `zstandard` e `brotli`; sem eles,
+sobra o gzip.
+"""
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'image/svg+xml')
+
+
+class GzipEncoder:
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: cabeçalho gzip
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int = 4):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int = 3):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# em ordem de preferência do servidor, quando o cliente aceita mais de uma com o mesmo peso
+ENCODERS = {
+    name: encoder
+    for name, encoder, available in (
+        ('zstd', ZstdEncoder, zstandard is not None),
+        ('br', BrotliEncoder, brotli is not None),
+        ('gzip', GzipEncoder, True),
+    )
+    if available
+}
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """
+    Escolhe a codificação a partir do Accept-Encoding ('gzip, br;q=0.8, *;q=0'): a de maior
+    peso entre as disponíveis, desempatando pela ordem de ENCODERS.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.lower().split(','):
+        name, _, params = item.strip().partition(';')
+        weight = 1.0
+        if params.strip().startswith('q='):
+            try:
+                weight = float(params.strip()[2:])
+            except ValueError:
+                continue
+        weights[name.strip()] = weight
+
+    best, best_weight = None, 0.0
+    for name in ENCODERS:
+        weight = weights.get(name, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime o corpo das respostas com a codificação escolhida por
+    choose_encoding. Respostas em streaming são comprimidas pedaço a pedaço.
+
+    Como o corpo enviado muda com a codificação, o ETag de uma resposta comprimida vira
+    fraco (W/"...") e a resposta ganha `Vary: Accept-Encoding`.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, encoder, passthrough
+
+            if message['type'] == 'http.response.start':
+                # espera o primeiro pedaço do corpo para decidir se comprime
+                start = message
+                return
+
+            if message['type'] != 'http.response.body' or passthrough:
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+            if encoder is None:
+                headers = MutableHeaders(raw=start['headers'])
+                if not self._compressible(headers) or (not more_body and len(body) < self.minimum_size):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                encoder = ENCODERS[encoding]()
+                headers['Content-Encoding'] = encoding
+                headers.add_vary_header('Accept-Encoding')
+                etag = headers.get('etag')
+                if etag and not etag.startswith('W/'):
+                    headers['ETag'] = f'W/{etag}'
+
+                if not more_body:
+                    body = encoder.compress(body) + encoder.finish()
+                    headers['Content-Length'] = str(len(body))
+                    await send(start)
+                    await send({'type': 'http.response.body', 'body': body})
+                    return
+
+                del headers['Content-Length']
+                await send(start)
+
+            body = encoder.compress(body)
+            if not more_body:
+                body += encoder.finish()
+            await send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressible(headers: MutableHeaders) -> bool:
+        if 'content-encoding' in headers:
+            return False
+        return headers.get('content-type', '').startswith(COMPRESSIBLE_TYPES)
@@ -45,7 +45,7 @@ async def login_for_access_token(
         )
 
     access_token = create_access_token(
-        data={'sub': user.email}
+        data={'sub': user.email, 'uid': user.id}
     )
 
     return {'access_token': access_token, 'token_type': 'Bearer', 'user': user}
@@ -53,6 +53,6 @@ async def login_for_access_token(
 
 @auth_router.post('/refresh_token', response_model=Token)
 async def refresh_access_token(user: CurrentUser):
-    new_access_token = create_access_token(data={'sub': user.email})
+    new_access_token = create_access_token(data={'sub': user.email, 'uid': user.id})
 
     return {'access_token': new_access_token, 'token_type': 'Bearer', 'user': user}
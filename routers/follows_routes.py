@@ -1,33 +1,53 @@
 from http import HTTPStatus
-from typing import Annotated, List
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from controllers.follows_controller import (
     follow_user,
+    get_following_feed,
     get_following_users_comments,
     get_following_users_reviews,
     unfollow_user,
 )
-from database import get_session
+from database import get_read_session, get_session
 from exceptions.business_error import BusinessError
 from exceptions.record_not_found_error import RecordNotFoundError
 from models.user_model import User
-from schemas.commons_schemas import Message
-from schemas.media_schemas import GetPublicCommentFollowerSchema, GetPublicCommentsFollowerSchema
-from schemas.review_schemas import GetPublicReviewFollowerSchema, GetPublicReviewsFollowerSchema
+from schemas.commons_schemas import FilterCursorPage, Message
+from schemas.follows_schemas import GetFeedPageSchema
+from schemas.media_schemas import GetPublicCommentsFollowerSchema
+from schemas.review_schemas import GetPublicReviewsFollowerSchema
 from security import get_current_user
 
 follows_router = APIRouter(prefix="/relationship", tags=['users'])
 Session = Annotated[AsyncSession, Depends(get_session)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+@follows_router.get('/feed', response_model=GetFeedPageSchema)
+async def get_feed(
+    current_user: CurrentUser,
+    session: ReadSession,
+    filter_page: Annotated[FilterCursorPage, Query()],
+):
+    try:
+        return await get_following_feed(
+            current_user_id=current_user.id,
+            limit=filter_page.limit,
+            cursor=filter_page.cursor,
+            session=session,
+        )
+    except BusinessError as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+
+
 @follows_router.get('/comments', response_model=GetPublicCommentsFollowerSchema)
 async def get_following_latest_comments(
     current_user: CurrentUser,
-    session: Session,
+    session: ReadSession,
 ):
     try:
         comments = await get_following_users_comments(
@@ -43,7 +63,7 @@ async def get_following_latest_comments(
 @follows_router.get('/reviews', response_model=GetPublicReviewsFollowerSchema)
 async def get_following_latest_reviews(
     current_user: CurrentUser,
-    session: Session,
+    session: ReadSession,
 ):
     try:
         reviews = await get_following_users_reviews(
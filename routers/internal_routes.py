@@ -0,0 +1,32 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+
+from database import pool_status
+from schemas.internal_schemas import PoolStatusSchema
+
+
+def verify_internal_token(request: Request, x_internal_token: Annotated[str | None, Header()] = None):
+    """
+    As rotas internas só respondem com INTERNAL_TOKEN (das configurações passadas a create_app)
+    configurado e enviado no header X-Internal-Token.
+    """
+    internal_token = request.app.state.settings.INTERNAL_TOKEN
+    if not internal_token:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='Not Found')
+    if x_internal_token != internal_token:
+        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail='Token interno inválido.')
+
+
+internal_router = APIRouter(
+    prefix='/internal',
+    tags=['internal'],
+    include_in_schema=False,
+    dependencies=[Depends(verify_internal_token)],
+)
+
+
+@internal_router.get('/pool', response_model=PoolStatusSchema)
+async def read_pool_status():
+    return pool_status()
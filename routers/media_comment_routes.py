@@ -1,16 +1,17 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from controllers.media_comment_controller import create_media_comment, delete_media_comment
+from controllers.media_comment_controller import create_media_comment, delete_media_comment, get_media_comments
 from database import get_session
+from exceptions.business_error import BusinessError
 from exceptions.permission_error import PermissionError
 from exceptions.record_not_found_error import RecordNotFoundError
 from models.user_model import User
-from schemas.commons_schemas import Message
-from schemas.media_schemas import CreateMediaCommentSchema, GetMediaCommentSchema
+from schemas.commons_schemas import FilterCursorPage, Message
+from schemas.media_schemas import CreateMediaCommentSchema, GetMediaCommentSchema, GetMediaCommentsPageSchema
 from security import get_current_user
 
 media_comment_router = APIRouter(prefix='/medias', tags=['media', 'media_comment'])
@@ -32,6 +33,26 @@ async def create(id_media: int, comment: CreateMediaCommentSchema, current_user:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=str(u))
 
 
+@media_comment_router.get('/{id_media}/comments', response_model=GetMediaCommentsPageSchema)
+async def read_all(
+    id_media: int,
+    current_user: CurrentUser,
+    session: Session,
+    filter_page: Annotated[FilterCursorPage, Query()],
+):
+    try:
+        return await get_media_comments(
+            media_id=id_media,
+            limit=filter_page.limit,
+            cursor=filter_page.cursor,
+            session=session,
+        )
+    except RecordNotFoundError as u:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=str(u))
+    except BusinessError as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+
+
 @media_comment_router.delete('/{id_media}/comment/{id_comment}', response_model=Message)
 async def delete(id_media: int, id_comment: int, current_user: CurrentUser, session: Session):
     try:
@@ -2,32 +2,45 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from controllers.media_controller import (
+    best_rated_version,
+    genres_version,
     get_best_rated_medias,
+    get_genres,
     get_media,
     get_random_medias,
     get_recommended_medias,
+    get_similar_medias,
+    listing_version,
     search_medias_by_title,
     show_medias_by_genre_page,
+    suggest_medias_by_title,
 )
-from database import get_session
+from database import get_read_session, get_session
+from exceptions.business_error import BusinessError
 from exceptions.record_not_found_error import RecordNotFoundError
+from http_cache import PRIVATE_CATALOGUE, PRIVATE_REFERENCE, PRIVATE_REVALIDATE, conditional_response
 from models.user_model import User
 from schemas.media_schemas import (
+    FilterBestRated,
     FilterMedia,
     FilterMediaSearch,
     FilterMediaShow,
+    FilterMediaSuggest,
+    GetGenresSchema,
     GetMediaSchema,
     ShowMediasInListSchema,
     ShowMediasInListSchema2,
+    ShowMediasPageSchema,
 )
 from security import get_current_user
 
 media_router = APIRouter(prefix='/medias', tags=['media', 'media_comment'])
 Session = Annotated[AsyncSession, Depends(get_session)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
@@ -64,8 +77,9 @@ async def search_media(
 
 @media_router.get('/search', response_model=ShowMediasInListSchema)
 async def search_media(
+    request: Request,
     current_user: CurrentUser,
-    session: Session,
+    session: ReadSession,
     filter_page: Annotated[FilterMediaSearch, Query()],
 ):
 
@@ -76,52 +90,114 @@ async def search_media(
         limit=filter_page.limit,
     )
 
-    return {'medias': medias}
+    return conditional_response(
+        request, ShowMediasInListSchema, {'medias': medias}, PRIVATE_CATALOGUE, listing_version(medias)
+    )
 
 
-@media_router.get('/show', response_model=ShowMediasInListSchema)
-async def get_medias_by_genre(
+@media_router.get('/suggest', response_model=ShowMediasInListSchema)
+async def suggest_media(
     current_user: CurrentUser,
     session: Session,
-    filter_page: Annotated[FilterMediaShow, Query()],
+    filter_suggest: Annotated[FilterMediaSuggest, Query()],
 ):
 
-    medias = await show_medias_by_genre_page(
-        genre_id=filter_page.genre_id,
-        movie=filter_page.movie,
-        limit=filter_page.limit,
-        offset=filter_page.offset,
+    medias = await suggest_medias_by_title(
+        search_term=filter_suggest.term,
+        limit=filter_suggest.limit,
         session=session,
     )
 
     return {'medias': medias}
 
 
+@media_router.get('/show', response_model=ShowMediasPageSchema)
+async def get_medias_by_genre(
+    request: Request,
+    current_user: CurrentUser,
+    session: ReadSession,
+    filter_page: Annotated[FilterMediaShow, Query()],
+):
+    try:
+        page = await show_medias_by_genre_page(filter_page, session)
+    except BusinessError as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+
+    version = listing_version(page['medias'], page['next_cursor'])
+    return conditional_response(request, ShowMediasPageSchema, page, PRIVATE_CATALOGUE, version)
+
+
 @media_router.get('/best-rated', response_model=ShowMediasInListSchema)
 async def get_best_rated(
+    request: Request,
     current_user: CurrentUser,
-    session: Session,
+    session: ReadSession,
+    filter_best: Annotated[FilterBestRated, Query()],
 ):
 
     medias = await get_best_rated_medias(
-        limit=10,
+        limit=filter_best.limit,
+        movie=filter_best.movie,
+        genre_id=filter_best.genre_id,
         session=session,
     )
 
-    return {'medias': medias}
+    return conditional_response(
+        request, ShowMediasInListSchema, {'medias': medias}, PRIVATE_CATALOGUE, best_rated_version()
+    )
+
+
+@media_router.get('/genres', response_model=GetGenresSchema)
+async def list_genres(
+    request: Request,
+    current_user: CurrentUser,
+    session: ReadSession,
+):
+
+    genres = await get_genres(session=session)
+
+    return conditional_response(
+        request, GetGenresSchema, {'genres': genres}, PRIVATE_REFERENCE, genres_version()
+    )
 
 
 @media_router.get('/{media_id}', response_model=GetMediaSchema)
 async def read_media(
+    request: Request,
     media_id: int,
     current_user: CurrentUser,
     session: Session,
 ):
     try:
-        return await get_media(
+        media = await get_media(
             media_id=media_id,
             current_user_id=current_user.id,
             session=session,
         )
     except RecordNotFoundError as u:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=str(u))
+
+    # traz a nota e a lista do usuário logado: o ETag evita reenviar, mas só o navegador guarda
+    return conditional_response(request, GetMediaSchema, media, PRIVATE_REVALIDATE)
+
+
+@media_router.get('/{media_id}/similar', response_model=ShowMediasInListSchema)
+async def read_similar_medias(
+    request: Request,
+    media_id: int,
+    current_user: CurrentUser,
+    session: Session,
+    limit: Annotated[int, Query(ge=1, le=20)] = 10,
+):
+    try:
+        medias = await get_similar_medias(
+            media_id=media_id,
+            limit=limit,
+            session=session,
+        )
+    except RecordNotFoundError as u:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=str(u))
+
+    return conditional_response(
+        request, ShowMediasInListSchema, {'medias': medias}, PRIVATE_CATALOGUE, listing_version(medias)
+    )
@@ -14,7 +14,7 @@ from controllers.user_controller import (
     search_users_by_term,
     update_user,
 )
-from database import get_session
+from database import get_read_session, get_session
 from exceptions.business_error import BusinessError
 from exceptions.permission_error import PermissionError
 from exceptions.record_not_found_error import RecordNotFoundError
@@ -31,6 +31,7 @@ from security import get_current_user
 
 user_router = APIRouter(prefix="/users", tags=['users'])
 Session = Annotated[AsyncSession, Depends(get_session)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
@@ -152,7 +153,7 @@ async def patch(
 async def read_user(
     target_user_id: int,
     current_user: CurrentUser,
-    session: Session,
+    session: ReadSession,
 ):
     try:
         profile = await get_public_user_profile(
@@ -12,3 +12,8 @@ class FilterPage(BaseModel):
 
 class FilterName(FilterPage):
     name: str
+
+
+class FilterCursorPage(BaseModel):
+    cursor: str | None = Field(None, description="Cursor retornado pela página anterior")
+    limit: int = Field(20, ge=1, le=100)
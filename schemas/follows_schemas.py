@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from models.feed_entry_model import ActivityKind
+
+
+class GetFeedActivitySchema(BaseModel):
+    kind: ActivityKind
+    id: int = Field(description="Id da atividade no seu tipo (em 'watched', o id da mídia)")
+    user_id: int
+    created_at: datetime
+    media_id: int | None = None
+    media_title: str | None = None
+    media_poster_url: str | None = None
+    content: str | None = None
+    score: int | None = None
+    title: str | None = None
+
+
+class GetFeedPageSchema(BaseModel):
+    activities: list[GetFeedActivitySchema]
+    next_cursor: str | None
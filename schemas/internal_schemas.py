@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class PoolStatsSchema(BaseModel):
+    pool: str
+    status: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+    max_overflow: int | None = None
+    timeout: float | None = None
+    checkouts: int | None = None
+    timeouts: int | None = None
+    wait_avg_ms: float | None = None
+    wait_max_ms: float | None = None
+
+
+class PoolStatusSchema(PoolStatsSchema):
+    replicas: list[PoolStatsSchema] = []
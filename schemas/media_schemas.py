@@ -8,6 +8,7 @@ from schemas.commons_schemas import FilterPage
 # genre
 class GetGenre(BaseModel):
     id: int
+    name: str
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -25,6 +26,11 @@ class GetMediaCommentSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class GetMediaCommentsPageSchema(BaseModel):
+    comments: list[GetMediaCommentSchema]
+    next_cursor: str | None
+
+
 class GetPublicCommentFollowerSchema(BaseModel):
     content: str
     media_title: str
@@ -57,8 +63,11 @@ class GetMediaSchema(BaseModel):
 
     genres: list[GetGenre]
 
+    # apenas os comentários mais recentes; os demais via GET /medias/{id}/comments
     comments: list[GetMediaCommentSchema]
 
+    comments_count: int
+
     average_score: float
 
     vote_count: int
@@ -84,13 +93,29 @@ class FilterMediaSearch(FilterPage):
     term: str = Field()
 
 
+class FilterMediaSuggest(BaseModel):
+    term: str = Field(min_length=1)
+    limit: int = Field(10, ge=1, le=20)
+
+
+class FilterBestRated(BaseModel):
+    limit: int = Field(10, ge=1, le=50)
+    genre_id: int | None = Field(None, description="ID do gênero; todos quando vazio")
+    movie: bool | None = Field(None, description="True para filme, False para série; ambos quando vazio")
+
+
 class FilterMediaShow(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(50, ge=1)
+    cursor: str | None = Field(None, description="Cursor retornado pela página anterior (ignora o offset)")
     genre_id: int = Field(description="ID do gênero a ser buscado")
     movie: bool = Field(description="True para filme, False para série")
 
 
+class GetGenresSchema(BaseModel):
+    genres: list[GetGenre]
+
+
 class ShowMediaInListSchema(BaseModel):
     id: int
     title: str
@@ -103,6 +128,10 @@ class ShowMediasInListSchema(BaseModel):
     medias: list[ShowMediaInListSchema]
 
 
+class ShowMediasPageSchema(ShowMediasInListSchema):
+    next_cursor: str | None = None
+
+
 class ShowMediaInListSchema2(ShowMediaInListSchema):
     average_score: float
 
@@ -47,4 +47,6 @@ class GetPublicUserSchema(BaseModel):
     following: bool
     total_reviews: int
     total_comments: int
+    total_followers: int
+    total_following: int
     latest_comments: list[GetPublicCommentFollowerSchema]
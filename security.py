@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_session
 from models.user_model import User
+from services.identity_cache import identity_cache
 from settings import settings
 
 pwd_context = PasswordHash.recommended()
@@ -23,7 +24,7 @@ def create_access_token(data: dict):
 
     Args:
         data (dict): Dados a serem incluídos no payload do token e que ser'ao assinados.
-            (ex.: {"sub": email_do_usuario}).
+            (ex.: {"sub": email_do_usuario, "uid": id_do_usuario}).
 
     Returns:
         str: Token JWT assinado.
@@ -72,6 +73,10 @@ async def get_current_user(
     """
     Recupera o usuário autenticado a partir do token JWT.
 
+    O usuário fica em cache (services.identity_cache) por subject do token. Tokens com o
+    claim 'uid' são buscados pela chave primária; o e-mail do 'sub' ainda precisa bater,
+    para que um token emitido antes de uma troca de e-mail continue inválido.
+
     Args:
         request (Request): Objeto da requisição HTTP (Adicionado para a correção do CORS)
         session (Session): Sessão do banco de dados.
@@ -91,6 +96,7 @@ async def get_current_user(
     try:
         payload = decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         subject_email = payload.get('sub')
+        subject_id = payload.get('uid')
 
         if not subject_email:
             raise credentials_exception
@@ -100,11 +106,24 @@ async def get_current_user(
     except ExpiredSignatureError:
         raise credentials_exception
 
-    user = await session.scalar(
-        select(User).where(User.email == subject_email)
-    )
+    cache_key = f'uid:{subject_id}' if subject_id is not None else f'sub:{subject_email}'
+
+    user = await identity_cache.get(cache_key, session)
 
     if not user:
+        if subject_id is not None:
+            user = await session.get(User, subject_id)
+        else:
+            user = await session.scalar(
+                select(User).where(User.email == subject_email)
+            )
+
+        if not user:
+            raise credentials_exception
+
+        identity_cache.put(cache_key, user)
+
+    if user.email != subject_email:
         raise credentials_exception
 
     return user
@@ -0,0 +1,64 @@
+"""
+Servidor de produção: vários workers do uvicorn no mesmo container, um por CPU disponível.
+
+As migrações não rodam aqui; são um passo separado, executado uma vez por deploy:
+    ./entrypoint.sh migrate   (alembic upgrade head)
+    ./entrypoint.sh serve     (python -m server)
+"""
+
+import importlib
+import importlib.util
+import os
+
+import uvicorn
+
+from settings import settings
+
+CGROUP_CPU_MAX = '/sys/fs/cgroup/cpu.max'
+
+
+def available_cpus(cpu_max_path: str = CGROUP_CPU_MAX) -> int:
+    """
+    CPUs que o processo pode usar: as da afinidade, limitadas pela cota do cgroup
+    (ex.: `cpus: 2` no docker), que o os.cpu_count() não enxerga.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS/Windows
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open(cpu_max_path, encoding='utf-8') as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+
+    return cpus
+
+
+def worker_count() -> int:
+    return settings.WEB_WORKERS or available_cpus()
+
+
+def run():
+    # importa o app antes de subir os workers: erro de configuração aparece uma vez, aqui,
+    # e não em cada worker reiniciando em loop
+    importlib.import_module('main')
+
+    uvicorn.run(
+        'main:app',
+        host=settings.WEB_HOST,
+        port=settings.WEB_PORT,
+        workers=worker_count(),
+        loop='uvloop' if importlib.util.find_spec('uvloop') else 'asyncio',
+        http='httptools' if importlib.util.find_spec('httptools') else 'h11',
+        proxy_headers=True,
+        timeout_keep_alive=settings.WEB_KEEP_ALIVE,
+        timeout_graceful_shutdown=settings.WEB_GRACEFUL_TIMEOUT,
+    )
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,391 @@
+"""
+Cache compartilhado entre os workers, com backend configurável (CACHE_BACKEND).
+
+Com vários workers do uvicorn, um cache por processo duplica a memória e só é invalidado no
+worker que recebeu a escrita. Os controllers usam o `cache` deste módulo e o armazenamento
+fica no backend:
+
+- MemoryBackend: LRU em memória, por worker (padrão; desenvolvimento e testes);
+- SharedMemoryBackend: tabela de tamanho fixo num arquivo mapeado em memória (mmap), em
+  /dev/shm, compartilhada pelos workers da mesma máquina;
+- RedisBackend: qualquer servidor que fale o protocolo do Redis, compartilhado entre máquinas.
+
+Os valores são guardados como JSON. Cache.get_or_load faz com que várias requisições
+simultâneas por uma chave fria resultem numa única consulta ao banco.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable
+
+from fastapi.encoders import jsonable_encoder
+
+from settings import Settings, settings
+
+# tempo máximo que uma requisição espera outro worker carregar a mesma chave
+LOAD_LOCK_TTL = 5.0
+LOAD_POLL_INTERVAL = 0.05
+# intervalo entre tentativas de lock de um slot do SharedMemoryBackend ocupado por outro worker
+SHM_LOCK_RETRY_INTERVAL = 0.001
+
+
+class CacheBackend:
+    """
+    Interface dos backends: guardam bytes por chave, com expiração em segundos.
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """
+        Grava o valor somente se a chave não existir. Retorna se gravou.
+        """
+        raise NotImplementedError
+
+    async def delete(self, *keys: str):
+        raise NotImplementedError
+
+    async def clear(self):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """
+    LRU em memória, do próprio worker, limitado a `max_entries` chaves.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self):
+        self._entries.clear()
+
+
+class SharedMemoryBackend(CacheBackend):
+    """
+    Tabela hash de tamanho fixo num arquivo mapeado em memória, compartilhada pelos
+    processos que abrem o mesmo `path`.
+
+    Cada chave ocupa o slot hash(chave) % slots; uma colisão substitui o valor anterior, como
+    uma expulsão do cache. Valores maiores que o slot não são guardados. Cada slot é
+    protegido por um lock de arquivo (fcntl) sobre o seu trecho, que vale entre processos.
+
+    O lock é pedido sem bloquear (LOCK_NB): com o slot ocupado por outro worker, a corrotina
+    cede o event loop e tenta de novo. Com o lock, só há cópias de até `slot_size` bytes.
+
+    O nome do arquivo leva o formato da tabela (`path`-SLOTSxSLOT_SIZE): workers com outra
+    configuração (ex.: durante um deploy) usam outro arquivo. Um arquivo existente nunca é
+    redimensionado, já que encolher um arquivo mapeado por outro processo o derruba (SIGBUS).
+    """
+
+    # hash da chave (0 = slot vazio), expira em (time.time()), tamanho do valor
+    HEADER = struct.Struct('<QdI')
+
+    def __init__(self, path: str, slots: int = 8192, slot_size: int = 8192):
+        """
+        Raises:
+            RuntimeError: caso o arquivo já exista com outro tamanho (não é uma tabela deste formato).
+        """
+        self.path = f'{path}-{slots}x{slot_size}'
+        self.slots = slots
+        self.slot_size = slot_size
+        self.max_value_size = slot_size - self.HEADER.size
+
+        size = slots * slot_size
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        # o primeiro worker cria o arquivo; os demais reaproveitam o que já está nele
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            current_size = os.fstat(self._fd).st_size
+            if current_size == 0:
+                os.ftruncate(self._fd, size)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+        if current_size not in {0, size}:
+            os.close(self._fd)
+            raise RuntimeError(f'{self.path} tem {current_size} bytes, e não os {size} esperados.')
+
+        self._map = mmap.mmap(self._fd, size)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+
+    async def _lock(self, operation: int, length: int = 0, start: int = 0):
+        while True:
+            try:
+                fcntl.lockf(self._fd, operation | fcntl.LOCK_NB, length, start)
+                return
+            except (BlockingIOError, PermissionError):
+                # trecho travado por outro processo (EAGAIN ou EACCES, conforme o sistema)
+                await asyncio.sleep(SHM_LOCK_RETRY_INTERVAL)
+
+    @asynccontextmanager
+    async def _locked(self, key_hash: int, exclusive: bool):
+        offset = (key_hash % self.slots) * self.slot_size
+        await self._lock(fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH, self.slot_size, offset)
+        try:
+            yield offset
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self.slot_size, offset)
+
+    def _read(self, offset: int, key_hash: int) -> bytes | None:
+        stored_hash, expires_at, size = self.HEADER.unpack_from(self._map, offset)
+        if stored_hash != key_hash or expires_at <= time.time():
+            return None
+
+        start = offset + self.HEADER.size
+        return self._map[start:start + size]
+
+    def _write(self, offset: int, key_hash: int, value: bytes, ttl: float):
+        start = offset + self.HEADER.size
+        self._map[start:start + len(value)] = value
+        self.HEADER.pack_into(self._map, offset, key_hash, time.time() + ttl, len(value))
+
+    async def get(self, key: str) -> bytes | None:
+        key_hash = self._hash(key)
+        async with self._locked(key_hash, exclusive=False) as offset:
+            return self._read(offset, key_hash)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        if len(value) > self.max_value_size:
+            # não cabe no slot: também não deixa para trás um valor antigo da chave
+            await self.delete(key)
+            return
+
+        key_hash = self._hash(key)
+        async with self._locked(key_hash, exclusive=True) as offset:
+            self._write(offset, key_hash, value, ttl)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        if len(value) > self.max_value_size:
+            return True
+
+        key_hash = self._hash(key)
+        async with self._locked(key_hash, exclusive=True) as offset:
+            if self._read(offset, key_hash) is not None:
+                return False
+            self._write(offset, key_hash, value, ttl)
+            return True
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            key_hash = self._hash(key)
+            async with self._locked(key_hash, exclusive=True) as offset:
+                if self.HEADER.unpack_from(self._map, offset)[0] == key_hash:
+                    self.HEADER.pack_into(self._map, offset, 0, 0, 0)
+
+    async def clear(self):
+        await self._lock(fcntl.LOCK_EX)
+        try:
+            for offset in range(0, self.slots * self.slot_size, self.slot_size):
+                self.HEADER.pack_into(self._map, offset, 0, 0, 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    async def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend sobre um servidor que fale o protocolo do Redis (Redis, Valkey, KeyDB...).
+    As chaves recebem o prefixo `prefix`, e clear() só apaga as chaves com esse prefixo.
+    """
+
+    def __init__(self, url: str, prefix: str = 'watchhive:'):
+        # só é necessário com CACHE_BACKEND=redis
+        import redis.asyncio as redis  # noqa: PLC0415
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self._client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(await self._client.set(self.prefix + key, value, px=int(ttl * 1000), nx=True))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._client.delete(*(self.prefix + key for key in keys))
+
+    async def clear(self):
+        keys = [key async for key in self._client.scan_iter(match=f'{self.prefix}*')]
+        if keys:
+            await self._client.delete(*keys)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class Cache:
+    """
+    Cache de valores JSON sobre um CacheBackend.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._loading: dict[str, asyncio.Future] = {}
+
+    def use(self, backend: CacheBackend):
+        self.backend = backend
+        self._loading = {}
+
+    async def get(self, key: str) -> Any | None:
+        value = await self.backend.get(key)
+        return None if value is None else json.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self.backend.set(key, json.dumps(jsonable_encoder(value)).encode(), ttl)
+
+    async def delete(self, *keys: str):
+        await self.backend.delete(*keys)
+
+    async def clear(self):
+        await self.backend.clear()
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        """
+        Retorna o valor da chave; numa falta, executa `loader` e guarda o resultado por `ttl`
+        segundos. O valor retornado é sempre o JSON decodificado (datas viram texto ISO).
+
+        Requisições simultâneas pela mesma chave no mesmo worker esperam a mesma carga. Entre
+        workers, quem consegue o lock `<chave>:loading` no backend carrega e os demais esperam
+        o valor aparecer (até LOAD_LOCK_TTL; depois disso carregam por conta própria).
+        Erros do `loader` não são guardados.
+
+        Args:
+            key (str): chave do cache.
+            loader (Callable[[], Awaitable[Any]]): carrega o valor do banco.
+            ttl (float): validade do valor, em segundos.
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # a requisição que carregava foi cancelada; tenta de novo
+                return await self.get_or_load(key, loader, ttl)
+
+        pending = asyncio.get_running_loop().create_future()
+        self._loading[key] = pending
+        try:
+            value = await self._load(key, loader, ttl)
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as error:
+            pending.set_exception(error)
+            pending.exception()  # evita o aviso de exceção não lida quando ninguém esperava
+            raise
+        finally:
+            del self._loading[key]
+
+        pending.set_result(value)
+        return value
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        lock = f'{key}:loading'
+        locked = await self.backend.add(lock, b'1', LOAD_LOCK_TTL)
+
+        if not locked:
+            # outro worker está carregando a chave
+            deadline = time.monotonic() + LOAD_LOCK_TTL
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LOAD_POLL_INTERVAL)
+                cached = await self.get(key)
+                if cached is not None:
+                    return cached
+
+        try:
+            value = jsonable_encoder(await loader())
+            await self.backend.set(key, json.dumps(value).encode(), ttl)
+        finally:
+            if locked:
+                await self.backend.delete(lock)
+
+        return value
+
+
+def create_backend(app_settings: Settings) -> CacheBackend:
+    if app_settings.CACHE_BACKEND == 'redis':
+        return RedisBackend(app_settings.CACHE_URL or 'redis://localhost:6379/0')
+    if app_settings.CACHE_BACKEND == 'shm':
+        return SharedMemoryBackend(
+            app_settings.CACHE_SHM_PATH,
+            slots=app_settings.CACHE_SHM_SLOTS,
+            slot_size=app_settings.CACHE_SHM_SLOT_SIZE,
+        )
+    return MemoryBackend(app_settings.CACHE_MAX_ENTRIES)
+
+
+cache = Cache(MemoryBackend(settings.CACHE_MAX_ENTRIES))
+
+
+def init_cache(app_settings: Settings = settings):
+    """
+    Troca o backend do `cache` pelo configurado em `app_settings`. Chamado na subida do worker.
+    """
+    cache.use(create_backend(app_settings))
+
+
+async def close_cache():
+    await cache.backend.close()
+    cache.use(MemoryBackend(settings.CACHE_MAX_ENTRIES))
@@ -0,0 +1,184 @@
+"""
+Feed de atividades de quem o usuário segue, com fan-out na escrita.
+
+Quando alguém comenta ou avalia, publish() grava uma entrada (feed_entry) na linha do tempo de
+cada seguidor, com um único INSERT ... SELECT sobre follows. Ler o feed vira uma busca limitada
+no índice da linha do tempo do leitor, em vez de juntar follows com todas as atividades e
+ordenar; o custo não cresce mais com o quanto as pessoas seguidas são ativas.
+
+Contas com mais de FANOUT_LIMIT seguidores não fazem fan-out (seria uma escrita por seguidor a
+cada atividade): as atividades delas são buscadas na leitura (pull) e misturadas à linha do
+tempo. Os ids dessas contas ficam em memória (PullAccounts).
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import and_, delete, desc, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.feed_entry_model import ActivityKind, FeedEntry
+from models.follows_model import Follows
+from models.media_comment_model import MediaComment
+from models.review_model import Review
+
+FANOUT_LIMIT = 5_000
+# atividades recentes de cada tipo copiadas para a linha do tempo ao começar a seguir alguém
+BACKFILL_SIZE = 50
+
+ACTIVITY_MODELS = {
+    ActivityKind.COMMENT: MediaComment,
+    ActivityKind.REVIEW: Review,
+}
+
+FEED_COLUMNS = ['follower_id', 'kind', 'activity_id', 'actor_id', 'created_at']
+
+
+class PullAccounts:
+    """
+    Ids dos usuários com mais de FANOUT_LIMIT seguidores, cujas atividades são buscadas na
+    leitura. Carregado na primeira utilização e recarregado após `ttl` segundos.
+    """
+
+    def __init__(self, ttl: float = 600):
+        self.ttl = ttl
+        self.ids: frozenset[int] = frozenset()
+        self._loaded_at: float | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def load(self, session: AsyncSession):
+        result = await session.scalars(
+            select(Follows.followed_id)
+            .group_by(Follows.followed_id)
+            .having(func.count() > FANOUT_LIMIT)
+        )
+        self.ids = frozenset(result)
+        self._loaded_at = time.monotonic()
+
+    async def ensure_loaded(self, session: AsyncSession):
+        if self.is_stale:
+            await self.load(session)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self.ids
+
+
+pull_accounts = PullAccounts()
+
+
+async def publish(session: AsyncSession, kind: ActivityKind, activity_id: int, actor_id: int):
+    """
+    Grava a atividade na linha do tempo de cada seguidor do autor. A atividade já precisa ter
+    sido enviada ao banco (flush); o commit fica com quem chamou, na mesma transação.
+
+    Args:
+        session (AsyncSession): sessão ativa do banco.
+        kind (ActivityKind): tipo da atividade.
+        activity_id (int): id da atividade na tabela do seu tipo.
+        actor_id (int): autor da atividade.
+    """
+    await pull_accounts.ensure_loaded(session)
+    if actor_id in pull_accounts:
+        return
+
+    activity = ACTIVITY_MODELS[kind]
+    await session.execute(
+        insert(FeedEntry).from_select(
+            FEED_COLUMNS,
+            select(
+                Follows.follower_id,
+                literal(kind, FeedEntry.kind.type),
+                activity.id,
+                activity.user_id,
+                activity.created_at,
+            )
+            .join(activity, activity.user_id == Follows.followed_id)
+            .where(activity.id == activity_id)
+        )
+    )
+
+
+async def retract(session: AsyncSession, kind: ActivityKind, activity_id: int):
+    """
+    Remove uma atividade apagada das linhas do tempo. Não faz commit.
+    """
+    await session.execute(
+        delete(FeedEntry).where(FeedEntry.kind == kind, FeedEntry.activity_id == activity_id)
+    )
+
+
+async def backfill(session: AsyncSession, follower_id: int, followed_id: int):
+    """
+    Copia as últimas BACKFILL_SIZE atividades de cada tipo de `followed_id` para a linha do
+    tempo de quem acabou de segui-lo. Não faz commit.
+    """
+    await pull_accounts.ensure_loaded(session)
+    if followed_id in pull_accounts:
+        return
+
+    for kind, activity in ACTIVITY_MODELS.items():
+        await session.execute(
+            insert(FeedEntry).from_select(
+                FEED_COLUMNS,
+                select(
+                    literal(follower_id),
+                    literal(kind, FeedEntry.kind.type),
+                    activity.id,
+                    activity.user_id,
+                    activity.created_at,
+                )
+                .where(activity.user_id == followed_id)
+                .order_by(desc(activity.created_at))
+                .limit(BACKFILL_SIZE)
+            )
+        )
+
+
+async def unfollow(session: AsyncSession, follower_id: int, followed_id: int):
+    """
+    Tira da linha do tempo as atividades de quem deixou de ser seguido. Não faz commit.
+    """
+    await session.execute(
+        delete(FeedEntry).where(FeedEntry.follower_id == follower_id, FeedEntry.actor_id == followed_id)
+    )
+
+
+async def pulled_actor_ids(session: AsyncSession, follower_id: int) -> list[int]:
+    """
+    Contas sem fan-out que `follower_id` segue, cujas atividades precisam ser buscadas na leitura.
+    """
+    await pull_accounts.ensure_loaded(session)
+    if not pull_accounts.ids:
+        return []
+
+    result = await session.scalars(
+        select(Follows.followed_id).where(
+            and_(Follows.follower_id == follower_id, Follows.followed_id.in_(pull_accounts.ids))
+        )
+    )
+    return list(result)
+
+
+def merge_latest(*timelines: Iterable[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    """
+    Junta listas de atividades de um mesmo tipo (dicionários com 'id' e 'created_at'), das mais
+    recentes para as mais antigas (empates pelo id), sem repetir a mesma atividade.
+    """
+    seen = set()
+    merged = []
+    for row in sorted((row for timeline in timelines for row in timeline), key=_recency, reverse=True):
+        if row['id'] not in seen:
+            seen.add(row['id'])
+            merged.append(row)
+    return merged[:limit]
+
+
+def _recency(row: dict[str, Any]) -> tuple[datetime, int]:
+    return row['created_at'], row['id']
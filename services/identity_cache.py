@@ -0,0 +1,103 @@
+"""
+Cache do usuário autenticado, usado por security.get_current_user.
+
+Toda rota autenticada resolvia o usuário do token com um SELECT; aqui guardamos, por
+subject do token, só os valores das colunas do usuário (nunca a instância do ORM, que é
+de uma sessão específica). Na requisição seguinte a instância é remontada e anexada à
+sessão da requisição sem ir ao banco.
+
+As entradas ficam no processo (a senha com hash não vai para o cache compartilhado). Para
+que uma alteração valha em todos os workers, update_user, patch_user e delete_user gravam no
+cache compartilhado (services.cache) o horário da alteração do usuário; uma entrada guardada
+antes desse horário é descartada em qualquer worker. Com isso, cada requisição autenticada
+lê essa marca no backend do cache em vez de fazer um SELECT.
+"""
+
+import time
+from collections import OrderedDict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from models.user_model import User
+from services.cache import cache
+
+COLUMNS = ('id', 'username', 'password', 'email', 'name', 'avatar', 'created_at', 'updated_at')
+
+
+class IdentityCache:
+    def __init__(self, ttl: float = 60, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, tuple[float, tuple]] = OrderedDict()
+        self._keys_by_user: dict[int, set[str]] = {}
+
+    async def get(self, key: str, session: AsyncSession) -> User | None:
+        """
+        Retorna o usuário do cache já anexado à sessão, ou None se não houver entrada válida.
+
+        Args:
+            key (str): subject do token (ver security.get_current_user).
+            session (AsyncSession): sessão da requisição.
+        """
+        cached = self._cache.get(key)
+        if not cached:
+            return None
+
+        stored_at, values = cached
+        if time.time() - stored_at >= self.ttl:
+            self._discard(key, values[0])
+            return None
+
+        changed_at = await cache.get(self.changed_key(values[0]))
+        if changed_at is not None and changed_at >= stored_at:
+            self._discard(key, values[0])
+            return None
+
+        self._cache.move_to_end(key)
+
+        data = dict(zip(COLUMNS, values))
+        user = User(**{name: data[name] for name in ('username', 'password', 'email', 'name', 'avatar')})
+        user.id, user.created_at, user.updated_at = data['id'], data['created_at'], data['updated_at']
+        make_transient_to_detached(user)
+
+        # load=False: se a sessão já tem esse usuário, reaproveita a instância; senão,
+        # anexa a nova como persistente, em ambos os casos sem SELECT
+        return await session.merge(user, load=False)
+
+    def put(self, key: str, user: User):
+        self._cache[key] = (time.time(), tuple(getattr(user, name) for name in COLUMNS))
+        self._cache.move_to_end(key)
+        self._keys_by_user.setdefault(user.id, set()).add(key)
+
+        while len(self._cache) > self.max_entries:
+            old_key, (_, values) = self._cache.popitem(last=False)
+            self._discard(old_key, values[0])
+
+    @staticmethod
+    def changed_key(user_id: int) -> str:
+        return f'identity:changed:{user_id}'
+
+    async def invalidate_user(self, user_id: int):
+        """
+        Descarta o usuário neste worker e marca a alteração no cache compartilhado, para os demais.
+        A marca só precisa durar `ttl`: entradas mais antigas que isso já expiraram.
+        """
+        for key in self._keys_by_user.pop(user_id, ()):
+            self._cache.pop(key, None)
+        await cache.set(self.changed_key(user_id), time.time(), self.ttl)
+
+    def clear(self):
+        self._cache.clear()
+        self._keys_by_user.clear()
+
+    def _discard(self, key: str, user_id: int):
+        self._cache.pop(key, None)
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+identity_cache = IdentityCache()
@@ -0,0 +1,250 @@
+"""
+Ranking das mídias mais bem avaliadas, mantido em memória.
+
+A nota de cada mídia é uma média bayesiana (fórmula do IMDb) que junta as avaliações do
+WatchHive (1 a 5) com a nota do TMDB (vote_average, de 0 a 10, convertida para 0 a 5):
+
+    nota = (v / (v + m)) * R + (m / (v + m)) * C
+
+onde v é a quantidade de votos, R a média da mídia, m o mínimo de votos (MIN_VOTES) e
+C a média global. Assim, um único voto 5 não coloca um título no topo.
+
+O ranking é mantido por tipo de mídia e por gênero, atualizado a cada avaliação criada ou
+alterada e reconstruído do banco a cada `ttl` segundos (quando C é recalculado).
+
+A avaliação só chega direto ao ranking do worker que a recebeu. Os demais percebem a mudança
+pela versão das notas no cache compartilhado (SCORES_VERSION_KEY), conferida a cada
+`sync_interval` segundos, e então recarregam: uma nota nova leva até esse tempo para aparecer
+nos outros workers.
+"""
+
+import time
+import uuid
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.media_model import Media, media_genre
+from models.media_rating_model import MediaRating
+from services.cache import cache
+
+MIN_VOTES = 50
+# peso de um voto do WatchHive em relação a um voto do TMDB
+INTERNAL_VOTE_WEIGHT = 1.0
+# versão das notas no cache compartilhado: muda a cada avaliação, em qualquer worker
+SCORES_VERSION_KEY = 'leaderboard:scores'
+
+
+@dataclass(slots=True)
+class MediaStats:
+    media_type: str
+    title: str
+    poster_url: str | None
+    tmdb_sum: float = 0.0
+    tmdb_count: int = 0
+    score_sum: int = 0
+    score_count: int = 0
+    genre_ids: list[int] = field(default_factory=list)
+
+    @classmethod
+    def from_row(cls, row) -> 'MediaStats':
+        """
+        Monta as estatísticas a partir de uma linha de media ⨝ media_rating.
+        """
+        tmdb_count = row.vote_count or 0
+        return cls(
+            media_type=row.media_type,
+            title=row.title,
+            poster_url=row.poster_url,
+            tmdb_sum=(row.vote_average or 0.0) / 2 * tmdb_count,
+            tmdb_count=tmdb_count,
+            score_sum=row.score_sum or 0,
+            score_count=row.score_count or 0,
+        )
+
+    @property
+    def votes(self) -> float:
+        return self.tmdb_count + self.score_count * INTERNAL_VOTE_WEIGHT
+
+    @property
+    def average(self) -> float:
+        return (self.tmdb_sum + self.score_sum * INTERNAL_VOTE_WEIGHT) / self.votes
+
+
+class Leaderboard:
+    """
+    Guarda, para cada chave (genre_id, media_type), a lista ordenada de (-nota, media_id)
+    de todas as mídias com votos. None numa posição da chave significa "qualquer".
+
+    `version_tag` muda a cada carga ou nota registrada, e identifica a versão também entre
+    workers (cada carga gera um id novo).
+    """
+
+    def __init__(self, min_votes: int = MIN_VOTES, ttl: float = 900, sync_interval: float = 10):
+        self.min_votes = min_votes
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self._stats: dict[int, MediaStats] = {}
+        self._rankings: dict[tuple, list[tuple[float, int]]] = {}
+        self._ratings: dict[int, float] = {}
+        self._global_average = 0.0
+        self._loaded_at: float | None = None
+        self._load_id = ''
+        self._version = 0
+        self._scores_version = None
+        self._synced_at = 0.0
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    @property
+    def version_tag(self) -> str:
+        return f'{self._load_id}.{self._version}'
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def load(self, session: AsyncSession):
+        """
+        Reconstrói todos os rankings a partir do banco (duas consultas).
+        """
+        # lida antes das consultas: uma avaliação durante a carga provoca outra na próxima conferência
+        scores_version = await cache.get(SCORES_VERSION_KEY)
+
+        result = await session.execute(
+            select(
+                Media.id,
+                Media.media_type,
+                Media.title,
+                Media.poster_url,
+                Media.vote_average,
+                Media.vote_count,
+                MediaRating.score_sum,
+                MediaRating.score_count,
+            )
+            .outerjoin(MediaRating, MediaRating.media_id == Media.id)
+        )
+        stats = {row.id: MediaStats.from_row(row) for row in result}
+
+        for media_id, genre_id in await session.execute(select(media_genre.c.media_id, media_genre.c.genre_id)):
+            if media_id in stats:
+                stats[media_id].genre_ids.append(genre_id)
+
+        total_votes = sum(media.votes for media in stats.values())
+        total_sum = sum(media.average * media.votes for media in stats.values() if media.votes)
+        self._global_average = total_sum / total_votes if total_votes else 0.0
+
+        rankings: dict[tuple, list[tuple[float, int]]] = {}
+        ratings = {}
+        for media_id, media in stats.items():
+            if not media.votes:
+                continue
+            ratings[media_id] = self.weighted_rating(media)
+            for key in self._keys(media):
+                rankings.setdefault(key, []).append((-ratings[media_id], media_id))
+
+        for ranking in rankings.values():
+            ranking.sort()
+
+        self._stats, self._rankings, self._ratings = stats, rankings, ratings
+        self._loaded_at = self._synced_at = time.monotonic()
+        self._load_id = uuid.uuid4().hex
+        self._scores_version = scores_version
+
+    async def ensure_loaded(self, session: AsyncSession):
+        """
+        Carrega o ranking quando ainda não há um, ele passou de `ttl` ou, conferido a cada
+        `sync_interval` segundos, outro worker registrou uma avaliação.
+        """
+        if not self.is_stale and time.monotonic() - self._synced_at >= self.sync_interval:
+            self._synced_at = time.monotonic()
+            if await cache.get(SCORES_VERSION_KEY) != self._scores_version:
+                self.invalidate()
+
+        if self.is_stale:
+            await self.load(session)
+
+    def weighted_rating(self, media: MediaStats) -> float:
+        votes = media.votes
+        return (votes * media.average + self.min_votes * self._global_average) / (votes + self.min_votes)
+
+    async def record_score(self, media_id: int, new_score: int, old_score: int | None = None):
+        """
+        Atualiza a nota de uma mídia após uma avaliação, reposicionando-a nos rankings, e muda a
+        versão das notas no cache compartilhado, para que os outros workers recarreguem.
+
+        Args:
+            media_id (int): id do filme ou série.
+            new_score (int): nova nota.
+            old_score (int | None): nota anterior, quando a avaliação foi alterada.
+        """
+        await cache.set(SCORES_VERSION_KEY, uuid.uuid4().hex, self.ttl)
+
+        media = self._stats.get(media_id)
+        if self._loaded_at is None or media is None:
+            return
+
+        self._remove(media_id, media)
+
+        media.score_sum += new_score - (old_score or 0)
+        if old_score is None:
+            media.score_count += 1
+
+        self._ratings[media_id] = self.weighted_rating(media)
+        for key in self._keys(media):
+            insort(self._rankings.setdefault(key, []), (-self._ratings[media_id], media_id))
+        self._version += 1
+
+    def top(self, limit: int, media_type: str | None = None, genre_id: int | None = None) -> list[dict]:
+        """
+        Retorna as `limit` mídias com maior nota, opcionalmente filtradas por tipo e/ou gênero.
+        """
+        ranking = self._rankings.get((genre_id, media_type), [])
+        return [self.summary(media_id) for _, media_id in ranking[:limit]]
+
+    def ranked_ids(self, media_type: str | None = None, genre_id: int | None = None):
+        """
+        Percorre os ids do ranking, da maior para a menor nota.
+        """
+        for _, media_id in self._rankings.get((genre_id, media_type), []):
+            yield media_id
+
+    def rating(self, media_id: int) -> float | None:
+        return self._ratings.get(media_id)
+
+    def genres(self, media_id: int) -> list[int]:
+        media = self._stats.get(media_id)
+        return media.genre_ids if media else []
+
+    def summary(self, media_id: int) -> dict:
+        media = self._stats[media_id]
+        return {
+            'id': media_id,
+            'title': media.title,
+            'poster_url': media.poster_url,
+            'average_score': self._ratings.get(media_id, 0.0),
+        }
+
+    def _remove(self, media_id: int, media: MediaStats):
+        rating = self._ratings.pop(media_id, None)
+        if rating is None:
+            return
+        for key in self._keys(media):
+            ranking = self._rankings[key]
+            position = bisect_left(ranking, (-rating, media_id))
+            if position < len(ranking) and ranking[position] == (-rating, media_id):
+                del ranking[position]
+
+    @staticmethod
+    def _keys(media: MediaStats):
+        yield None, None
+        yield None, media.media_type
+        for genre_id in media.genre_ids:
+            yield genre_id, None
+            yield genre_id, media.media_type
+
+
+leaderboard = Leaderboard()
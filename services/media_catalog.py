@@ -0,0 +1,139 @@
+"""
+Catálogo em memória dos gêneros e de um resumo de cada mídia (id, título, pôster, tipo e popularidade).
+
+Os gêneros são dados de referência e as linhas base de media praticamente não mudam depois da
+carga inicial, mas toda listagem relia título e pôster do banco. Com o catálogo, as listagens
+consultam no banco apenas os ids (filtro, ordenação e paginação) e montam as linhas daqui.
+"""
+
+import time
+import uuid
+from functools import partial
+from typing import Iterable
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+
+from database import on_commit
+from models.media_model import Genre, Media
+
+
+class MediaSummary:
+    """
+    Resumo de uma mídia para as listagens. Com __slots__, cada resumo ocupa bem menos memória
+    que um objeto Media (sem __dict__ nem estado do ORM).
+    """
+
+    __slots__ = ('id', 'title', 'poster_url', 'media_type', 'popularity')
+
+    def __init__(self, id: int, title: str, poster_url: str | None, media_type: str, popularity: float | None):
+        self.id = id
+        self.title = title
+        self.poster_url = poster_url
+        self.media_type = media_type
+        self.popularity = popularity
+
+
+class MediaCatalog:
+    """
+    Guarda os gêneros (id -> nome) e o resumo de cada mídia (id -> MediaSummary).
+
+    O catálogo é carregado na primeira utilização e recarregado após `ttl` segundos. Mídias
+    criadas, alteradas ou removidas pelo ORM são atualizadas no commit, e ids que ainda não
+    estão no catálogo são buscados no banco. `version` muda a cada carga ou alteração, e
+    `version_tag` a identifica também entre workers (cada carga gera um id novo).
+    """
+
+    COLUMNS = (Media.id, Media.title, Media.poster_url, Media.media_type, Media.popularity)
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self.version = 0
+        self._load_id = ''
+        self._genres: dict[int, str] = {}
+        self._medias: dict[int, MediaSummary] = {}
+        self._loaded_at: float | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    @property
+    def version_tag(self) -> str:
+        return f'{self._load_id}.{self.version}'
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def load(self, session: AsyncSession):
+        """
+        Lê todos os gêneros e o resumo de todas as mídias.
+
+        Args:
+            session (AsyncSession): sessão ativa do banco.
+        """
+        genres = await session.execute(select(Genre.id, Genre.name).order_by(Genre.name))
+        medias = await session.execute(select(*self.COLUMNS))
+
+        # troca atômica: leituras concorrentes veem o catálogo antigo ou o novo, nunca um parcial
+        self._genres = dict(genres.tuples().all())
+        self._medias = {row[0]: MediaSummary(*row) for row in medias}
+        self._loaded_at = time.monotonic()
+        self._load_id = uuid.uuid4().hex
+        self.version += 1
+
+    async def ensure_loaded(self, session: AsyncSession):
+        if self.is_stale:
+            await self.load(session)
+
+    def upsert(self, media_id: int, title: str, poster_url: str | None, media_type: str, popularity: float | None):
+        self._medias[media_id] = MediaSummary(media_id, title, poster_url, media_type, popularity)
+        self.version += 1
+
+    def remove(self, media_id: int):
+        if self._medias.pop(media_id, None):
+            self.version += 1
+
+    def genres(self) -> list[dict]:
+        """
+        Gêneros em ordem alfabética.
+        """
+        return [{'id': genre_id, 'name': name} for genre_id, name in self._genres.items()]
+
+    async def summaries(self, ids: Iterable[int], session: AsyncSession) -> list[MediaSummary]:
+        """
+        Resumos das mídias `ids`, na mesma ordem. Ids fora do catálogo são buscados no banco
+        e guardados; ids inexistentes são ignorados.
+
+        Args:
+            ids (Iterable[int]): ids das mídias, na ordem desejada.
+            session (AsyncSession): sessão ativa do banco.
+        """
+        await self.ensure_loaded(session)
+
+        ids = list(ids)
+        missing = [media_id for media_id in ids if media_id not in self._medias]
+        if missing:
+            result = await session.execute(select(*self.COLUMNS).where(Media.id.in_(missing)))
+            for row in result:
+                self.upsert(*row)
+
+        return [self._medias[media_id] for media_id in ids if media_id in self._medias]
+
+
+media_catalog = MediaCatalog()
+
+
+@event.listens_for(Media, 'after_insert')
+@event.listens_for(Media, 'after_update')
+def _upsert_media_catalog(mapper, connection, target):
+    action = partial(
+        media_catalog.upsert, target.id, target.title, target.poster_url, target.media_type, target.popularity
+    )
+    on_commit(object_session(target), ('media_catalog', target.id), action)
+
+
+@event.listens_for(Media, 'after_delete')
+def _remove_from_media_catalog(mapper, connection, target):
+    on_commit(object_session(target), ('media_catalog', target.id), partial(media_catalog.remove, target.id))
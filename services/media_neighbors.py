@@ -0,0 +1,205 @@
+"""
+Job em lote que calcula os vizinhos mais próximos de cada mídia e grava em media_neighbor.
+
+A similaridade entre duas mídias combina:
+- cosseno entre os vetores de gêneros (tabela media_genre);
+- cosseno entre as colunas da matriz usuário x mídia de avaliações (notas centradas na
+  média de cada usuário), ou seja, "quem gostou de A também gostou de B".
+
+As matrizes são montadas com NumPy/SciPy (esparsas) e o produto é feito em blocos de linhas,
+mantendo só os K maiores de cada linha, sem materializar a matriz n x n. Roda só em CPU e
+leva poucos segundos para ~18 mil mídias.
+
+Uso (fora do processo da API):
+    python -m services.media_neighbors
+
+Em produção roda no serviço watchhive_neighbors do compose.yaml (./entrypoint.sh neighbors),
+que repete o cálculo a cada NEIGHBORS_INTERVAL segundos.
+"""
+
+import asyncio
+import time
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.media_model import Media, media_genre
+from models.media_neighbor_model import MediaNeighbor
+from models.review_model import Review
+
+NEIGHBORS = 20
+# peso do cosseno de gêneros; o restante vai para as avaliações em comum
+GENRE_WEIGHT = 0.5
+# desempate entre mídias igualmente parecidas, a favor das mais populares
+POPULARITY_WEIGHT = 1e-3
+BLOCK_SIZE = 1024
+# abaixo disso o vizinho só foi escolhido pelo desempate (sem nada em comum)
+MIN_SCORE = 1e-4
+
+
+def _normalize_columns(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0))).ravel()
+    norms[norms == 0] = 1.0
+    return (matrix @ sparse.diags(1.0 / norms)).tocsr()
+
+
+def _genre_matrix(position: dict[int, int], genre_pairs: np.ndarray) -> np.ndarray:
+    """
+    Matriz mídia x gênero densa (são poucos gêneros), com as linhas normalizadas e já
+    multiplicadas pela raiz de GENRE_WEIGHT, para que o peso entre no produto escalar.
+    """
+    genre_pairs = np.array(
+        [pair for pair in genre_pairs.tolist() if pair[0] in position], dtype=np.int64
+    ).reshape(-1, 2)
+    genre_ids, genre_cols = np.unique(genre_pairs[:, 1], return_inverse=True)
+
+    genres = np.zeros((len(position), len(genre_ids)), dtype=np.float32)
+    genres[[position[media_id] for media_id in genre_pairs[:, 0].tolist()], genre_cols] = 1.0
+    norms = np.linalg.norm(genres, axis=1, keepdims=True)
+    genres /= np.where(norms == 0, 1.0, norms)
+    genres *= np.sqrt(GENRE_WEIGHT)
+    return genres
+
+
+def _ratings_matrix(position: dict[int, int], reviews: np.ndarray) -> sparse.csr_matrix:
+    """
+    Matriz usuário x mídia (esparsa) com as notas centradas na média de cada usuário e as
+    colunas normalizadas.
+    """
+    reviews = np.array(
+        [review for review in reviews.tolist() if review[1] in position], dtype=np.float64
+    ).reshape(-1, 3)
+    user_ids, user_rows = np.unique(reviews[:, 0], return_inverse=True)
+    scores = reviews[:, 2] - (np.bincount(user_rows, reviews[:, 2]) / np.bincount(user_rows))[user_rows]
+    review_cols = np.array([position[int(media_id)] for media_id in reviews[:, 1].tolist()], dtype=np.int64)
+
+    ratings = sparse.csr_matrix((scores, (user_rows, review_cols)), shape=(len(user_ids), len(position)))
+    return _normalize_columns(ratings)
+
+
+def _tie_break(popularity: np.ndarray) -> np.ndarray:
+    max_popularity = max(float(np.nanmax(popularity, initial=0.0)), 1.0)
+    return (POPULARITY_WEIGHT * np.nan_to_num(popularity, nan=0.0) / max_popularity).astype(np.float32)
+
+
+def _top_k(
+    genres: np.ndarray, ratings: sparse.csr_matrix, tie_break: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Seleciona, em blocos de BLOCK_SIZE linhas, as k mídias mais parecidas com cada mídia.
+
+    Returns:
+        (posições dos vizinhos, notas) como duas matrizes (n, k).
+    """
+    n = len(genres)
+    ratings_t = ratings.T.tocsr()
+
+    positions, scores = [], []
+    for start in range(0, n, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, n)
+
+        block = genres[start:stop] @ genres.T
+        block += tie_break
+
+        corated = (ratings_t[start:stop] @ ratings).tocoo()
+        block[corated.row, corated.col] += (1 - GENRE_WEIGHT) * corated.data.astype(np.float32)
+
+        block[np.arange(stop - start), np.arange(start, stop)] = -np.inf  # a própria mídia
+
+        top = np.argpartition(block, -k, axis=1)[:, -k:]
+        # o desempate só serve para escolher os vizinhos, não entra na nota gravada
+        # (arredondado para não deixar resíduo de float32 decidir empates)
+        positions.append(top)
+        scores.append(np.round(np.take_along_axis(block, top, axis=1) - tie_break[top], 5))
+
+    return np.concatenate(positions), np.concatenate(scores)
+
+
+def compute_neighbors(
+    media_ids: np.ndarray,
+    popularity: np.ndarray,
+    genre_pairs: np.ndarray,
+    reviews: np.ndarray,
+    k: int = NEIGHBORS,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcula os k vizinhos de cada mídia.
+
+    Args:
+        media_ids: ids das mídias (n,).
+        popularity: popularidade de cada mídia (n,), para desempate.
+        genre_pairs: pares (media_id, genre_id) (g, 2).
+        reviews: triplas (user_id, media_id, score) (r, 3).
+        k: quantidade de vizinhos por mídia.
+
+    Returns:
+        (media_id, neighbor_id, score) como três arrays paralelos.
+    """
+    k = min(k, len(media_ids) - 1)
+    if k <= 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float64)
+
+    position = {media_id: index for index, media_id in enumerate(media_ids.tolist())}
+
+    top, scores = _top_k(
+        _genre_matrix(position, genre_pairs), _ratings_matrix(position, reviews), _tie_break(popularity), k
+    )
+
+    return np.repeat(media_ids, k), media_ids[top].ravel(), scores.ravel().astype(np.float64)
+
+
+async def refresh_media_neighbors(session: AsyncSession, k: int = NEIGHBORS) -> int:
+    """
+    Lê media, media_genre e review, recalcula os vizinhos e substitui o conteúdo de media_neighbor.
+
+    Returns:
+        int: quantidade de linhas gravadas.
+    """
+    medias = (await session.execute(select(Media.id, Media.popularity).order_by(Media.id))).all()
+    pairs = (await session.execute(select(media_genre.c.media_id, media_genre.c.genre_id))).all()
+    reviews = (await session.execute(select(Review.user_id, Review.media_id, Review.score))).all()
+
+    media_ids = np.array([row[0] for row in medias], dtype=np.int64)
+    popularity = np.array([row[1] if row[1] is not None else np.nan for row in medias], dtype=np.float64)
+
+    sources, targets, values = compute_neighbors(
+        media_ids,
+        popularity,
+        np.array(pairs, dtype=np.int64).reshape(-1, 2),
+        np.array(reviews, dtype=np.float64).reshape(-1, 3),
+        k=k,
+    )
+
+    # vizinhos sem nenhuma semelhança não ajudam a recomendar
+    keep = values > MIN_SCORE
+
+    await session.execute(delete(MediaNeighbor))
+    rows = [
+        {'media_id': media_id, 'neighbor_id': neighbor_id, 'score': score}
+        for media_id, neighbor_id, score in zip(
+            sources[keep].tolist(), targets[keep].tolist(), values[keep].tolist()
+        )
+    ]
+    if rows:
+        await session.execute(insert(MediaNeighbor), rows)
+    await session.commit()
+
+    return len(rows)
+
+
+async def main():
+    import models.registry  # noqa: F401, PLC0415 (só quando executado como script)
+    from database import dispose_engines, init_engines  # noqa: PLC0415
+
+    start = time.perf_counter()
+    async with AsyncSession(init_engines(), expire_on_commit=False) as session:
+        total = await refresh_media_neighbors(session)
+    await dispose_engines()
+
+    print(f'{total} vizinhos gravados em {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
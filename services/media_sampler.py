@@ -0,0 +1,86 @@
+"""
+Índice em memória para sorteio de mídias por (gênero, tipo).
+
+Substitui o ORDER BY random() sobre o join media ⨝ media_genre: os ids de cada grupo ficam
+num array e o sorteio custa O(limit), mantendo a distribuição uniforme.
+"""
+
+import random
+import time
+from array import array
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+
+from database import on_commit
+from models.media_model import Media, media_genre
+
+
+class MediaSampler:
+    """
+    Guarda, por (genre_id, media_type), um array com os ids das mídias daquele grupo.
+
+    O índice é carregado na primeira utilização, recarregado após `ttl` segundos e
+    invalidado no commit de toda criação, alteração ou remoção de mídia pelo ORM.
+    """
+
+    def __init__(self, ttl: float = 600):
+        self.ttl = ttl
+        self._buckets: dict[tuple[int, str], array] = {}
+        self._loaded_at: float | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def load(self, session: AsyncSession):
+        """
+        Lê todo o join media ⨝ media_genre (apenas ids) e monta os grupos.
+
+        Args:
+            session (AsyncSession): sessão ativa do banco.
+        """
+        result = await session.execute(
+            select(media_genre.c.genre_id, Media.media_type, Media.id)
+            .join(Media, Media.id == media_genre.c.media_id)
+        )
+
+        buckets: dict[tuple[int, str], array] = {}
+        for genre_id, media_type, media_id in result:
+            buckets.setdefault((genre_id, media_type), array('l')).append(media_id)
+
+        # troca atômica: leituras concorrentes veem o índice antigo ou o novo, nunca um parcial
+        self._buckets = buckets
+        self._loaded_at = time.monotonic()
+
+    async def ensure_loaded(self, session: AsyncSession):
+        if self.is_stale:
+            await self.load(session)
+
+    def sample(self, genre_id: int, media_type: str, limit: int) -> list[int]:
+        """
+        Sorteia até `limit` ids distintos do grupo, sem repetição.
+
+        Args:
+            genre_id (int): gênero.
+            media_type (str): 'filme' ou 'série'.
+            limit (int): quantidade de ids.
+        """
+        bucket = self._buckets.get((genre_id, media_type))
+        if not bucket:
+            return []
+        return random.sample(bucket, min(limit, len(bucket)))
+
+
+media_sampler = MediaSampler()
+
+
+@event.listens_for(Media, 'after_insert')
+@event.listens_for(Media, 'after_update')
+@event.listens_for(Media, 'after_delete')
+def _invalidate_media_sampler(mapper, connection, target):
+    on_commit(object_session(target), 'media_sampler', media_sampler.invalidate)
@@ -0,0 +1,71 @@
+"""
+Busca de mídias por título (title e original_title).
+
+No Postgres a busca usa os índices GIN de trigramas (pg_trgm) criados na migração
+7d2b4e8a1c3f: o ILIKE '%termo%' passa a usar o índice e o operador % aceita pequenos erros
+de digitação. O resultado é ordenado pela similaridade e, em seguida, pela popularidade.
+
+Nos demais bancos (SQLite dos testes) é usado um fallback portável com ILIKE nos dois
+títulos, priorizando títulos que começam com o termo.
+"""
+
+from sqlalchemy import Select, case, desc, func, or_, select
+
+from models.media_model import Media
+
+# caractere de escape do LIKE; evita a barra invertida, que é tratada de forma diferente em cada banco
+LIKE_ESCAPE = '/'
+
+
+def escape_like(term: str) -> str:
+    """
+    Escapa os curingas do LIKE para que o termo seja buscado literalmente.
+    """
+    return term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace('%', f'{LIKE_ESCAPE}%').replace('_', f'{LIKE_ESCAPE}_')
+
+
+def search_statement(search_term: str, dialect_name: str) -> Select:
+    """
+    Monta a consulta de busca adequada ao banco em uso.
+
+    Args:
+        search_term (str): termo digitado pelo usuário.
+        dialect_name (str): nome do dialeto do SQLAlchemy ('postgresql', 'sqlite', ...).
+    """
+    term = search_term.strip()
+    like_term = f'%{escape_like(term)}%'
+
+    contains = or_(
+        Media.title.ilike(like_term, escape=LIKE_ESCAPE),
+        Media.original_title.ilike(like_term, escape=LIKE_ESCAPE),
+    )
+
+    if dialect_name == 'postgresql':
+        similarity = func.greatest(
+            func.similarity(Media.title, term),
+            func.similarity(func.coalesce(Media.original_title, ''), term),
+        )
+
+        return (
+            select(Media)
+            .where(or_(contains, Media.title.op('%')(term), Media.original_title.op('%')(term)))
+            .order_by(desc(similarity), Media.popularity.desc().nulls_last(), Media.id)
+        )
+
+    prefix_term = f'{escape_like(term)}%'
+    starts_with = case(
+        (
+            or_(
+                Media.title.ilike(prefix_term, escape=LIKE_ESCAPE),
+                Media.original_title.ilike(prefix_term, escape=LIKE_ESCAPE),
+            ),
+            0,
+        ),
+        else_=1,
+    )
+
+    return (
+        select(Media)
+        .where(contains)
+        .order_by(starts_with, desc(func.coalesce(Media.popularity, 0)), Media.id)
+    )
@@ -0,0 +1,145 @@
+"""
+Motor de recomendações por gênero.
+
+Reaproveita o que já está pré-calculado em memória pelo services.leaderboard: a nota de
+qualidade de cada mídia (média bayesiana) e o ranking por gênero. Para cada usuário:
+
+1. monta um perfil de gêneros com as avaliações >= 4 mais recentes (não só a última),
+   pesando notas maiores e avaliações mais novas;
+2. pega os candidatos mais bem avaliados de cada gênero do perfil;
+3. soma os vizinhos ("mais como este", tabela media_neighbor) das mídias bem avaliadas;
+4. ordena por (similaridade de cosseno entre os gêneros da mídia e o perfil + proximidade
+   pelos vizinhos) x qualidade, removendo o que o usuário já avaliou ou assistiu.
+
+O resultado fica no cache compartilhado (services.cache) por usuário, por `ttl` segundos, e é
+apagado de lá quando o usuário avalia algo: vale para todos os workers, não só o que recebeu
+a avaliação.
+"""
+
+import math
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.media_neighbor_model import MediaNeighbor
+from models.review_model import Review
+from models.user_list_model import ListType, UserList, UserListMedia
+from services.cache import cache
+from services.leaderboard import leaderboard
+
+HISTORY_SIZE = 20
+MIN_SCORE = 4
+PROFILE_GENRES = 5
+CANDIDATES_PER_GENRE = 200
+# cada avaliação mais antiga pesa um pouco menos que a anterior
+RECENCY_DECAY = 0.9
+
+
+def genre_similarity(genre_ids: list[int], profile: dict[int, float], profile_norm: float) -> float:
+    """
+    Cosseno entre o vetor binário de gêneros da mídia e o vetor de pesos do perfil.
+    """
+    if not genre_ids or not profile_norm:
+        return 0.0
+    dot = sum(profile.get(genre_id, 0.0) for genre_id in genre_ids)
+    return dot / (math.sqrt(len(genre_ids)) * profile_norm)
+
+
+class Recommender:
+    def __init__(self, ttl: float = 600):
+        self.ttl = ttl
+
+    @staticmethod
+    def cache_key(user_id: int) -> str:
+        return f'recommendations:{user_id}'
+
+    async def invalidate_user(self, user_id: int):
+        await cache.delete(self.cache_key(user_id))
+
+    async def recommend(self, user_id: int, limit: int, session: AsyncSession) -> list[dict]:
+        """
+        Retorna as recomendações do usuário, do cache quando possível.
+
+        Args:
+            user_id (int): id do usuário logado.
+            limit (int): quantidade de mídias.
+            session (AsyncSession): sessão ativa do banco.
+        """
+        cached = await cache.get(self.cache_key(user_id))
+        if cached is not None and len(cached) >= limit:
+            return cached[:limit]
+
+        await leaderboard.ensure_loaded(session)
+        medias = await self._compute(user_id, limit, session)
+        await cache.set(self.cache_key(user_id), medias, self.ttl)
+
+        return medias
+
+    async def _compute(self, user_id: int, limit: int, session: AsyncSession) -> list[dict]:
+        history = (await session.execute(
+            select(Review.media_id, Review.score)
+            .where(Review.user_id == user_id)
+            .order_by(desc(Review.created_at), desc(Review.id))
+            .limit(HISTORY_SIZE)
+        )).all()
+
+        watched = await session.scalars(
+            select(UserListMedia.media_id)
+            .join(UserList, UserListMedia.user_list_id == UserList.id)
+            .where(UserList.user_id == user_id, UserList.name == ListType.WATCHED)
+        )
+        seen = set(watched) | {media_id for media_id, _ in history}
+
+        profile: dict[int, float] = {}
+        for position, (media_id, score) in enumerate(history):
+            if score < MIN_SCORE:
+                continue
+            weight = (score - MIN_SCORE + 1) * RECENCY_DECAY ** position
+            for genre_id in leaderboard.genres(media_id):
+                profile[genre_id] = profile.get(genre_id, 0.0) + weight
+
+        if not profile:
+            # usuário sem histórico suficiente: os mais bem avaliados em geral
+            return [
+                leaderboard.summary(media_id)
+                for media_id in self._unseen(leaderboard.ranked_ids(), seen, limit)
+            ]
+
+        top_genres = sorted(profile, key=profile.get, reverse=True)[:PROFILE_GENRES]
+        profile = {genre_id: profile[genre_id] for genre_id in top_genres}
+        profile_norm = math.sqrt(sum(weight ** 2 for weight in profile.values()))
+
+        candidates = set()
+        for genre_id in top_genres:
+            candidates.update(
+                self._unseen(leaderboard.ranked_ids(genre_id=genre_id), seen, CANDIDATES_PER_GENRE)
+            )
+
+        liked = [media_id for media_id, score in history if score >= MIN_SCORE]
+        neighbors: dict[int, float] = {}
+        for neighbor_id, score in await session.execute(
+            select(MediaNeighbor.neighbor_id, MediaNeighbor.score).where(MediaNeighbor.media_id.in_(liked))
+        ):
+            if neighbor_id not in seen and leaderboard.rating(neighbor_id) is not None:
+                neighbors[neighbor_id] = neighbors.get(neighbor_id, 0.0) + score
+        candidates.update(neighbors)
+
+        def relevance(media_id: int) -> float:
+            similarity = genre_similarity(leaderboard.genres(media_id), profile, profile_norm)
+            return (similarity + neighbors.get(media_id, 0.0)) * leaderboard.rating(media_id)
+
+        ranked = sorted(candidates, key=lambda media_id: (-relevance(media_id), media_id))
+        return [leaderboard.summary(media_id) for media_id in ranked[:limit]]
+
+    @staticmethod
+    def _unseen(media_ids, seen: set[int], limit: int) -> list[int]:
+        result = []
+        for media_id in media_ids:
+            if media_id not in seen:
+                result.append(media_id)
+                if len(result) == limit:
+                    break
+        return result
+
+
+recommender = Recommender()
@@ -0,0 +1,198 @@
+"""
+Índice de prefixos em memória para sugestões de títulos (typeahead).
+
+Cada título e título original é normalizado (minúsculas, sem acentos nem pontuação) e indexado
+a partir do início de cada palavra, numa lista ordenada pesquisada com bisect. Para prefixos
+curtos, que casam com milhares de títulos, o top-k por popularidade é pré-calculado.
+"""
+
+import heapq
+import re
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from functools import partial
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+
+from database import on_commit
+from models.media_model import Media
+
+# prefixos até esse tamanho têm o top-k pré-calculado
+CACHED_PREFIX_LENGTH = 3
+MAX_SUGGESTIONS = 20
+
+
+def normalize_title(title: str | None) -> str:
+    """
+    'Amélie: O Fabuloso Destino' -> 'amelie o fabuloso destino'
+    """
+    if not title:
+        return ''
+    without_accents = ''.join(
+        char for char in unicodedata.normalize('NFKD', title) if not unicodedata.combining(char)
+    )
+    return ' '.join(re.findall(r'\w+', without_accents.casefold()))
+
+
+def index_keys(*titles: str | None) -> set[str]:
+    """
+    Chaves indexadas para uma mídia: o título normalizado a partir de cada palavra,
+    para que 'godf' encontre 'The Godfather'.
+    """
+    keys = set()
+    for title in titles:
+        words = normalize_title(title).split(' ')
+        for position in range(len(words)):
+            key = ' '.join(words[position:])
+            if key:
+                keys.add(key)
+    return keys
+
+
+class TitlePrefixIndex:
+    """
+    Lista ordenada de (chave, media_id) + resumo de cada mídia (título, pôster, popularidade).
+
+    Carregada da tabela media na primeira utilização e atualizada incrementalmente pelos
+    eventos de escrita do ORM em Media, depois do commit.
+    """
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self._entries: list[tuple[str, int]] = []
+        self._keys_by_media: dict[int, set[str]] = {}
+        self._medias: dict[int, tuple[str, str | None, float]] = {}
+        self._top_by_prefix: dict[str, list[int]] = {}
+        self._loaded_at: float | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def load(self, session: AsyncSession):
+        """
+        Reconstrói o índice inteiro a partir da tabela media.
+        """
+        result = await session.execute(
+            select(Media.id, Media.title, Media.original_title, Media.poster_url, Media.popularity)
+        )
+
+        entries = []
+        keys_by_media = {}
+        medias = {}
+        for media_id, title, original_title, poster_url, popularity in result:
+            keys = index_keys(title, original_title)
+            keys_by_media[media_id] = keys
+            medias[media_id] = (title, poster_url, popularity or 0.0)
+            entries.extend((key, media_id) for key in keys)
+        entries.sort()
+
+        self._entries, self._keys_by_media, self._medias = entries, keys_by_media, medias
+        self._top_by_prefix = self._build_top_by_prefix()
+        self._loaded_at = time.monotonic()
+
+    async def ensure_loaded(self, session: AsyncSession):
+        if self.is_stale:
+            await self.load(session)
+
+    def upsert(self, media_id: int, title: str, original_title: str | None, poster_url: str | None, popularity):
+        """
+        Atualiza uma única mídia no índice, sem reconstruí-lo.
+        """
+        if self._loaded_at is None:
+            return  # será lida do banco na próxima carga
+
+        old_keys = self._remove_entries(media_id)
+
+        keys = index_keys(title, original_title)
+        for key in keys:
+            insort(self._entries, (key, media_id))
+        self._keys_by_media[media_id] = keys
+        self._medias[media_id] = (title, poster_url, popularity or 0.0)
+        # prefixos das chaves antigas também, para que um título renomeado saia das sugestões
+        self._refresh_top_by_prefix(old_keys | keys)
+
+    def remove(self, media_id: int):
+        if self._loaded_at is None:
+            return
+
+        keys = self._remove_entries(media_id)
+        self._medias.pop(media_id, None)
+        self._refresh_top_by_prefix(keys)
+
+    def suggest(self, term: str, limit: int = 10) -> list[dict]:
+        """
+        Retorna as mídias mais populares cujo título (ou alguma palavra dele) começa com o termo.
+
+        Args:
+            term (str): texto digitado.
+            limit (int): quantidade máxima de sugestões.
+        """
+        prefix = normalize_title(term)
+        if not prefix:
+            return []
+
+        if prefix in self._top_by_prefix and limit <= MAX_SUGGESTIONS:
+            media_ids = self._top_by_prefix[prefix][:limit]
+        else:
+            media_ids = self._top_for_prefix(prefix, limit)
+
+        return [
+            {'id': media_id, 'title': self._medias[media_id][0], 'poster_url': self._medias[media_id][1]}
+            for media_id in media_ids
+        ]
+
+    def _matching_ids(self, prefix: str) -> set[int]:
+        entries = self._entries
+        position = bisect_left(entries, (prefix,))
+        media_ids = set()
+        while position < len(entries) and entries[position][0].startswith(prefix):
+            media_ids.add(entries[position][1])
+            position += 1
+        return media_ids
+
+    def _top_for_prefix(self, prefix: str, limit: int) -> list[int]:
+        return heapq.nlargest(
+            limit,
+            self._matching_ids(prefix),
+            key=lambda media_id: (self._medias[media_id][2], -media_id),
+        )
+
+    def _build_top_by_prefix(self) -> dict[str, list[int]]:
+        prefixes = {key[:length] for key, _ in self._entries for length in range(1, CACHED_PREFIX_LENGTH + 1)}
+        return {prefix: self._top_for_prefix(prefix, MAX_SUGGESTIONS) for prefix in prefixes}
+
+    def _refresh_top_by_prefix(self, keys: set[str]):
+        for prefix in {key[:length] for key in keys for length in range(1, CACHED_PREFIX_LENGTH + 1)}:
+            self._top_by_prefix[prefix] = self._top_for_prefix(prefix, MAX_SUGGESTIONS)
+
+    def _remove_entries(self, media_id: int) -> set[str]:
+        keys = self._keys_by_media.pop(media_id, set())
+        for key in keys:
+            position = bisect_left(self._entries, (key, media_id))
+            if position < len(self._entries) and self._entries[position] == (key, media_id):
+                del self._entries[position]
+        return keys
+
+
+title_index = TitlePrefixIndex()
+
+
+@event.listens_for(Media, 'after_insert')
+@event.listens_for(Media, 'after_update')
+def _upsert_title_index(mapper, connection, target):
+    action = partial(
+        title_index.upsert, target.id, target.title, target.original_title, target.poster_url, target.popularity
+    )
+    on_commit(object_session(target), ('title_index', target.id), action)
+
+
+@event.listens_for(Media, 'after_delete')
+def _remove_from_title_index(mapper, connection, target):
+    on_commit(object_session(target), ('title_index', target.id), partial(title_index.remove, target.id))
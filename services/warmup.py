@@ -0,0 +1,74 @@
+"""
+Aquecimento do worker na subida e atualização dos índices em memória em segundo plano.
+
+Sem isso, as primeiras requisições depois de um deploy pagam a abertura das conexões do
+pool e a carga dos índices (leaderboard, busca por prefixo, sorteio por gênero, catálogo), e a cada
+`ttl` de um índice alguma requisição volta a pagar a recarga. Chamado pelo lifespan de
+main.create_app.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from services.leaderboard import leaderboard
+from services.media_catalog import media_catalog
+from services.media_sampler import media_sampler
+from services.title_index import title_index
+
+logger = logging.getLogger(__name__)
+
+INDEXES = (leaderboard, title_index, media_sampler, media_catalog)
+# recarrega o índice quando passar essa fração do ttl, antes de ele expirar numa requisição
+REFRESH_AT = 0.8
+
+
+async def warm_pool(engine: AsyncEngine, connections: int):
+    """
+    Abre `connections` conexões ao mesmo tempo e as devolve ao pool, que as mantém abertas.
+
+    Args:
+        engine (AsyncEngine): engine do banco.
+        connections (int): quantas conexões abrir (normalmente DB_POOL_SIZE).
+    """
+    async def ping():
+        async with engine.connect() as connection:
+            await connection.execute(text('SELECT 1'))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+
+async def preload_indexes(engine: AsyncEngine):
+    """
+    Carrega todos os índices em memória antes da primeira requisição.
+    """
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        for index in INDEXES:
+            await index.load(session)
+
+
+async def refresh_forever(index, engine: AsyncEngine):
+    """
+    Recarrega o índice periodicamente, antes de ele expirar. Erros são registrados e a
+    próxima tentativa acontece no ciclo seguinte (as requisições continuam usando o
+    índice antigo ou o recarregam sozinhas, via ensure_loaded).
+    """
+    while True:
+        await asyncio.sleep(index.ttl * REFRESH_AT)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                await index.load(session)
+        except Exception:
+            logger.exception('Falha ao recarregar %s', type(index).__name__)
+
+
+def start_refreshers(engine: AsyncEngine) -> list[asyncio.Task]:
+    return [asyncio.create_task(refresh_forever(index, engine)) for index in INDEXES]
+
+
+async def stop_refreshers(tasks: list[asyncio.Task]):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -4,7 +4,7 @@ variables or a .env file.
 """
 
 
-from typing import List
+from typing import Any, List, Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -22,6 +22,48 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     ALGORITHM: str
 
+    # pool de conexões, por worker (o total no banco é DB_POOL_SIZE + DB_MAX_OVERFLOW vezes o nº de workers)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # segundos esperando uma conexão livre antes de dar erro
+    DB_POOL_RECYCLE: int = 1800  # segundos; evita usar conexões que o banco/proxy já derrubou
+    DB_POOL_PRE_PING: bool = True
+    DB_CONNECT_TIMEOUT: int = 10
+    DB_QUERY_CACHE_SIZE: int = 500  # cache de SQL compilado do SQLAlchemy
+    DB_PREPARE_THRESHOLD: int | None = 5  # psycopg: execuções até virar prepared statement (None desliga)
+    DB_ECHO: bool = False
+
+    # na subida do worker: abre as conexões do pool, carrega os índices em memória e inicia
+    # as recargas em segundo plano (services/warmup.py)
+    STARTUP_WARMUP: bool = True
+
+    # réplicas de leitura, separadas por vírgula (vazio = tudo no DATABASE_URL)
+    DATABASE_REPLICA_URLS: str = ''
+    # por quanto tempo depois de uma escrita o cliente continua lendo do primário
+    REPLICA_LAG_SECONDS: float = 5
+
+    # servidor de produção (server.py); sem WEB_WORKERS usa um worker por CPU disponível
+    WEB_HOST: str = '0.0.0.0'
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int | None = None
+    WEB_KEEP_ALIVE: int = 5
+    WEB_GRACEFUL_TIMEOUT: int = 20  # segundos para terminar as requisições em andamento
+
+    # cache compartilhado (services/cache.py): 'memory' é por worker; 'shm' é compartilhado pelos
+    # workers da mesma máquina; 'redis' é compartilhado entre máquinas (CACHE_URL=redis://...)
+    CACHE_BACKEND: Literal['memory', 'shm', 'redis'] = 'memory'
+    CACHE_URL: str | None = None
+    CACHE_MAX_ENTRIES: int = 10_000  # backend 'memory'
+    CACHE_SHM_PATH: str = '/dev/shm/watchhive-cache'  # prefixo: o arquivo é CACHE_SHM_PATH-SLOTSxSLOT_SIZE
+    CACHE_SHM_SLOTS: int = 8192  # backend 'shm': o arquivo tem CACHE_SHM_SLOTS * CACHE_SHM_SLOT_SIZE bytes
+    CACHE_SHM_SLOT_SIZE: int = 8192
+
+    # respostas a partir desse tamanho (bytes) são comprimidas com zstd/brotli/gzip (response_compression.py)
+    COMPRESSION_MIN_SIZE: int = 1000
+
+    # token exigido pelas rotas /internal (sem token configurado elas ficam desligadas)
+    INTERNAL_TOKEN: str | None = None
+
     def get_allowed_origins(self) -> List[str]:
         """
         Transforma a string vinda do .env em lista de URLs.
@@ -30,5 +72,40 @@ class Settings(BaseSettings):
             return []
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
 
+    def get_replica_urls(self) -> List[str]:
+        """
+        Transforma a string vinda do .env em lista de URLs das réplicas de leitura.
+        """
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+    def get_engine_options(self, url: str | None = None) -> dict[str, Any]:
+        """
+        Monta os argumentos de create_async_engine a partir das configurações DB_*.
+
+        O SQLite (testes/desenvolvimento) não usa pool de conexões com tamanho, então
+        só recebe as opções que valem para qualquer banco.
+        """
+        url = url or self.DATABASE_URL
+        options: dict[str, Any] = {
+            'echo': self.DB_ECHO,
+            'query_cache_size': self.DB_QUERY_CACHE_SIZE,
+        }
+        if url.startswith('sqlite'):
+            return options
+
+        options.update(
+            pool_size=self.DB_POOL_SIZE,
+            max_overflow=self.DB_MAX_OVERFLOW,
+            pool_timeout=self.DB_POOL_TIMEOUT,
+            pool_recycle=self.DB_POOL_RECYCLE,
+            pool_pre_ping=self.DB_POOL_PRE_PING,
+        )
+        if url.startswith('postgresql+psycopg'):
+            options['connect_args'] = {
+                'connect_timeout': self.DB_CONNECT_TIMEOUT,
+                'prepare_threshold': self.DB_PREPARE_THRESHOLD,
+            }
+        return options
+
 
 settings = Settings()
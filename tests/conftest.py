@@ -8,18 +8,29 @@ from fastapi.testclient import TestClient
 from sqlalchemy import StaticPool, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
-from database import get_session
-from main import app
+from database import get_read_session, get_session
+from main import create_app
 from models.base import Base
 from models.forum_group_model import ForumGroup
 from models.forum_message_model import ForumMessage
 from models.forum_participant_model import ForumParticipant
 from models.media_comment_model import MediaComment
-from models.media_model import Media
+from models.media_model import Genre, Media
+from models.user_list_model import ListType, UserList
 from models.user_model import User
 from security import get_password_hash
+from services.cache import MemoryBackend, cache
+from services.feed import pull_accounts
+from services.identity_cache import identity_cache
+from services.leaderboard import leaderboard
+from services.media_catalog import media_catalog
+from services.media_sampler import media_sampler
+from services.title_index import title_index
 from settings import Settings
 
+# o aquecimento da subida usaria o banco de DATABASE_URL, e não o banco em memória de cada teste
+app = create_app(Settings(STARTUP_WARMUP=False))
+
 
 @pytest.fixture
 def client(session):
@@ -33,11 +44,27 @@ def client(session):
 
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_read_session] = get_session_override
         yield client
 
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def reset_in_memory_indexes():
+    """
+    Os índices em memória são globais do processo; como cada teste usa um banco novo,
+    eles são descartados para não carregar dados de testes anteriores.
+    """
+    media_sampler.invalidate()
+    title_index.invalidate()
+    leaderboard.invalidate()
+    media_catalog.invalidate()
+    identity_cache.clear()
+    cache.use(MemoryBackend())
+    pull_accounts.invalidate()
+
+
 @pytest_asyncio.fixture
 async def session():
     """
@@ -99,6 +126,32 @@ def _mock_db_time(*, model, time=datetime(2025, 9, 4)):
     event.remove(model, 'before_insert', fake_time_hook)
 
 
+@pytest.fixture
+def count_queries(session):
+    return lambda: _count_queries(session.bind.sync_engine)
+
+
+@contextmanager
+def _count_queries(engine):
+    """
+    Registra todos os comandos SQL enviados ao banco enquanto o contexto estiver aberto.
+    Útil para garantir que um endpoint não volte a fazer mais consultas do que o esperado.
+
+    Args:
+        engine: engine síncrona do SQLAlchemy a ser monitorada
+    """
+    statements = []
+
+    def before_cursor_execute(statement, **kw):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute, named=True)
+
+    yield statements
+
+    event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
 # user
 @pytest_asyncio.fixture
 async def user(session: AsyncSession):
@@ -127,6 +180,18 @@ async def other_user(session):
     return user
 
 
+@pytest_asyncio.fixture
+async def user_lists(session: AsyncSession, user):
+    lists = [
+        UserList(user_id=user.id, name=ListType.WATCHED),
+        UserList(user_id=user.id, name=ListType.TO_WATCH),
+    ]
+    session.add_all(lists)
+    await session.commit()
+
+    return lists
+
+
 # forum
 @pytest_asyncio.fixture
 async def forum_group(session: AsyncSession):
@@ -171,6 +236,25 @@ async def media(session: AsyncSession):
     return media
 
 
+@pytest_asyncio.fixture
+async def genre_medias(session: AsyncSession):
+    """
+    Gênero 'Ação' com três filmes e uma série, com popularidades distintas.
+    """
+    medias = [
+        MediaFactory(media_type='filme', popularity=30.0),
+        MediaFactory(media_type='filme', popularity=20.0),
+        MediaFactory(media_type='filme', popularity=10.0),
+        MediaFactory(media_type='série', popularity=40.0),
+    ]
+    genre = Genre(id=28, name='Ação', medias=medias)
+
+    session.add(genre)
+    await session.commit()
+
+    return medias
+
+
 @pytest_asyncio.fixture
 async def media_comment(session: AsyncSession):
     media_comment = MediaCommentFactory()
@@ -5,7 +5,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from models.media_model import Media, MediaComment
+from models.media_comment_model import MediaComment
+from models.media_model import Media
 
 
 @pytest.mark.asyncio
@@ -34,7 +35,8 @@ async def test_create_media_comment(session: AsyncSession, mock_db_time, user):
         select(Media)
         .options(
             selectinload(Media.genres),
-            selectinload(Media.comments)
+            selectinload(Media.comments),
+            selectinload(Media.reviews),
         )
         .where(Media.id == 1)
     )
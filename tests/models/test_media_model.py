@@ -30,7 +30,11 @@ async def test_create_media(session: AsyncSession, mock_db_time):
     session.add(media)
     await session.commit()
 
-    created_media = await session.scalar(select(Media).options(selectinload(Media.genres)).where(Media.id == 1))
+    created_media = await session.scalar(
+        select(Media)
+        .options(selectinload(Media.genres), selectinload(Media.comments), selectinload(Media.reviews))
+        .where(Media.id == 1)
+    )
 
     assert asdict(created_media) == {
         'id': 1,
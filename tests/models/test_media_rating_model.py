@@ -0,0 +1,29 @@
+from dataclasses import asdict
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from controllers.media_rating_controller import apply_score, get_media_rating
+
+
+@pytest.mark.asyncio
+async def test_apply_score_creates_and_updates_rating(session: AsyncSession, media):
+    await apply_score(media.id, 4, session)
+    await apply_score(media.id, 2, session)
+    await apply_score(media.id, 5, session, old_score=2)
+    await session.commit()
+
+    rating = await get_media_rating(media.id, session)
+    await session.refresh(rating)
+
+    assert asdict(rating) == {
+        'media_id': media.id,
+        'score_sum': 9,
+        'score_count': 2,
+        'score_1': 0,
+        'score_2': 0,
+        'score_3': 0,
+        'score_4': 1,
+        'score_5': 1,
+    }
+    assert rating.average_score == (4 + 5) / 2
@@ -0,0 +1,46 @@
+from datetime import datetime
+from http import HTTPStatus
+
+from models.media_comment_model import MediaComment
+
+
+def test_feed_lists_activity_of_followed_users(client, token, other_user, media, mock_db_time):
+    other_token = client.post(
+        '/auth/token', data={'username': other_user.email, 'password': other_user.clean_password}
+    ).json()['access_token']
+
+    response = client.post(f'/relationship/{other_user.id}/follow', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == HTTPStatus.OK
+
+    for day, content in enumerate(('um', 'dois'), start=1):
+        with mock_db_time(model=MediaComment, time=datetime(2025, 9, day)):
+            client.post(
+                f'/medias/{media.id}/comment',
+                json={'content': content},
+                headers={'Authorization': f'Bearer {other_token}'},
+            )
+
+    response = client.get('/relationship/feed', params={'limit': 1}, headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == HTTPStatus.OK
+    [first] = response.json()['activities']
+    assert first['kind'] == 'comment'
+    assert first['user_id'] == other_user.id
+    assert first['content'] == 'dois'
+
+    response = client.get(
+        '/relationship/feed',
+        params={'limit': 1, 'cursor': response.json()['next_cursor']},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    [second] = response.json()['activities']
+    assert second['content'] == 'um'
+    assert response.json()['next_cursor'] is None
+
+
+def test_feed_invalid_cursor(client, token):
+    response = client.get(
+        '/relationship/feed', params={'cursor': 'nao-e-cursor'}, headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Opa! Cursor inválido.'}
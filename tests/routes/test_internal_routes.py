@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import database
+from main import create_app
+from settings import Settings
+
+
+@pytest.fixture
+def internal_token(client, monkeypatch):
+    monkeypatch.setattr(client.app.state.settings, 'INTERNAL_TOKEN', 'segredo')
+    return 'segredo'
+
+
+def test_pool_status(client, internal_token):
+    response = client.get('/internal/pool', headers={'X-Internal-Token': internal_token})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['pool']
+    assert response.json()['replicas'] == []
+
+
+def test_pool_status_includes_replicas(client, internal_token, monkeypatch):
+    replica = create_async_engine('sqlite+aiosqlite://', poolclass=database.InstrumentedQueuePool, pool_size=3)
+    monkeypatch.setattr(database, 'read_engines', [replica])
+
+    response = client.get('/internal/pool', headers={'X-Internal-Token': internal_token})
+
+    assert response.status_code == HTTPStatus.OK
+    [stats] = response.json()['replicas']
+    assert stats['pool'] == 'InstrumentedQueuePool'
+    assert stats['size'] == 3  # noqa: PLR2004
+
+
+def test_pool_status_wrong_token(client, internal_token):
+    response = client.get('/internal/pool', headers={'X-Internal-Token': 'errado'})
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_pool_status_disabled(client):
+    response = client.get('/internal/pool', headers={'X-Internal-Token': 'qualquer'})
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_pool_status_uses_app_settings():
+    client = TestClient(create_app(Settings(STARTUP_WARMUP=False, INTERNAL_TOKEN='outro')))
+
+    response = client.get('/internal/pool', headers={'X-Internal-Token': 'outro'})
+
+    assert response.status_code == HTTPStatus.OK
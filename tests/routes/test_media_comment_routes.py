@@ -1,5 +1,11 @@
+from datetime import datetime
 from http import HTTPStatus
 
+import pytest
+
+from models.media_comment_model import MediaComment
+from pagination import encode_cursor
+
 
 def test_create_comment_in_media_not_found(client, token):
     response = client.post(
@@ -72,3 +78,83 @@ def test_delete_comment_media_not_found(client, token, media_comment):
 
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json() == {'detail': 'Título não encontrado no WatchHive.'}
+
+
+def test_read_comments_paginated(client, token, mock_db_time, media):
+    for i in range(5):
+        with mock_db_time(model=MediaComment, time=datetime(2025, 9, 1 + i)):
+            client.post(
+                f'/medias/{media.id}/comment',
+                json={'content': f'comentário {i}'},
+                headers={'Authorization': f'Bearer {token}'}
+            )
+
+    response = client.get(
+        f'/medias/{media.id}/comments',
+        params={'limit': 2},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert [c['id'] for c in response.json()['comments']] == [5, 4]
+
+    seen = [5, 4]
+    cursor = response.json()['next_cursor']
+    while cursor:
+        response = client.get(
+            f'/medias/{media.id}/comments',
+            params={'limit': 2, 'cursor': cursor},
+            headers={'Authorization': f'Bearer {token}'}
+        )
+        seen += [c['id'] for c in response.json()['comments']]
+        cursor = response.json()['next_cursor']
+
+    assert seen == [5, 4, 3, 2, 1]
+
+
+def test_read_comments_paginated_same_second(client, token, media):
+    # sem mock_db_time: os comentários ficam com a data gravada pelo próprio app, quase todos no mesmo segundo
+    for i in range(5):
+        client.post(
+            f'/medias/{media.id}/comment',
+            json={'content': f'comentário {i}'},
+            headers={'Authorization': f'Bearer {token}'}
+        )
+
+    seen = []
+    params = {'limit': 2}
+    for _ in range(5):
+        response = client.get(
+            f'/medias/{media.id}/comments',
+            params=params,
+            headers={'Authorization': f'Bearer {token}'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        seen += [c['id'] for c in response.json()['comments']]
+        params['cursor'] = response.json()['next_cursor']
+        if not params['cursor']:
+            break
+
+    assert seen == [5, 4, 3, 2, 1]
+
+
+@pytest.mark.parametrize('cursor', [
+    'nao-e-um-cursor',
+    encode_cursor('2024-01-01T00:00:00', 'x'),
+    encode_cursor('2024-01-01T00:00:00', None),
+])
+def test_read_comments_invalid_cursor(client, token, media, cursor):
+    response = client.get(
+        f'/medias/{media.id}/comments',
+        params={'cursor': cursor},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Opa! Cursor inválido.'}
+
+
+def test_read_comments_media_not_found(client, token):
+    response = client.get('/medias/1/comments', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Título não encontrado no WatchHive.'}
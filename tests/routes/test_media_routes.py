@@ -1,5 +1,11 @@
 from http import HTTPStatus
 
+import pytest
+
+from pagination import encode_cursor
+from security import get_current_user
+from services.media_catalog import media_catalog
+
 
 def test_read_media_not_found(client, token):
     response = client.get(
@@ -26,8 +32,242 @@ def test_read_media(client, user, token, media):
         "adult": media.adult,
         "genres": [],
         "comments": [],
+        "comments_count": 0,
         "average_score": 0.0,
         "user_review": None,
         "vote_count": 0,
         "to_watch_list": False
     }
+
+
+def test_read_media_conditional_get(client, token, media):
+    headers = {'Authorization': f'Bearer {token}'}
+    response = client.get(f'/medias/{media.id}', headers=headers)
+
+    etag = response.headers['etag']
+    assert response.headers['cache-control'] == 'private, no-cache'
+
+    response = client.get(f'/medias/{media.id}', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b''
+
+    # a mídia mudou para o usuário (comentou): nova versão
+    client.post(f'/medias/{media.id}/comment', json={'content': 'bom'}, headers=headers)
+    response = client.get(f'/medias/{media.id}', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['etag'] != etag
+
+
+@pytest.mark.usefixtures('user_lists')
+def test_read_media_query_count(client, user, token, media, count_queries):
+    client.post(f'/medias/{media.id}/comment', json={'content': 'bom'}, headers={'Authorization': f'Bearer {token}'})
+    client.post(f'/medias/{media.id}/review', json={'score': 4}, headers={'Authorization': f'Bearer {token}'})
+
+    # autenticação fora da contagem: apenas as consultas da rota são medidas
+    client.app.dependency_overrides[get_current_user] = lambda: user
+
+    with count_queries() as statements:
+        response = client.get(f'/medias/{media.id}', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert (response.json()['user_review'], len(response.json()['comments'])) == (4, 1)
+
+    assert len(statements) == 1
+
+
+def test_read_media_embeds_only_latest_comments(client, token, media):
+    total = 12
+    for i in range(total):
+        client.post(
+            f'/medias/{media.id}/comment',
+            json={'content': f'comentário {i}'},
+            headers={'Authorization': f'Bearer {token}'}
+        )
+
+    response = client.get(f'/medias/{media.id}', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.OK
+    # os 10 mais recentes, do mais novo para o mais antigo
+    assert [c['id'] for c in response.json()['comments']] == list(range(total, total - 10, -1))
+    assert response.json()['comments_count'] == total
+
+
+def test_random_medias(client, token, genre_medias):
+    response = client.get(
+        '/medias/random',
+        params={'genre_id': 28, 'movie': True},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert sorted(m['id'] for m in response.json()['medias']) == sorted(
+        m.id for m in genre_medias if m.media_type == 'filme'
+    )
+
+
+def test_random_medias_empty_genre(client, token, genre_medias):
+    response = client.get(
+        '/medias/random',
+        params={'genre_id': 12, 'movie': True},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'medias': []}
+
+
+def test_search_medias_by_title_and_original_title(client, token, session, genre_medias):
+    genre_medias[0].title = 'O Poderoso Chefão'
+    genre_medias[0].original_title = 'The Godfather'
+    genre_medias[1].title = 'Chefe de Cozinha'
+    genre_medias[1].original_title = 'Chef'
+
+    response = client.get(
+        '/medias/search',
+        params={'term': 'godfather'},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+    assert [m['id'] for m in response.json()['medias']] == [genre_medias[0].id]
+
+    response = client.get(
+        '/medias/search',
+        params={'term': 'che'},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+    # títulos que começam com o termo vêm primeiro
+    assert [m['id'] for m in response.json()['medias']] == [genre_medias[1].id, genre_medias[0].id]
+
+
+def test_search_medias_escapes_wildcards(client, token, genre_medias):
+    response = client.get(
+        '/medias/search',
+        params={'term': '%'},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'medias': []}
+
+
+def test_suggest_medias(client, token, genre_medias):
+    genre_medias[0].title = 'O Poderoso Chefão'
+    genre_medias[0].original_title = 'The Godfather'
+    genre_medias[3].title = 'Godzilla'
+
+    response = client.get(
+        '/medias/suggest',
+        params={'term': 'GOD'},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    # ordenado por popularidade
+    assert [m['title'] for m in response.json()['medias']] == ['Godzilla', 'O Poderoso Chefão']
+
+    response = client.get(
+        '/medias/suggest',
+        params={'term': 'chefao'},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+    assert [m['id'] for m in response.json()['medias']] == [genre_medias[0].id]
+
+
+def test_show_medias_by_genre_with_cursor(client, token, genre_medias):
+    response = client.get(
+        '/medias/show',
+        params={'genre_id': 28, 'movie': True, 'limit': 2},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [m['id'] for m in response.json()['medias']] == [genre_medias[0].id, genre_medias[1].id]
+
+    response = client.get(
+        '/medias/show',
+        params={'genre_id': 28, 'movie': True, 'limit': 2, 'cursor': response.json()['next_cursor']},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert [m['id'] for m in response.json()['medias']] == [genre_medias[2].id]
+    assert response.json()['next_cursor'] is None
+
+
+def test_show_medias_by_genre_is_cacheable(client, token, genre_medias):
+    headers = {'Authorization': f'Bearer {token}'}
+    params = {'genre_id': 28, 'movie': True}
+    response = client.get('/medias/show', params=params, headers=headers)
+    etag = response.headers['etag']
+
+    # a rota exige Authorization: nenhum cache compartilhado pode guardar a resposta
+    assert response.headers['cache-control'].startswith('private, max-age=')
+    assert 'Authorization' in response.headers['vary']
+
+    response = client.get('/medias/show', params=params, headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    # título alterado: a versão do catálogo muda e a página é reenviada
+    media_catalog.upsert(genre_medias[0].id, 'Outro título', None, 'filme', genre_medias[0].popularity)
+    response = client.get('/medias/show', params=params, headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['medias'][0]['title'] == 'Outro título'
+
+
+@pytest.mark.parametrize('cursor', ['abc', encode_cursor(10.0, 'x'), encode_cursor('x', 1), encode_cursor(True, 1)])
+def test_show_medias_by_genre_invalid_cursor(client, token, genre_medias, cursor):
+    response = client.get(
+        '/medias/show',
+        params={'genre_id': 28, 'movie': True, 'cursor': cursor},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Opa! Cursor inválido.'}
+
+
+def test_list_genres(client, token, genre_medias):
+    response = client.get('/medias/genres', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'genres': [{'id': 28, 'name': 'Ação'}]}
+
+
+def test_recommendations_from_review_history(client, user_lists, token, genre_medias, media):
+    for item, vote_average in zip(genre_medias, [8.0, 6.0, 7.0, 9.0]):
+        item.vote_average, item.vote_count = vote_average, 100
+    media.vote_average, media.vote_count = 10.0, 100  # sem gênero em comum
+
+    client.post(
+        f'/medias/{genre_medias[0].id}/review', json={'score': 5}, headers={'Authorization': f'Bearer {token}'}
+    )
+
+    response = client.get('/medias/recommendations', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.OK
+    # mesmo gênero, ordenados pela nota; sem a mídia já avaliada
+    assert [m['id'] for m in response.json()['medias']] == [
+        genre_medias[3].id, genre_medias[2].id, genre_medias[1].id
+    ]
+
+
+def test_recommendations_without_history(client, token, genre_medias):
+    for item, vote_average in zip(genre_medias, [8.0, 6.0, 7.0, 9.0]):
+        item.vote_average, item.vote_count = vote_average, 100
+
+    response = client.get('/medias/recommendations', headers={'Authorization': f'Bearer {token}'})
+
+    assert [m['id'] for m in response.json()['medias']] == [
+        genre_medias[3].id, genre_medias[0].id, genre_medias[2].id, genre_medias[1].id
+    ]
+
+
+def test_similar_medias_not_computed(client, token, media):
+    response = client.get(f'/medias/{media.id}/similar', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'medias': []}
+
+
+def test_similar_medias_not_found(client, token):
+    response = client.get('/medias/999/similar', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,117 @@
+from http import HTTPStatus
+
+
+def test_create_review(client, user, user_lists, token, media):
+    response = client.post(
+        f'/medias/{media.id}/review',
+        json={'score': 4},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json() == {
+        'id': 1,
+        'media_id': media.id,
+        'user_id': user.id,
+        'score': 4,
+    }
+
+
+def test_create_review_updates_media_rating(client, user_lists, token, media):
+    client.post(f'/medias/{media.id}/review', json={'score': 4}, headers={'Authorization': f'Bearer {token}'})
+
+    response = client.get(f'/medias/{media.id}', headers={'Authorization': f'Bearer {token}'})
+
+    assert {k: response.json()[k] for k in ('average_score', 'vote_count', 'user_review')} == {
+        'average_score': 4.0,
+        'vote_count': 1,
+        'user_review': 4,
+    }
+
+
+def test_update_review_updates_media_rating(client, user_lists, token, media):
+    client.post(f'/medias/{media.id}/review', json={'score': 2}, headers={'Authorization': f'Bearer {token}'})
+
+    response = client.put(
+        f'/medias/{media.id}/review',
+        json={'score': 5},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.get(f'/medias/{media.id}', headers={'Authorization': f'Bearer {token}'})
+
+    assert {k: response.json()[k] for k in ('average_score', 'vote_count')} == {
+        'average_score': 5.0,
+        'vote_count': 1,
+    }
+
+
+def test_create_review_twice(client, user_lists, token, media):
+    client.post(f'/medias/{media.id}/review', json={'score': 2}, headers={'Authorization': f'Bearer {token}'})
+
+    response = client.post(
+        f'/medias/{media.id}/review',
+        json={'score': 3},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': 'Opa! Usuário já avaliou está mídia.'}
+
+
+def test_best_rated_uses_media_rating(client, user_lists, token, media):
+    client.post(f'/medias/{media.id}/review', json={'score': 5}, headers={'Authorization': f'Bearer {token}'})
+
+    response = client.get('/medias/best-rated', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert [m['id'] for m in response.json()['medias']] == [media.id]
+
+
+def test_best_rated_single_vote_does_not_top_the_chart(client, user_lists, token, genre_medias):
+    # muitos votos bons no TMDB x nenhum voto
+    genre_medias[0].vote_average, genre_medias[0].vote_count = 8.0, 1000
+    genre_medias[1].vote_average, genre_medias[1].vote_count = 0.0, 0
+    genre_medias[2].vote_average, genre_medias[2].vote_count = 4.0, 1000
+    genre_medias[3].vote_average, genre_medias[3].vote_count = 7.0, 1000
+
+    # carrega o ranking antes, para testar a atualização incremental
+    client.get('/medias/best-rated', headers={'Authorization': f'Bearer {token}'})
+
+    client.post(
+        f'/medias/{genre_medias[1].id}/review', json={'score': 5}, headers={'Authorization': f'Bearer {token}'}
+    )
+
+    response = client.get('/medias/best-rated', headers={'Authorization': f'Bearer {token}'})
+    assert [m['id'] for m in response.json()['medias']] == [
+        genre_medias[0].id, genre_medias[3].id, genre_medias[1].id, genre_medias[2].id
+    ]
+
+    response = client.get(
+        '/medias/best-rated',
+        params={'genre_id': 28, 'movie': True, 'limit': 2},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+    assert [m['id'] for m in response.json()['medias']] == [genre_medias[0].id, genre_medias[1].id]
+
+
+def test_create_review_media_not_found(client, user_lists, token):
+    response = client.post('/medias/999/review', json={'score': 4}, headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Título não encontrado no WatchHive.'}
+
+
+def test_create_review_statements(client, user_lists, token, genre_medias, count_queries):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post(f'/medias/{genre_medias[0].id}/review', json={'score': 4}, headers=headers)
+
+    with count_queries() as statements:
+        response = client.post(f'/medias/{genre_medias[1].id}/review', json={'score': 3}, headers=headers)
+
+    assert response.status_code == HTTPStatus.CREATED
+    # avaliação, agregado da mídia, lista de assistidos, totais do usuário e linhas do tempo
+    assert [statement.split()[2] for statement in statements] == [
+        'review', 'media_rating', 'user_list_media', 'user_stats', 'feed_entry'
+    ]
@@ -63,6 +63,31 @@ def test_read_users(client, user, token):
 #     }
 
 
+def test_public_profile_is_cached_until_user_comments(client, token, other_user, media, count_queries):
+    response = client.get(f'/users/{other_user.id}', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['total_comments'] == 0
+
+    with count_queries() as statements:
+        client.get(f'/users/{other_user.id}', headers={'Authorization': f'Bearer {token}'})
+    # do cache: só a consulta de "segue ou não" (e a do usuário logado) chegam ao banco
+    assert not any('count(' in statement for statement in statements)
+
+    other_token = client.post(
+        '/auth/token',
+        data={'username': other_user.email, 'password': other_user.clean_password},
+    ).json()['access_token']
+    client.post(
+        f'/medias/{media.id}/comment',
+        json={'content': 'muito bom'},
+        headers={'Authorization': f'Bearer {other_token}'},
+    )
+
+    response = client.get(f'/users/{other_user.id}', headers={'Authorization': f'Bearer {token}'})
+    assert response.json()['total_comments'] == 1
+    assert response.json()['latest_comments'][0]['content'] == 'muito bom'
+
+
 def test_delete_user_forbidden(client, token, other_user):
     response = client.delete(
         f'/users/{other_user.id}',
@@ -146,3 +171,28 @@ def test_delete_user(client, user, token):
 #     assert response_update.json() == {
 #         'detail': 'Opa! Username ou Email já existe.'
 #     }
+
+
+def test_public_profile_counts_follows_and_comments(client, user, token, other_user, media):
+    headers = {'Authorization': f'Bearer {token}'}
+    totals = ('total_comments', 'total_followers', 'total_following')
+
+    response = client.get(f'/users/{other_user.id}', headers=headers)
+    assert {k: response.json()[k] for k in totals} == {'total_comments': 0, 'total_followers': 0, 'total_following': 0}
+
+    client.post(f'/relationship/{other_user.id}/follow', headers=headers)
+    comment_id = client.post(f'/medias/{media.id}/comment', json={'content': 'oi'}, headers=headers).json()['id']
+
+    response = client.get(f'/users/{other_user.id}', headers=headers)
+    assert response.json()['total_followers'] == 1
+    assert response.json()['following'] is True
+    response = client.get(f'/users/{user.id}', headers=headers)
+    assert {k: response.json()[k] for k in totals} == {'total_comments': 1, 'total_followers': 0, 'total_following': 1}
+
+    client.delete(f'/medias/{media.id}/comment/{comment_id}', headers=headers)
+    client.delete(f'/relationship/{other_user.id}/unfollow', headers=headers)
+
+    response = client.get(f'/users/{user.id}', headers=headers)
+    assert {k: response.json()[k] for k in totals} == {'total_comments': 0, 'total_followers': 0, 'total_following': 0}
+    response = client.get(f'/users/{other_user.id}', headers=headers)
+    assert response.json()['total_followers'] == 0
@@ -0,0 +1,265 @@
+import asyncio
+import fnmatch
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from services.cache import Cache, MemoryBackend, RedisBackend, SharedMemoryBackend
+
+
+@pytest_asyncio.fixture
+async def redis_url():
+    """
+    Servidor em processo que fala o subconjunto do protocolo do Redis (RESP) usado pelo
+    RedisBackend, para os testes não dependerem de um Redis de verdade.
+    """
+    data: dict[bytes, tuple[bytes, float | None]] = {}
+
+    def alive(key):
+        value, expires_at = data.get(key, (None, None))
+        if value is not None and expires_at is not None and expires_at <= time.monotonic():
+            del data[key]
+            return None
+        return value
+
+    def bulk(value):
+        return b'_\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+
+    def array(items):
+        return b'*%d\r\n' % len(items) + b''.join(items)
+
+    def execute(command, *args):  # noqa: PLR0911
+        command = command.upper()
+        if command == b'GET':
+            return bulk(alive(args[0]))
+        if command == b'SET':
+            key, value, *options = args
+            options = [option.upper() for option in options]
+            if b'NX' in options and alive(key) is not None:
+                return bulk(None)
+            expires_at = None
+            if b'PX' in options:
+                expires_at = time.monotonic() + int(options[options.index(b'PX') + 1]) / 1000
+            data[key] = (value, expires_at)
+            return b'+OK\r\n'
+        if command == b'DEL':
+            return b':%d\r\n' % sum(data.pop(key, None) is not None for key in args)
+        if command == b'SCAN':
+            pattern = args[args.index(b'MATCH') + 1].decode() if b'MATCH' in args else '*'
+            keys = [key for key in list(data) if alive(key) is not None and fnmatch.fnmatch(key.decode(), pattern)]
+            return array([bulk(b'0'), array([bulk(key) for key in keys])])
+        if command == b'HELLO':  # o redis-py negocia o RESP3
+            return b'%1\r\n' + bulk(b'proto') + b':3\r\n'
+        if command == b'PING':
+            return b'+PONG\r\n'
+        return b'+OK\r\n'  # CLIENT SETINFO, SELECT...
+
+    async def handle(reader, writer):
+        while header := await reader.readline():
+            args = []
+            for _ in range(int(header[1:])):
+                size = int((await reader.readline())[1:])
+                args.append((await reader.readexactly(size + 2))[:-2])
+            writer.write(execute(*args))
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    host, port = server.sockets[0].getsockname()
+    yield f'redis://{host}:{port}/0'
+    server.close()
+
+
+@pytest_asyncio.fixture(params=['memory', 'shm', 'redis'])
+async def backend(request, tmp_path, redis_url):
+    if request.param == 'memory':
+        backend = MemoryBackend()
+    elif request.param == 'shm':
+        backend = SharedMemoryBackend(str(tmp_path / 'cache'), slots=64, slot_size=256)
+    else:
+        backend = RedisBackend(redis_url)
+
+    yield backend
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_backend_get_set_delete(backend):
+    assert await backend.get('a') is None
+
+    await backend.set('a', b'1', ttl=60)
+    await backend.set('b', b'2', ttl=60)
+    assert await backend.get('a') == b'1'
+
+    assert not await backend.add('a', b'3', ttl=60)
+    assert await backend.add('c', b'3', ttl=60)
+
+    await backend.delete('a')
+    assert await backend.get('a') is None
+    assert await backend.get('b') == b'2'
+
+    await backend.clear()
+    assert await backend.get('b') is None
+    assert await backend.get('c') is None
+
+
+@pytest.mark.asyncio
+async def test_backend_expiration(backend):
+    await backend.set('a', b'1', ttl=0.05)
+    await asyncio.sleep(0.1)
+
+    assert await backend.get('a') is None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2)
+    await backend.set('a', b'1', ttl=60)
+    await backend.set('b', b'2', ttl=60)
+    await backend.get('a')
+    await backend.set('c', b'3', ttl=60)
+
+    assert await backend.get('b') is None
+    assert await backend.get('a') == b'1'
+
+
+@pytest.mark.asyncio
+async def test_shared_memory_backend_is_shared_between_instances(tmp_path):
+    # cada worker abre o mesmo arquivo; o segundo não apaga o que o primeiro gravou
+    first = SharedMemoryBackend(str(tmp_path / 'cache'), slots=64, slot_size=256)
+    await first.set('a', b'1', ttl=60)
+    second = SharedMemoryBackend(str(tmp_path / 'cache'), slots=64, slot_size=256)
+
+    assert await second.get('a') == b'1'
+
+    await second.delete('a')
+    assert await first.get('a') is None
+
+    # não cabe no slot: não é guardado
+    await first.set('big', b'x' * 256, ttl=60)
+    assert await second.get('big') is None
+
+    await first.close()
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_memory_backend_other_size_uses_other_file(tmp_path):
+    # um worker com outra configuração não redimensiona o arquivo que os demais têm mapeado
+    first = SharedMemoryBackend(str(tmp_path / 'cache'), slots=64, slot_size=256)
+    await first.set('a', b'1', ttl=60)
+    second = SharedMemoryBackend(str(tmp_path / 'cache'), slots=32, slot_size=256)
+
+    assert second.path != first.path
+    assert Path(first.path).stat().st_size == 64 * 256
+    assert await first.get('a') == b'1'
+    assert await second.get('a') is None
+
+    await first.close()
+    await second.close()
+
+
+def test_shared_memory_backend_refuses_file_with_wrong_size(tmp_path):
+    path = tmp_path / 'cache'
+    (tmp_path / 'cache-64x256').write_bytes(b'x' * 100)
+
+    with pytest.raises(RuntimeError):
+        SharedMemoryBackend(str(path), slots=64, slot_size=256)
+
+    assert (tmp_path / 'cache-64x256').read_bytes() == b'x' * 100
+
+
+@pytest.mark.asyncio
+async def test_shared_memory_backend_waits_for_lock_without_blocking(tmp_path):
+    backend = SharedMemoryBackend(str(tmp_path / 'cache'), slots=64, slot_size=256)
+    await backend.set('a', b'1', ttl=60)
+    offset = (backend._hash('a') % backend.slots) * backend.slot_size
+
+    # outro worker segura o lock do slot de 'a' por 0,3s
+    holder = subprocess.Popen(
+        [
+            sys.executable, '-c',
+            'import fcntl, os, sys, time\n'
+            f'fd = os.open({backend.path!r}, os.O_RDWR)\n'
+            f'fcntl.lockf(fd, fcntl.LOCK_EX, 256, {offset})\n'
+            'print(flush=True)\n'
+            'time.sleep(0.3)\n',
+        ],
+        stdout=subprocess.PIPE,
+    )
+    holder.stdout.readline()
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    assert await backend.get('a') == b'1'
+    task.cancel()
+    holder.wait()
+
+    # o event loop continuou rodando enquanto o get esperava o lock
+    assert ticks > 5  # noqa: PLR2004
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_concurrent_misses(backend):
+    cache = Cache(backend)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {'ids': [1, 2, 3]}
+
+    values = await asyncio.gather(*(cache.get_or_load('key', loader, ttl=60) for _ in range(10)))
+
+    assert values == [{'ids': [1, 2, 3]}] * 10
+    assert len(calls) == 1
+    assert await cache.get('key') == {'ids': [1, 2, 3]}
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_across_workers(tmp_path):
+    # dois workers (cada um com o seu Cache) sobre o mesmo backend compartilhado
+    path = str(tmp_path / 'cache')
+    workers = [Cache(SharedMemoryBackend(path, slots=64, slot_size=256)) for _ in range(2)]
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return [1, 2]
+
+    values = await asyncio.gather(*(worker.get_or_load('key', loader, ttl=60) for worker in workers))
+
+    assert values == [[1, 2], [1, 2]]
+    assert len(calls) == 1
+
+    for worker in workers:
+        await worker.backend.close()
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_does_not_cache_errors():
+    cache = Cache(MemoryBackend())
+
+    async def failing():
+        raise RuntimeError('banco fora do ar')
+
+    async def loader():
+        return 'ok'
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load('key', failing, ttl=60)
+
+    assert await cache.get_or_load('key', loader, ttl=60) == 'ok'
@@ -0,0 +1,164 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from controllers.follows_controller import (
+    follow_user,
+    get_following_feed,
+    get_following_users_comments,
+    get_following_users_reviews,
+    unfollow_user,
+)
+from controllers.forum_group_controller import create_forum_group
+from controllers.media_comment_controller import create_media_comment, delete_media_comment
+from controllers.review_controller import create_review
+from models.feed_entry_model import ActivityKind, FeedEntry
+from models.forum_group_model import ForumGroup
+from models.media_comment_model import MediaComment
+from models.review_model import Review
+from models.user_list_model import ListType, UserList, UserListMedia
+from models.user_model import User
+from services import feed
+
+
+async def feed_size(session: AsyncSession, follower_id: int) -> int:
+    return await session.scalar(
+        select(func.count()).select_from(FeedEntry).where(FeedEntry.follower_id == follower_id)
+    )
+
+
+@pytest.mark.asyncio
+async def test_activity_is_pushed_to_followers(session: AsyncSession, user, user_lists, other_user, media):
+    await follow_user(other_user.id, user.id, session)
+
+    comment = await create_media_comment(media.id, 'que filme', user.id, session)
+    await create_review(media.id, user.id, 4, session)
+
+    assert await feed_size(session, other_user.id) == 2  # noqa: PLR2004
+    assert await feed_size(session, user.id) == 0
+
+    [row] = await get_following_users_comments(other_user.id, session)
+    assert row['content'] == 'que filme'
+    assert row['media_id'] == media.id
+    [row] = await get_following_users_reviews(other_user.id, session)
+    assert row['score'] == 4  # noqa: PLR2004
+
+    await delete_media_comment(media.id, comment.id, user.id, session)
+    assert await feed_size(session, other_user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_follow_backfills_and_unfollow_clears_timeline(session: AsyncSession, user, other_user, media):
+    await create_media_comment(media.id, 'antes de seguir', other_user.id, session)
+
+    await follow_user(user.id, other_user.id, session)
+    assert [row['content'] for row in await get_following_users_comments(user.id, session)] == ['antes de seguir']
+
+    await unfollow_user(user.id, other_user.id, session)
+    assert await feed_size(session, user.id) == 0
+    assert await get_following_users_comments(user.id, session) == []
+
+
+@pytest.mark.asyncio
+async def test_accounts_above_fanout_limit_are_pulled(session: AsyncSession, user, other_user, media, monkeypatch):
+    # com limite zero, qualquer conta seguida é lida na hora, sem fan-out
+    monkeypatch.setattr(feed, 'FANOUT_LIMIT', 0)
+
+    await follow_user(user.id, other_user.id, session)
+    feed.pull_accounts.invalidate()
+    await create_media_comment(media.id, 'muitos seguidores', other_user.id, session)
+
+    assert await feed_size(session, user.id) == 0
+    assert [row['content'] for row in await get_following_users_comments(user.id, session)] == ['muitos seguidores']
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('user_lists')
+async def test_unified_feed_merges_kinds_and_pages(session: AsyncSession, user, other_user, media, mock_db_time):
+    # tudo no mesmo instante: a ordem entre os tipos vem do desempate por (kind, id)
+    instant = datetime(2025, 9, 1)
+    with mock_db_time(model=MediaComment, time=instant):
+        await create_media_comment(media.id, 'que filme', user.id, session)
+    with mock_db_time(model=ForumGroup, time=instant):
+        await create_forum_group('Maratona', 'quem topa?', user.id, session)
+    await create_review(media.id, user.id, 5, session)  # também marca a mídia como assistida
+    await session.execute(update(Review).values(created_at=instant))
+    await session.execute(update(UserListMedia).values(added_at=instant))
+    await session.commit()
+
+    # a linha do tempo recebe as atividades (e as datas) ao começar a seguir
+    await follow_user(other_user.id, user.id, session)
+
+    page = await get_following_feed(other_user.id, session)
+    everything = page['activities']
+    assert [activity['kind'] for activity in everything] == [
+        ActivityKind.WATCHED,
+        ActivityKind.REVIEW,
+        ActivityKind.FORUM,
+        ActivityKind.COMMENT,
+    ]
+    assert page['next_cursor'] is None
+
+    paged, cursor = [], None
+    for _ in range(len(ActivityKind)):
+        page = await get_following_feed(other_user.id, session, limit=1, cursor=cursor)
+        paged += page['activities']
+        cursor = page['next_cursor']
+
+    assert cursor is None
+    assert paged == everything
+
+
+async def page_through_feed(session: AsyncSession, follower_id: int, limit: int, pages: int) -> list:
+    paged, cursor = [], None
+    for _ in range(pages):
+        page = await get_following_feed(follower_id, session, limit=limit, cursor=cursor)
+        paged += page['activities']
+        cursor = page['next_cursor']
+        if cursor is None:
+            return paged
+
+    raise AssertionError('o cursor do feed não chegou ao fim')
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('user_lists')
+async def test_unified_feed_pages_with_recorded_timestamps(session: AsyncSession, user, other_user, media):
+    # sem reescrever as datas: as atividades ficam com o horário gravado na criação, quase no mesmo instante
+    await create_media_comment(media.id, 'que filme', user.id, session)
+    await create_media_comment(media.id, 'de novo', user.id, session)
+    await create_forum_group('Maratona', 'quem topa?', user.id, session)
+    await create_review(media.id, user.id, 5, session)
+    await follow_user(other_user.id, user.id, session)
+
+    everything = (await get_following_feed(other_user.id, session))['activities']
+    assert len(everything) == 5  # noqa: PLR2004
+
+    assert await page_through_feed(session, other_user.id, limit=2, pages=5) == everything
+
+
+@pytest.mark.asyncio
+async def test_unified_feed_pages_watched_media_shared_by_followed_users(
+    session: AsyncSession, user, other_user, media
+):
+    # dois seguidos assistem a mesma mídia no mesmo instante: o id da atividade (o da mídia) empata
+    third_user = User(username='carol', password='secret', email='carol@test', avatar=1, name='carol')
+    session.add(third_user)
+    await session.flush()
+    session.add_all([
+        UserList(user_id=user.id, name=ListType.WATCHED),
+        UserList(user_id=third_user.id, name=ListType.WATCHED),
+    ])
+    await session.commit()
+
+    for followed in (user, third_user):
+        await create_review(media.id, followed.id, 5, session)
+        await follow_user(other_user.id, followed.id, session)
+    await session.execute(update(UserListMedia).values(added_at=datetime(2025, 9, 1)))
+    await session.commit()
+
+    paged = await page_through_feed(session, other_user.id, limit=1, pages=5)
+    watched = [activity['user_id'] for activity in paged if activity['kind'] == ActivityKind.WATCHED]
+    assert sorted(watched) == sorted([user.id, third_user.id])
@@ -0,0 +1,16 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.identity_cache import IdentityCache
+
+
+@pytest.mark.asyncio
+async def test_change_on_another_worker_discards_entry(session: AsyncSession, user):
+    worker, other_worker = IdentityCache(), IdentityCache()
+    worker.put(f'uid:{user.id}', user)
+
+    assert (await worker.get(f'uid:{user.id}', session)).id == user.id
+
+    await other_worker.invalidate_user(user.id)
+
+    assert await worker.get(f'uid:{user.id}', session) is None
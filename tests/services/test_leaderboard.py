@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from controllers.review_controller import create_review
+from services.leaderboard import Leaderboard
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('user_lists')
+async def test_score_recorded_by_another_worker_reloads_ranking(session: AsyncSession, user, genre_medias):
+    for item in genre_medias:
+        item.vote_average, item.vote_count = 6.0, 10
+    await session.commit()
+
+    # este worker não recebe a avaliação: ela passa pelo leaderboard global (o do outro worker)
+    worker = Leaderboard(sync_interval=0)
+    await worker.load(session)
+    before = worker.rating(genre_medias[0].id)
+
+    await worker.ensure_loaded(session)
+    assert worker.rating(genre_medias[0].id) == before
+
+    await create_review(genre_medias[0].id, user.id, 5, session)
+    await worker.ensure_loaded(session)
+
+    assert worker.rating(genre_medias[0].id) > before
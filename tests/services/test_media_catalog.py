@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.media_catalog import media_catalog
+
+
+@pytest.mark.asyncio
+async def test_media_catalog_loads_genres_and_summaries(session: AsyncSession, genre_medias):
+    await media_catalog.ensure_loaded(session)
+
+    assert media_catalog.genres() == [{'id': 28, 'name': 'Ação'}]
+
+    ids = [genre_medias[2].id, genre_medias[0].id]
+    summaries = await media_catalog.summaries(ids, session)
+
+    assert [summary.id for summary in summaries] == ids
+    assert summaries[0].title == genre_medias[2].title
+    assert summaries[0].media_type == 'filme'
+    assert summaries[0].popularity == 10.0  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_media_catalog_serves_from_memory(session: AsyncSession, genre_medias):
+    await media_catalog.ensure_loaded(session)
+
+    statements = []
+    event.listen(session.bind.sync_engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    summaries = await media_catalog.summaries([media.id for media in genre_medias], session)
+
+    assert len(summaries) == len(genre_medias)
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_media_catalog_updates_incrementally(session: AsyncSession, genre_medias):
+    await media_catalog.ensure_loaded(session)
+    version = media_catalog.version
+
+    genre_medias[1].title = 'Godzilla'
+    await session.commit()
+
+    [summary] = await media_catalog.summaries([genre_medias[1].id], session)
+    assert summary.title == 'Godzilla'
+    assert media_catalog.version > version
+
+    await session.delete(genre_medias[1])
+    await session.commit()
+
+    assert await media_catalog.summaries([genre_medias[1].id, 999], session) == []
+
+
+@pytest.mark.asyncio
+async def test_media_catalog_ignores_rolled_back_writes(session: AsyncSession, genre_medias):
+    await media_catalog.ensure_loaded(session)
+    media_id, title = genre_medias[1].id, genre_medias[1].title
+
+    genre_medias[1].title = 'Godzilla'
+    await session.flush()
+    await session.rollback()
+
+    [summary] = await media_catalog.summaries([media_id], session)
+    assert summary.title == title
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from controllers.media_controller import get_similar_medias
+from models.review_model import Review
+from services.media_neighbors import compute_neighbors, refresh_media_neighbors
+
+
+def test_compute_neighbors_combines_genres_and_ratings():
+    media_ids = np.array([1, 2, 3, 4])
+    popularity = np.array([10.0, 20.0, np.nan, 40.0])
+    # 1 e 2 são do mesmo gênero; 3 e 4 não têm gênero em comum com ninguém
+    genre_pairs = np.array([[1, 28], [2, 28], [3, 12], [4, 35]])
+    # quem gostou de 3 também gostou de 4
+    reviews = np.array([[1, 3, 5], [1, 4, 5], [1, 1, 1], [2, 3, 4], [2, 4, 5], [2, 2, 2]])
+
+    sources, targets, scores = compute_neighbors(media_ids, popularity, genre_pairs, reviews, k=1)
+
+    assert dict(zip(sources.tolist(), targets.tolist())) == {1: 2, 2: 1, 3: 4, 4: 3}
+    assert np.all(scores > 0)
+
+
+def test_compute_neighbors_single_media():
+    sources, _, _ = compute_neighbors(np.array([1]), np.array([1.0]), np.empty((0, 2)), np.empty((0, 3)))
+
+    assert len(sources) == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_media_neighbors(session: AsyncSession, user, genre_medias, media):
+    session.add(Review(user_id=user.id, media_id=genre_medias[0].id, score=5))
+    await session.commit()
+
+    total = await refresh_media_neighbors(session, k=2)
+
+    # a mídia sem gênero nem avaliações em comum não é vizinha de ninguém
+    assert total == len(genre_medias) * 2
+    similar = await get_similar_medias(genre_medias[0].id, limit=5, session=session)
+    # mesmo gênero: desempate pela popularidade
+    assert [m.id for m in similar] == [genre_medias[3].id, genre_medias[1].id]
+    assert await get_similar_medias(media.id, limit=5, session=session) == []
@@ -0,0 +1,21 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from controllers.review_controller import create_review
+from services.recommender import Recommender
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('user_lists')
+async def test_review_drops_recommendations_on_every_worker(session: AsyncSession, user, genre_medias):
+    for item, vote_average in zip(genre_medias, [8.0, 6.0, 7.0, 9.0]):
+        item.vote_average, item.vote_count = vote_average, 100
+    await session.commit()
+
+    # outro worker, com o seu próprio Recommender; a avaliação passa pelo recommender global
+    worker = Recommender()
+    assert genre_medias[3].id in [media['id'] for media in await worker.recommend(user.id, 4, session)]
+
+    await create_review(genre_medias[3].id, user.id, 5, session)
+
+    assert genre_medias[3].id not in [media['id'] for media in await worker.recommend(user.id, 4, session)]
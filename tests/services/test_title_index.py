@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.title_index import normalize_title, title_index
+
+
+def test_normalize_title():
+    assert normalize_title('Amélie: O Fabuloso Destino!') == 'amelie o fabuloso destino'
+
+
+@pytest.mark.asyncio
+async def test_title_index_updates_incrementally(session: AsyncSession, genre_medias):
+    await title_index.ensure_loaded(session)
+    assert title_index.suggest('godzilla') == []
+
+    genre_medias[1].title = 'Godzilla'
+    await session.commit()
+
+    assert title_index.suggest('godz') == [
+        {'id': genre_medias[1].id, 'title': 'Godzilla', 'poster_url': genre_medias[1].poster_url}
+    ]
+
+    await session.delete(genre_medias[1])
+    await session.commit()
+
+    assert title_index.suggest('godz') == []
+
+
+@pytest.mark.asyncio
+async def test_title_index_rename_leaves_old_prefixes(session: AsyncSession, genre_medias):
+    genre_medias[1].title = 'Alpha'
+    genre_medias[1].original_title = None
+    await session.commit()
+    await title_index.ensure_loaded(session)
+    assert [media['id'] for media in title_index.suggest('al')] == [genre_medias[1].id]
+
+    genre_medias[1].title = 'Beta'
+    await session.commit()
+
+    assert title_index.suggest('al') == []
+    assert [media['id'] for media in title_index.suggest('be')] == [genre_medias[1].id]
+
+
+@pytest.mark.asyncio
+async def test_title_index_ignores_rolled_back_writes(session: AsyncSession, genre_medias):
+    await title_index.ensure_loaded(session)
+
+    genre_medias[1].title = 'Godzilla'
+    await session.flush()
+    assert title_index.suggest('godz') == []
+
+    await session.rollback()
+
+    assert title_index.suggest('godz') == []
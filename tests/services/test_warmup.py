@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import main
+from main import create_app
+from services.leaderboard import leaderboard
+from services.media_sampler import media_sampler
+from services.title_index import title_index
+from services.warmup import preload_indexes, refresh_forever, stop_refreshers, warm_pool
+from settings import Settings
+
+
+@pytest.mark.asyncio
+async def test_preload_indexes(session: AsyncSession, genre_medias):
+    await warm_pool(session.bind, connections=2)
+    await preload_indexes(session.bind)
+
+    assert not leaderboard.is_stale
+    assert not title_index.is_stale
+    assert not media_sampler.is_stale
+
+
+class CountingIndex:
+    ttl = 0.01
+
+    def __init__(self):
+        self.loads = 0
+
+    async def load(self, session):
+        self.loads += 1
+
+
+@pytest.mark.asyncio
+async def test_refresher_reloads_before_ttl(session: AsyncSession):
+    index = CountingIndex()
+
+    tasks = [asyncio.create_task(refresh_forever(index, session.bind))]
+    await asyncio.sleep(0.05)
+    await stop_refreshers(tasks)
+
+    assert index.loads >= 2  # noqa: PLR2004
+    assert tasks[0].cancelled()
+
+
+def test_startup_survives_failed_warmup(monkeypatch, caplog):
+    async def warm_pool(engine, connections):
+        pass
+
+    async def failing_preload(engine):
+        raise RuntimeError('banco indisponível')
+
+    # a carga dos índices falha, mas o worker sobe
+    monkeypatch.setattr(main, 'warm_pool', warm_pool)
+    monkeypatch.setattr(main, 'preload_indexes', failing_preload)
+    app = create_app(Settings(STARTUP_WARMUP=True))
+
+    with TestClient(app) as client:
+        assert client.get('/').status_code == 200  # noqa: PLR2004
+
+    assert 'Falha ao aquecer o worker' in caplog.text
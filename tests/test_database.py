@@ -0,0 +1,82 @@
+import itertools
+import time
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.requests import Request
+
+import database
+from settings import Settings
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    database.init_engines()
+    replica = object()
+    monkeypatch.setattr(database, 'read_engines', [replica])
+    monkeypatch.setattr(database, '_next_read_engine', itertools.cycle([replica]))
+    return replica
+
+
+def _request(cookies: dict[str, str] | None = None, app_settings: Settings | None = None) -> Request:
+    app = FastAPI()
+    app.state.settings = app_settings or Settings()
+    cookie = '; '.join(f'{name}={value}' for name, value in (cookies or {}).items())
+    return Request({'type': 'http', 'app': app, 'headers': [(b'cookie', cookie.encode())]})
+
+
+def test_read_engine_without_replicas():
+    assert database.choose_read_engine(_request()) is database.engine
+
+
+def test_read_engine_uses_replica(replica):
+    assert database.choose_read_engine(_request()) is replica
+
+
+def test_read_engine_after_recent_write_uses_primary(replica):
+    request = _request({database.LAST_WRITE_COOKIE: str(time.time())})
+
+    assert database.choose_read_engine(request) is database.engine
+
+
+def test_read_engine_after_lag_window_uses_replica(replica, settings):
+    request = _request({database.LAST_WRITE_COOKIE: str(time.time() - settings.REPLICA_LAG_SECONDS - 1)})
+
+    assert database.choose_read_engine(request) is replica
+
+
+def test_read_engine_lag_window_comes_from_app_settings(replica):
+    request = _request({database.LAST_WRITE_COOKIE: str(time.time())}, Settings(REPLICA_LAG_SECONDS=0))
+
+    assert database.choose_read_engine(request) is replica
+
+
+def test_write_marks_last_write_cookie(client, token, media, replica):
+    response = client.post(
+        f'/medias/{media.id}/comment',
+        json={'content': 'pior parte do filme foi que acabou.'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert database.LAST_WRITE_COOKIE in response.cookies
+
+
+@pytest.mark.asyncio
+async def test_cache_loads_on_primary_when_reading_from_replica(monkeypatch):
+    database.init_engines()
+    replica = create_async_engine('sqlite+aiosqlite://')
+    monkeypatch.setattr(database, 'read_engines', [replica])
+
+    async def loader(session: AsyncSession):
+        return session
+
+    async with AsyncSession(replica) as session:
+        assert (await database.load_on_primary(session, loader)).bind is database.engine
+
+    async with AsyncSession(database.engine) as session:
+        assert await database.load_on_primary(session, loader) is session
+
+    await replica.dispose()
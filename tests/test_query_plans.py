@@ -0,0 +1,142 @@
+"""
+Planos de execução das consultas dos controllers: cada consulta dos feeds, do perfil, dos
+comentários e do fórum precisa chegar às tabelas grandes por um índice, e não varrendo a tabela.
+
+Os comandos SQL enviados pelos controllers são capturados e passados ao EXPLAIN do banco
+(EXPLAIN QUERY PLAN no SQLite; no Postgres, EXPLAIN com enable_seqscan desligado, para que
+as tabelas pequenas dos testes não escondam a falta de um índice).
+"""
+
+import json
+import re
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from controllers.follows_controller import follow_user, get_following_feed, unfollow_user
+from controllers.forum_group_controller import read_forum_group
+from controllers.forum_participant_controller import get_created_forums, get_participating_forums
+from controllers.media_comment_controller import create_media_comment, get_media_comments
+from controllers.media_controller import get_media
+from controllers.review_controller import existing_review
+from controllers.user_controller import get_public_user_profile
+from services import feed
+
+# tabelas que crescem com o uso e são filtradas pelos controllers
+HOT_TABLES = {
+    'feed_entry',
+    'follows',
+    'forum_group',
+    'forum_message',
+    'forum_participant',
+    'media_comment',
+    'review',
+    'user_list',
+    'user_list_media',
+}
+
+
+@asynccontextmanager
+async def capture_statements(session: AsyncSession):
+    statements = []
+
+    def before_cursor_execute(statement, parameters, executemany, **kw):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    engine = session.bind.sync_engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute, named=True)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+async def full_scans(session: AsyncSession, statement: str, parameters) -> list[str]:
+    """
+    Tabelas de HOT_TABLES lidas por inteiro no plano de `statement`: varredura da tabela ou de
+    um índice inteiro, ou índice temporário montado pelo SQLite na hora (AUTOMATIC INDEX).
+    """
+    conn = await session.connection()
+
+    if conn.dialect.name == 'sqlite':
+        result = await conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)
+        scans = []
+        for *_, detail in result:
+            match = re.match(r'(SCAN|SEARCH) (\w+)', detail)
+            if not match or re.sub(r'_\d+$', '', match[2]) not in HOT_TABLES:
+                continue
+            if match[1] == 'SCAN' or 'AUTOMATIC' in detail:
+                scans.append(detail)
+        return scans
+
+    await conn.exec_driver_sql('SET LOCAL enable_seqscan = off')
+    result = await conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters)
+    plan = result.scalar()
+    nodes = [(json.loads(plan) if isinstance(plan, str) else plan)[0]['Plan']]
+    scans = []
+    while nodes:
+        node = nodes.pop()
+        if node['Node Type'] == 'Seq Scan' and node['Relation Name'] in HOT_TABLES:
+            scans.append(f"Seq Scan on {node['Relation Name']}")
+        nodes.extend(node.get('Plans', []))
+    return scans
+
+
+async def assert_indexed(session: AsyncSession, statements: list):
+    assert statements
+    for statement, parameters in statements:
+        if statement.lstrip().upper().startswith(('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')):
+            assert await full_scans(session, statement, parameters) == [], statement
+
+
+@pytest.mark.asyncio
+async def test_feed_queries_use_indexes(session: AsyncSession, user, other_user, media, monkeypatch):
+    # a contagem de seguidores das contas sem fan-out percorre follows inteira de propósito
+    # (é recarregada a cada PullAccounts.ttl), então fica fora da verificação
+    await feed.pull_accounts.ensure_loaded(session)
+
+    async with capture_statements(session) as statements:
+        await create_media_comment(media.id, 'antes de seguir', user.id, session)
+        await follow_user(other_user.id, user.id, session)
+        await create_media_comment(media.id, 'depois de seguir', user.id, session)
+        await get_following_feed(other_user.id, session, limit=2)
+        page = await get_following_feed(other_user.id, session, limit=1)
+        await get_following_feed(other_user.id, session, limit=1, cursor=page['next_cursor'])
+        await unfollow_user(other_user.id, user.id, session)
+
+    await assert_indexed(session, statements)
+
+    # contas sem fan-out: as atividades são buscadas direto nas tabelas
+    monkeypatch.setattr(feed, 'FANOUT_LIMIT', 0)
+    await follow_user(other_user.id, user.id, session)
+    await feed.pull_accounts.load(session)
+
+    async with capture_statements(session) as statements:
+        await get_following_feed(other_user.id, session)
+
+    await assert_indexed(session, statements)
+
+
+@pytest.mark.asyncio
+async def test_profile_and_media_queries_use_indexes(session: AsyncSession, user, other_user, media_comment, media):
+    async with capture_statements(session) as statements:
+        await get_public_user_profile(session, user.id, other_user.id)
+        page = await get_media_comments(media.id, session, limit=1)
+        await get_media_comments(media.id, session, limit=1, cursor=page['next_cursor'])
+        await get_media(media.id, user.id, session)
+        await existing_review(user.id, media.id, session)
+
+    await assert_indexed(session, statements)
+
+
+@pytest.mark.asyncio
+async def test_forum_queries_use_indexes(session: AsyncSession, user, forum_group, forum_participant, forum_message):
+    async with capture_statements(session) as statements:
+        await read_forum_group(forum_group.id, session)
+        await get_created_forums(user.id, session)
+        await get_participating_forums(session, user.id)
+
+    await assert_indexed(session, statements)
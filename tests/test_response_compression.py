@@ -0,0 +1,67 @@
+import gzip
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from response_compression import CompressionMiddleware, choose_encoding
+
+ITEMS = [{'id': i, 'title': f'Mídia {i}', 'poster_url': f'https://image.tmdb.org/t/p/w500/{i}.jpg'} for i in range(50)]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=1000)
+
+    @app.get('/big')
+    def big():
+        return ORJSONResponse(ITEMS, headers={'ETag': '"abc"'})
+
+    @app.get('/small')
+    def small():
+        return {'id': 1}
+
+    @app.get('/stream')
+    def stream():
+        return StreamingResponse((f'{i}\n' for i in range(1000)), media_type='text/plain')
+
+    return TestClient(app)
+
+
+def test_choose_encoding():
+    assert choose_encoding('gzip, deflate, br, zstd') == 'zstd'
+    assert choose_encoding('gzip;q=1.0, br;q=0.5') == 'gzip'
+    assert choose_encoding('br;q=0, *') == 'zstd'
+    assert choose_encoding('identity') is None
+    assert choose_encoding('') is None
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'br', 'zstd'])
+def test_compresses_large_responses(client, encoding):
+    response = client.get('/big', headers={'Accept-Encoding': encoding})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-encoding'] == encoding
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert response.headers['etag'] == 'W/"abc"'
+    assert int(response.headers['content-length']) < len(response.content)
+    assert response.json() == ITEMS
+
+
+def test_skips_small_responses(client):
+    response = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'content-encoding' not in response.headers
+    assert response.json() == {'id': 1}
+
+
+def test_compresses_streaming_responses(client):
+    with client.stream('GET', '/stream', headers={'Accept-Encoding': 'gzip'}) as response:
+        raw = b''.join(response.iter_raw())
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'content-length' not in response.headers
+    assert gzip.decompress(raw) == ''.join(f'{i}\n' for i in range(1000)).encode()
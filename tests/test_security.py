@@ -48,3 +48,34 @@ def test_get_current_user_does_not_exists(client):
 
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert response.json() == {'detail': 'Não foi possível validar credenciais.'}
+
+
+def test_get_current_user_is_cached(client, user, count_queries):
+    token = create_access_token({'sub': user.email})
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.get('/users/me', headers=headers)
+
+    with count_queries() as statements:
+        response = client.get('/users/me', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    # só as consultas da própria rota (por id); o usuário do token veio do cache
+    assert not [statement for statement in statements if 'user.email =' in statement]
+
+
+def test_get_current_user_subject_email_must_match(client, user):
+    token = create_access_token({'sub': 'outro@test.com', 'uid': user.id})
+
+    response = client.get('/users/me', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_get_current_user_cache_invalidated_on_delete(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.delete(f'/users/{user.id}', headers=headers)
+    response = client.get('/users/me', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
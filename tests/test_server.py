@@ -0,0 +1,21 @@
+from server import available_cpus, worker_count
+
+
+def test_available_cpus_respects_cgroup_quota(tmp_path):
+    cpu_max = tmp_path / 'cpu.max'
+    cpu_max.write_text('100000 100000\n')
+
+    assert available_cpus(str(cpu_max)) == 1
+
+
+def test_available_cpus_without_quota(tmp_path):
+    cpu_max = tmp_path / 'cpu.max'
+    cpu_max.write_text('max 100000\n')
+
+    assert available_cpus(str(cpu_max)) == available_cpus(str(tmp_path / 'inexistente'))
+
+
+def test_worker_count_from_settings(monkeypatch):
+    monkeypatch.setattr('server.settings.WEB_WORKERS', 3)
+
+    assert worker_count() == 3  # noqa: PLR2004
@@ -0,0 +1,30 @@
+from benchmarks.profile_startup import import_times
+
+# `import main` (o que o uvicorn faz ao subir cada worker) comparado ao import só do framework
+# (FastAPI + SQLAlchemy async), medido na mesma máquina: a razão não depende da velocidade do CI.
+# Hoje fica entre 1,3x e 1,7x; o limite só pega regressões grandes, não a variação entre execuções
+BASELINE_MODULES = 'fastapi, sqlalchemy.ext.asyncio'
+STARTUP_BUDGET_RATIO = 2.5
+RUNS = 2
+# dependências pesadas que só o servidor, scripts e jobs em lote usam
+NOT_AT_STARTUP = {'uvicorn', 'numpy', 'scipy', 'redis', 'factory', 'faker'}
+
+
+def total_import_ms(rows) -> float:
+    return sum(self_us for _, self_us, _ in rows) / 1000
+
+
+def test_startup_import_budget():
+    rows, _ = import_times('main')
+
+    packages = {name.split('.')[0] for name, _, _ in rows}
+    assert not packages & NOT_AT_STARTUP
+
+    # o menor de algumas medições, intercaladas, descarta as execuções atrapalhadas por outro processo
+    main_ms = [total_import_ms(rows)]
+    baseline_ms = []
+    for _ in range(RUNS):
+        baseline_ms.append(total_import_ms(import_times(BASELINE_MODULES)[0]))
+        main_ms.append(total_import_ms(import_times('main')[0]))
+
+    assert min(main_ms) < STARTUP_BUDGET_RATIO * min(baseline_ms)